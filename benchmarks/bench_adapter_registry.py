@@ -0,0 +1,59 @@
+"""Benchmark type adapters creation when many operations share models.
+
+Compare creating a new type adapter for each schema against the shared
+adapters returned by `sniff_type_adapter`.
+
+Run with:
+
+    python benchmarks/bench_adapter_registry.py
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import pydantic
+
+from contracts.backends.type_adapter.defaults import (
+    _create_type_adapter,
+    clear_type_adapters,
+    sniff_type_adapter,
+)
+
+
+@dataclass
+class DataclassRequest:
+    device_id: str
+    value: int
+    tags: list[str]
+
+
+class PydanticReply(pydantic.BaseModel):
+    success: bool
+    value: int
+    message: str
+
+
+def bench(name: str, create: Callable[[Any], Any], count: int) -> None:
+    clear_type_adapters()
+    tracemalloc.start()
+    start = time.perf_counter()
+    adapters = [
+        create(typ) for _ in range(count) for typ in (DataclassRequest, PydanticReply)
+    ]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:>8} | {count:>4} operations | {len(set(map(id, adapters))):>4} adapters | "
+        f"{elapsed * 1e3:8.2f} ms | peak memory: {peak / 1024:8.1f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    for count in (10, 100, 500):
+        bench("uncached", _create_type_adapter, count)
+        bench("shared", sniff_type_adapter, count)
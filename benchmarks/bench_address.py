@@ -0,0 +1,122 @@
+"""Benchmark parameters extraction and subject generation.
+
+Compare the functions compiled by each address against the generic
+implementation which loops over placeholders on every call.
+
+Run with:
+
+    python benchmarks/bench_address.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import pydantic
+
+from contracts.core.address import Address
+
+
+@dataclass
+class NoParams:
+    pass
+
+
+@dataclass
+class OneParam:
+    device_id: str
+
+
+@dataclass
+class ManyParams:
+    location: str
+    device_id: str
+    sensor: str
+
+
+@dataclass
+class RemainingParams:
+    device_id: str
+    path: list[str]
+
+
+class TypedParams(pydantic.BaseModel):
+    device_id: str
+    channel: int
+    enabled: bool
+
+
+def generic_get_params(address: Address[Any], subject: str) -> Any:
+    return address.placeholders.extract_parameters(subject)
+
+
+def generic_get_subject(address: Address[Any], parameters: Any) -> str:
+    placeholders = address.placeholders
+    tokens = placeholders.subject.split(".")
+    for name, pos in placeholders.mapping.items():
+        tokens[pos] = str(getattr(parameters, name))
+    if placeholders.wildcard:
+        values = getattr(parameters, placeholders.wildcard[0])
+        wildcard_start = placeholders.wildcard[1]
+        tokens[wildcard_start] = values[0]
+        for value in values[1:]:
+            tokens.append(value)
+    return ".".join(tokens)
+
+
+CASES: list[tuple[str, Address[Any], str]] = [
+    ("static", Address("service.status.get", type(None)), "service.status.get"),
+    ("one", Address("device.{device_id}.get", OneParam), "device.abc.get"),
+    (
+        "many",
+        Address("site.{location}.device.{device_id}.{sensor}", ManyParams),
+        "site.kitchen.device.abc.temperature",
+    ),
+    (
+        "remaining",
+        Address("files.{device_id}.{path...}", RemainingParams),
+        "files.abc.etc.nats.server.conf",
+    ),
+    (
+        "pydantic",
+        Address("device.{device_id}.{channel}.{enabled}", TypedParams),
+        "device.abc.1.true",
+    ),
+]
+
+
+def measure(func: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main(number: int = 100_000) -> None:
+    for name, address, subject in CASES:
+        params = address.get_params(subject)
+        assert params == generic_get_params(address, subject)
+        assert address.get_subject(params) == subject
+        get_params_before = measure(
+            lambda: generic_get_params(address, subject), number
+        )
+        get_params_after = measure(lambda: address.get_params(subject), number)
+        if params is None:
+            get_subject_before = measure(
+                lambda: generic_get_subject(address, NoParams()), number
+            )
+        else:
+            get_subject_before = measure(
+                lambda: generic_get_subject(address, params), number
+            )
+        get_subject_after = measure(lambda: address.get_subject(params), number)
+        print(
+            f"{name:>10} | "
+            f"get_params: {get_params_before * 1e9:6.0f} ns -> {get_params_after * 1e9:6.0f} ns "
+            f"(x{get_params_before / get_params_after:.1f}) | "
+            f"get_subject: {get_subject_before * 1e9:6.0f} ns -> {get_subject_after * 1e9:6.0f} ns "
+            f"(x{get_subject_before / get_subject_after:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
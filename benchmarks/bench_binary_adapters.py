@@ -0,0 +1,56 @@
+"""Benchmark binary type adapters against JSON type adapters.
+
+Messages are encoded then decoded in a loop, and throughput is reported
+in messages per second along with the size of the encoded message.
+Adapters which cannot be imported are skipped.
+
+Run with:
+
+    python benchmarks/bench_binary_adapters.py
+"""
+
+from __future__ import annotations
+
+from bench_json_adapters import SAMPLES, load_factories, measure
+
+from contracts.core.types import TypeAdapterFactory
+
+
+def load_binary_factories() -> dict[str, TypeAdapterFactory]:
+    factories: dict[str, TypeAdapterFactory] = {}
+    try:
+        from contracts.backends.type_adapter.msgpack import MsgPackAdapterFactory
+    except ImportError:
+        pass
+    else:
+        factories["msgpack"] = MsgPackAdapterFactory()
+    try:
+        from contracts.backends.type_adapter.cbor import CBORAdapterFactory
+    except ImportError:
+        pass
+    else:
+        factories["cbor"] = CBORAdapterFactory()
+    return factories
+
+
+def main(number: int = 20_000) -> None:
+    factories = {**load_factories(), **load_binary_factories()}
+    for sample in SAMPLES:
+        typ = type(sample)
+        print(typ.__name__)
+        for name, factory in factories.items():
+            adapter = factory(typ)
+            data = adapter.encode(sample)
+            assert adapter.decode(data) == sample
+
+            def roundtrip() -> object:
+                return adapter.decode(adapter.encode(sample))
+
+            elapsed = measure(roundtrip, number)
+            print(
+                f"  {name:>12} | {1 / elapsed:10.0f} msg/s | size: {len(data):>5} bytes"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark validation of components when binding an application.
+
+Run with:
+
+    python benchmarks/bench_bind.py
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from contracts import Application, operation
+from contracts.application import validate_operations
+
+
+@dataclass
+class DeviceParams:
+    device_id: str
+
+
+def make_components(count: int) -> tuple[list[type[Any]], list[Any]]:
+    """Generate operation definitions and their implementations."""
+    definitions: list[type[Any]] = []
+    implementations: list[Any] = []
+    for idx in range(count):
+        definition = operation(
+            f"svc{idx % 10}.op{idx}.{{device_id}}",
+            parameters=DeviceParams,
+        )(type(f"Operation{idx}", (), {}))
+
+        async def handle(self: Any, request: Any) -> None:
+            pass
+
+        implementation = type(f"Operation{idx}Impl", (definition,), {"handle": handle})
+        definitions.append(definition)
+        implementations.append(implementation())
+    return definitions, implementations
+
+
+def bench(count: int) -> None:
+    definitions, implementations = make_components(count)
+    app = Application(
+        id="https://example.com/bench",
+        name="bench",
+        version="0.0.1",
+        components=definitions,
+    )
+    start = time.perf_counter()
+    validate_operations(app, implementations)
+    elapsed = time.perf_counter() - start
+    print(f"{count:>6} operations | validation: {elapsed * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    for count in (10, 1_000, 5_000):
+        bench(count)
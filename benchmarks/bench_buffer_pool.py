@@ -0,0 +1,151 @@
+"""Benchmark encoding replies into pooled buffers.
+
+Replies are sent through `MicroMessage.respond`, with and without a
+buffer pool, using the type adapters of several libraries. The fake
+request copies the payload like the NATS client does when writing the
+PUB command, so buffers can be reused as soon as `respond` returns.
+
+For each run, the time per reply, the number of garbage collections and
+the peak memory allocated while sending replies are reported. Encoded
+payloads are not tracked by the garbage collector, so pooling buffers
+saves allocations without changing the number of collections.
+
+Run with:
+
+    python benchmarks/bench_buffer_pool.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, List
+
+from contracts import Application, operation, schema
+from contracts.backends.server.micro.server import MicroMessage
+from contracts.core.buffers import BufferPool
+from contracts.core.types import TypeAdapterFactory
+from contracts.registry import OperationEntry
+
+
+@dataclass
+class Item:
+    sku: str
+    quantity: int
+    price: float
+
+
+@dataclass
+class Order:
+    id: int
+    customer: str
+    items: List[Item] = field(default_factory=list)
+
+
+ORDER = Order(
+    id=1,
+    customer="customer-1",
+    items=[Item(f"sku-{idx}", idx, idx * 1.5) for idx in range(20)],
+)
+
+
+class FakeRequest:
+    def __init__(self) -> None:
+        self.sent = 0
+
+    def headers(self) -> dict[str, str]:
+        return {}
+
+    async def respond_success(
+        self, code: int, data: Any, headers: dict[str, str]
+    ) -> None:
+        # The NATS client copies the payload into the PUB command
+        self.sent += len(b"PUB" + data)
+
+
+def load_factories() -> dict[str, TypeAdapterFactory]:
+    from contracts.backends.type_adapter.standard import StandardJSONAdapterFactory
+
+    factories: dict[str, TypeAdapterFactory] = {
+        "standard": StandardJSONAdapterFactory()
+    }
+    try:
+        from contracts.backends.type_adapter.msgspec import MsgspecJSONAdapterFactory
+    except ImportError:
+        pass
+    else:
+        factories["msgspec"] = MsgspecJSONAdapterFactory()
+    try:
+        from contracts.backends.type_adapter.pydantic_v2 import (
+            PydanticV2JSONAdapterFactory,
+        )
+    except ImportError:
+        pass
+    else:
+        factories["pydantic_v2"] = PydanticV2JSONAdapterFactory()
+    return factories
+
+
+def create_entry(factory: TypeAdapterFactory) -> OperationEntry:
+    @operation(
+        "orders.get",
+        reply_payload=schema(Order, adapter_factory=factory),
+    )
+    class GetOrder:
+        pass
+
+    app = Application(id="bench", name="bench", version="0.0.0", components=[GetOrder])
+    entry = app.compile().lookup(GetOrder)
+    assert isinstance(entry, OperationEntry)
+    return entry
+
+
+async def run(entry: OperationEntry, buffers: BufferPool | None, count: int) -> None:
+    request: Any = FakeRequest()
+    for _ in range(count):
+        message: Any = MicroMessage(request, entry, buffers=buffers)
+        await message.respond(ORDER)
+
+
+def measure(entry: OperationEntry, buffers: BufferPool | None, count: int) -> None:
+    asyncio.run(run(entry, buffers, 1_000))
+    collections = 0
+
+    def on_gc(phase: str, info: dict[str, Any]) -> None:
+        nonlocal collections
+        if phase == "start":
+            collections += 1
+
+    gc.callbacks.append(on_gc)
+    try:
+        start = time.perf_counter()
+        asyncio.run(run(entry, buffers, count))
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(on_gc)
+    tracemalloc.start()
+    asyncio.run(run(entry, buffers, 100))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {'pool' if buffers is not None else 'no pool':>8}"
+        f" | {elapsed / count * 1e6:6.2f} us | {collections:5} gc"
+        f" | peak {peak / 1024:7.1f} KiB"
+    )
+
+
+def main(count: int = 50_000) -> None:
+    for name, factory in load_factories().items():
+        entry = create_entry(factory)
+        print(name)
+        measure(entry, None, count)
+        pool = BufferPool()
+        measure(entry, pool, count)
+        print(f"  reused {pool.stats.hit_rate:.1%} of {pool.stats.acquired} buffers")
+
+
+if __name__ == "__main__":
+    main()
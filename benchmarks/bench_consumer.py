@@ -0,0 +1,218 @@
+"""Benchmark the throughput of consumers run using JetStream.
+
+Events are published into a stream, then consumed by a micro server using
+several batch sizes and concurrency limits. The handler acknowledges each
+event after decoding its payload, optionally waiting for a simulated I/O
+delay, so that the gain of handling events concurrently is visible.
+
+Batch consumers wait for the simulated delay once per batch, like a sink
+writing all events of a batch using a single query. Ordered consumers
+handle events of each device in order, with events spread over 10
+devices, so that at most 10 events are handled concurrently.
+
+Finally, acknowledgements flushed in batches are compared with
+acknowledgements published one at a time, and the mean latency and
+highest number of pending acknowledgements are reported.
+
+A NATS server with JetStream enabled must be running, for example:
+
+    nats-server -js
+
+Run with:
+
+    python benchmarks/bench_consumer.py [--url nats://localhost:4222]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import nats
+from nats.js.api import StreamConfig
+from nats_contrib import micro
+
+from contracts import Application, consumer, event
+from contracts.backends.server.micro import (
+    ConsumerOptions,
+    create_micro_server,
+    params_key,
+)
+from contracts.backends.server.micro.acks import AckStats
+from contracts.backends.server.micro.server import MicroInstance
+from contracts.registry import ConsumerEntry
+
+STREAM = "BENCH_CONSUMER"
+
+
+@dataclass
+class Reading:
+    device: str
+    temperature: float
+    timestamp: int
+
+
+@dataclass
+class ReadingParams:
+    device: str
+
+
+@event(
+    address="bench.readings.{device}",
+    parameters=ReadingParams,
+    payload_schema=Reading,
+)
+class ReadingEvent:
+    pass
+
+
+@consumer(source=ReadingEvent)
+class ReadingConsumer:
+    pass
+
+
+class CountingConsumer(ReadingConsumer):
+    def __init__(self, expected: int, delay: float) -> None:
+        self.expected = expected
+        self.delay = delay
+        self.count = 0
+        self.done = asyncio.Event()
+
+    async def handle(self, event: Any) -> None:
+        event.payload()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        await event.ack()
+        self.count += 1
+        if self.count >= self.expected:
+            self.done.set()
+
+
+class BatchCountingConsumer(CountingConsumer):
+    async def handle_batch(self, events: Any) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        for message in events:
+            await message.ack()
+        self.count += len(events)
+        if self.count >= self.expected:
+            self.done.set()
+
+
+async def publish(js: Any, app: Application, count: int) -> None:
+    entry = app.compile().lookup(ReadingConsumer)
+    assert isinstance(entry, ConsumerEntry)
+    for idx in range(count):
+        device = f"device-{idx % 10}"
+        payload = entry.payload_adapter.encode(Reading(device, 20 + idx % 5, idx))
+        await js.publish_async(
+            entry.spec.address.get_subject(ReadingParams(device)), bytes(payload)
+        )
+    await js.publish_async_completed()
+
+
+async def run(
+    nc: Any, count: int, delay: float, options: ConsumerOptions, mode: str
+) -> tuple[float, int, AckStats | None]:
+    js = nc.jetstream()
+    try:
+        await js.delete_stream(STREAM)
+    except nats.js.errors.NotFoundError:
+        pass
+    await js.add_stream(StreamConfig(name=STREAM, subjects=["bench.readings.>"]))
+    app = Application(
+        id="bench", name="bench", version="0.0.0", components=[ReadingConsumer]
+    )
+    await publish(js, app, count)
+    ctx = micro.Context()
+    ctx.client = nc
+    server = create_micro_server(ctx, consumer_options=options)
+    impl = (BatchCountingConsumer if mode == "handle_batch" else CountingConsumer)(
+        count, delay
+    )
+    server.bind(app, impl)
+    start = time.perf_counter()
+    await server.start()
+    try:
+        await asyncio.wait_for(impl.done.wait(), timeout=120)
+        elapsed = time.perf_counter() - start
+    finally:
+        await server.stop()
+    await js.delete_stream(STREAM)
+    instance = server.instance
+    assert isinstance(instance, MicroInstance)
+    return elapsed, impl.count, instance.pull_consumers[0].ack_stats
+
+
+async def main(url: str, count: int) -> None:
+    async def ignore(exc: Exception) -> None:
+        pass
+
+    try:
+        # The client retries the initial connection forever
+        nc = await asyncio.wait_for(
+            nats.connect(url, allow_reconnect=False, error_cb=ignore), timeout=2
+        )
+    except Exception:
+        print(f"No NATS server reachable at {url}, skipping")
+        return
+    try:
+        for delay in (0.0, 0.001):
+            print(f"{count} events, handler delay {delay * 1e3:.0f} ms")
+            for batch_size, max_concurrency, mode in (
+                (1, 1, "handle"),
+                (10, 1, "handle"),
+                (100, 1, "handle"),
+                (100, 10, "handle"),
+                (100, 100, "handle"),
+                (500, 500, "handle"),
+                (100, 100, "handle_batch"),
+                (500, 500, "handle_batch"),
+                (100, 100, "ordered"),
+                (500, 500, "ordered"),
+            ):
+                options = ConsumerOptions(
+                    batch_size=batch_size,
+                    max_concurrency=max_concurrency,
+                    fetch_timeout=1,
+                    handler_batch_size=batch_size,
+                    partition_key=params_key("device") if mode == "ordered" else None,
+                )
+                elapsed, handled, _ = await run(nc, count, delay, options, mode)
+                print(
+                    f"  {mode:>12}"
+                    f" | batch {batch_size:>3} | concurrency {max_concurrency:>3}"
+                    f" | {handled / elapsed:9.0f} events/s"
+                )
+        print(f"{count} events, acknowledgements")
+        for ack_batch_size in (0, 10, 100, 500):
+            options = ConsumerOptions(
+                batch_size=500,
+                max_concurrency=500,
+                fetch_timeout=1,
+                ack_batch_size=ack_batch_size,
+            )
+            elapsed, handled, stats = await run(nc, count, 0, options, "handle")
+            line = (
+                f"  ack batch {ack_batch_size:>3} | {handled / elapsed:9.0f} events/s"
+            )
+            if stats is not None:
+                line += (
+                    f" | latency {stats.mean_latency * 1e3:5.2f} ms"
+                    f" | max pending {stats.max_pending:>3}"
+                    f" | {stats.batch_size:5.1f} acks/flush"
+                )
+            print(line)
+    finally:
+        await nc.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="nats://localhost:4222")
+    parser.add_argument("--count", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.count))
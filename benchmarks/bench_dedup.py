@@ -0,0 +1,89 @@
+"""Benchmark the deduplication of consumed events.
+
+Event ids are checked and remembered the way the consumer runtime does,
+using:
+
+- `bloom`: the `Deduplicator`, remembering ids in two Bloom filters.
+- `dict`: a dict mapping each id to the time it was handled, which is
+  what handlers implement when they deduplicate events themselves. Ids
+  are never removed within a window, so it grows with the number of
+  events.
+
+For each, the time to check and remember an id and the memory used once
+`capacity` ids are remembered are reported. For Bloom filters, the false
+positive rate is measured by checking ids which were never handled, and
+compared with the estimated rate.
+
+Run with:
+
+    python benchmarks/bench_dedup.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from typing import Callable
+
+from contracts.backends.server.micro.dedup import Deduplicator
+
+
+def remember_bloom(ids: list[str], error_rate: float) -> Deduplicator:
+    dedup = Deduplicator(capacity=len(ids), error_rate=error_rate)
+    for message_id in ids:
+        if dedup.claim(message_id):
+            dedup.release(message_id, True)
+    return dedup
+
+
+def remember_dict(ids: list[str]) -> dict[str, float]:
+    handled: dict[str, float] = {}
+    for message_id in ids:
+        if message_id not in handled:
+            handled[message_id] = time.monotonic()
+    return handled
+
+
+def measure(func: Callable[[], object]) -> tuple[float, int]:
+    """Measure the time taken by a function, then the memory it keeps."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    # Memory is traced in a separate run, since tracing slows down allocations
+    tracemalloc.start()
+    result = func()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, memory
+
+
+def main(capacity: int) -> None:
+    ids = [uuid.uuid4().hex for _ in range(capacity)]
+    others = [uuid.uuid4().hex for _ in range(capacity)]
+    print(f"{capacity} ids")
+    elapsed, memory = measure(lambda: remember_dict(ids))
+    print(
+        f"  {'dict':>18} | {elapsed / capacity * 1e6:5.2f} us/id"
+        f" | {memory / 2**20:6.2f} MiB"
+    )
+    for error_rate in (1e-3, 1e-6, 1e-9):
+        elapsed, memory = measure(lambda: remember_bloom(ids, error_rate))
+        dedup = remember_bloom(ids, error_rate)
+        false_positives = sum(not dedup.claim(other) for other in others)
+        print(
+            f"  {f'bloom (rate {error_rate:.0e})':>18}"
+            f" | {elapsed / capacity * 1e6:5.2f} us/id"
+            f" | {memory / 2**20:6.2f} MiB"
+            f" | false positives {false_positives / capacity:.1e}"
+            f" (estimated {dedup.stats.false_positive_rate:.1e})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capacity", type=int, default=1_000_000)
+    args = parser.parse_args()
+    main(args.capacity)
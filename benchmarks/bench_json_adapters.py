@@ -0,0 +1,97 @@
+"""Benchmark JSON type adapters on the demo project message types.
+
+Adapters which cannot be imported (missing optional dependency or
+pydantic version mismatch) are skipped.
+
+Run with:
+
+    python benchmarks/bench_json_adapters.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "examples" / "demo_project" / "src"))
+
+from demo.components.my_consumer import MyEventData  # noqa: E402
+from demo.components.my_operation import MyOptions, MyResult  # noqa: E402
+
+from contracts.core.types import TypeAdapterFactory  # noqa: E402
+
+
+@dataclass
+class MyEventBatch:
+    """A nested message built from the demo project event type."""
+
+    source: str
+    events: list[MyEventData]
+
+
+def load_factories() -> dict[str, TypeAdapterFactory]:
+    factories: dict[str, TypeAdapterFactory] = {}
+    from contracts.backends.type_adapter.standard import StandardJSONAdapterFactory
+
+    factories["standard"] = StandardJSONAdapterFactory()
+    import pydantic
+
+    if pydantic.__version__.startswith("1."):
+        from contracts.backends.type_adapter.pydantic_v1 import (
+            PydanticV1JSONAdapterFactory,
+        )
+
+        factories["pydantic_v1"] = PydanticV1JSONAdapterFactory()
+    else:
+        from contracts.backends.type_adapter.pydantic_v2 import (
+            PydanticV2JSONAdapterFactory,
+        )
+
+        factories["pydantic_v2"] = PydanticV2JSONAdapterFactory()
+    try:
+        from contracts.backends.type_adapter.msgspec import MsgspecJSONAdapterFactory
+    except ImportError:
+        pass
+    else:
+        factories["msgspec"] = MsgspecJSONAdapterFactory()
+    return factories
+
+
+SAMPLES: list[Any] = [
+    MyOptions(value=2),
+    MyResult(success=True, value=14),
+    MyEventData(temperature=23.5, timestamp=123456),
+    MyEventBatch(
+        source="kitchen",
+        events=[
+            MyEventData(temperature=20 + idx / 10, timestamp=idx) for idx in range(50)
+        ],
+    ),
+]
+
+
+def measure(func: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main(number: int = 50_000) -> None:
+    factories = load_factories()
+    for sample in SAMPLES:
+        typ = type(sample)
+        print(typ.__name__)
+        for name, factory in factories.items():
+            adapter = factory(typ)
+            data = adapter.encode(sample)
+            assert adapter.decode(data) == sample
+            encode = measure(lambda: adapter.encode(sample), number)
+            decode = measure(lambda: adapter.decode(data), number)
+            print(
+                f"  {name:>12} | encode: {encode * 1e9:7.0f} ns | decode: {decode * 1e9:7.0f} ns"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark the latency of publishing events through an outbox.
+
+Events are sent with `Client.send` by several concurrent producers, using
+an adapter simulating a broker:
+
+- `healthy`: each event is acknowledged after 0.5 ms.
+- `slow`: each event is acknowledged after 20 ms.
+- `outage`: the broker rejects all events for 1 second, then recovers.
+
+Without outbox, producers wait for the broker. With an outbox, producers
+only wait for events to be synced to disk, and events are published in
+the background. The time for the outbox to publish all events is
+reported as well.
+
+Run with:
+
+    python benchmarks/bench_outbox.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from contracts import event
+from contracts.client import Client, ClientAdapter, RawReply
+from contracts.core.types import Buffer
+from contracts.outbox import Outbox
+
+
+@dataclass
+class Reading:
+    device: str
+    temperature: float
+    timestamp: int
+
+
+@dataclass
+class ReadingParams:
+    device: str
+
+
+@event(
+    address="bench.outbox.{device}",
+    parameters=ReadingParams,
+    payload_schema=Reading,
+)
+class ReadingEvent:
+    pass
+
+
+class SimulatedBroker(ClientAdapter):
+    def __init__(self, latency: float, outage: float = 0) -> None:
+        self.latency = latency
+        self.outage_until = time.perf_counter() + outage
+        self.received = 0
+
+    async def send_request(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+        timeout: float = 1,
+    ) -> RawReply:
+        raise NotImplementedError
+
+    async def send_event(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        await asyncio.sleep(self.latency)
+        if time.perf_counter() < self.outage_until:
+            raise ConnectionError("Broker is unavailable")
+        self.received += 1
+
+    async def publish_event(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> asyncio.Future[Any]:
+        # Acknowledgements are awaited concurrently, like JetStream async publish
+        return asyncio.ensure_future(self.send_event(subject, payload, headers))
+
+
+async def produce(
+    client: Client, producer: int, count: int, latencies: list[float]
+) -> None:
+    for idx in range(count):
+        msg = ReadingEvent.publish(
+            Reading(f"device-{producer}", 20.5, idx), device=f"device-{producer}"
+        )
+        start = time.perf_counter()
+        while True:
+            try:
+                await client.send(msg)
+                break
+            except ConnectionError:
+                # Without outbox, producers must retry themselves
+                await asyncio.sleep(0.1)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(
+    broker: SimulatedBroker, use_outbox: bool, producers: int, count: int
+) -> tuple[list[float], float, float]:
+    latencies: list[float] = []
+    directory = tempfile.mkdtemp()
+    outbox = Outbox(directory, broker) if use_outbox else None
+    try:
+        if outbox is not None:
+            await outbox.open()
+        client = Client(broker, outbox=outbox)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(produce(client, idx, count, latencies) for idx in range(producers))
+        )
+        produced = time.perf_counter() - start
+        while broker.received < producers * count:
+            await asyncio.sleep(0.001)
+        delivered = time.perf_counter() - start
+    finally:
+        if outbox is not None:
+            await outbox.close()
+        shutil.rmtree(directory)
+    return latencies, produced, delivered
+
+
+def percentile(values: list[float], ratio: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * ratio), len(values) - 1)]
+
+
+async def main(producers: int = 10, count: int = 200) -> None:
+    print(f"{producers} producers, {count} events each")
+    scenarios = {
+        "healthy": lambda: SimulatedBroker(0.0005),
+        "slow": lambda: SimulatedBroker(0.02),
+        "outage": lambda: SimulatedBroker(0.0005, outage=1),
+    }
+    for name, create_broker in scenarios.items():
+        for use_outbox in (False, True):
+            latencies, produced, delivered = await run(
+                create_broker(), use_outbox, producers, count
+            )
+            print(
+                f"  {name:>7} | {'outbox' if use_outbox else 'direct':>6}"
+                f" | p50 {percentile(latencies, 0.5) * 1e3:7.2f} ms"
+                f" | p99 {percentile(latencies, 0.99) * 1e3:7.2f} ms"
+                f" | max {max(latencies) * 1e3:7.2f} ms"
+                f" | produced in {produced:5.2f} s"
+                f" | delivered in {delivered:5.2f} s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
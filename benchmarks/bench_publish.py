@@ -0,0 +1,146 @@
+"""Benchmark the throughput of publishing events to JetStream.
+
+Events are published using the micro client:
+
+- `send`: each event is sent with `Client.send`, which waits for the
+  acknowledgement of the event before returning.
+- `publish_many`: events are sent with `Client.publish_many`, which only
+  waits when the window of outstanding acknowledgements is full. The
+  time includes waiting for all acknowledgements.
+- `core`: events are published using core NATS, without any
+  acknowledgement, as an upper bound.
+
+A NATS server with JetStream enabled must be running, for example:
+
+    nats-server -js
+
+Run with:
+
+    python benchmarks/bench_publish.py [--url nats://localhost:4222]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import nats
+from nats.js.api import StreamConfig
+
+from contracts import event
+from contracts.backends.client.micro import Client, JetStreamPublisher
+
+STREAM = "BENCH_PUBLISH"
+
+
+@dataclass
+class Reading:
+    device: str
+    temperature: float
+    timestamp: int
+
+
+@dataclass
+class ReadingParams:
+    device: str
+
+
+@event(
+    address="bench.publish.{device}",
+    parameters=ReadingParams,
+    payload_schema=Reading,
+)
+class ReadingEvent:
+    pass
+
+
+def make_events(count: int) -> list[Any]:
+    return [
+        ReadingEvent.publish(
+            Reading(f"device-{idx % 10}", 20 + idx % 5, idx),
+            device=f"device-{idx % 10}",
+        )
+        for idx in range(count)
+    ]
+
+
+async def reset_stream(js: Any) -> None:
+    try:
+        await js.delete_stream(STREAM)
+    except nats.js.errors.NotFoundError:
+        pass
+    await js.add_stream(StreamConfig(name=STREAM, subjects=["bench.publish.>"]))
+
+
+async def bench_send(nc: Any, events: list[Any]) -> float:
+    client = Client(nc, publisher=JetStreamPublisher(nc))
+    start = time.perf_counter()
+    for msg in events:
+        await client.send(msg)
+    return time.perf_counter() - start
+
+
+async def bench_publish_many(nc: Any, events: list[Any], window: int) -> float:
+    client = Client(nc, publisher=JetStreamPublisher(nc, window=window))
+    start = time.perf_counter()
+    futures = await client.publish_many(events)
+    await asyncio.gather(*futures)
+    return time.perf_counter() - start
+
+
+async def bench_core(nc: Any, events: list[Any]) -> float:
+    client = Client(nc)
+    start = time.perf_counter()
+    await client.publish_many(events)
+    await nc.flush()
+    return time.perf_counter() - start
+
+
+async def main(url: str, count: int) -> None:
+    async def ignore(exc: Exception) -> None:
+        pass
+
+    try:
+        # The client retries the initial connection forever
+        nc = await asyncio.wait_for(
+            nats.connect(url, allow_reconnect=False, error_cb=ignore), timeout=2
+        )
+    except Exception:
+        print(f"No NATS server reachable at {url}, skipping")
+        return
+    js = nc.jetstream()
+    events = make_events(count)
+    runs: dict[str, Any] = {
+        "send": lambda: bench_send(nc, events),
+        **{
+            f"publish_many (window {window})": (
+                lambda window=window: bench_publish_many(nc, events, window)
+            )
+            for window in (1, 16, 256, 1024)
+        },
+        "core": lambda: bench_core(nc, events),
+    }
+    print(f"{count} events")
+    try:
+        for name, run in runs.items():
+            await reset_stream(js)
+            elapsed = await run()
+            info = await js.stream_info(STREAM)
+            print(
+                f"  {name:>27} | {count / elapsed:9.0f} events/s"
+                f" | {info.state.messages} stored"
+            )
+        await js.delete_stream(STREAM)
+    finally:
+        await nc.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="nats://localhost:4222")
+    parser.add_argument("--count", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.count))
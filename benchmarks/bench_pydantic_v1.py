@@ -0,0 +1,67 @@
+"""Benchmark the pydantic v1 type adapter.
+
+Encode and decode the same nested message with:
+
+- `legacy`: the previous implementation of the v1 adapter, which resolved
+  a parsing type on every call with `parse_raw_as`, and encoded with
+  `json.dumps` and a `default` hook.
+- `pydantic_v1`: the v1 adapter, which creates the parser of the type once
+  and encodes models using their own JSON export.
+- `pydantic_v2`: the v2 adapter on equivalent models, as a reference.
+
+Run with:
+
+    python benchmarks/bench_pydantic_v1.py
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from typing import Any, Callable
+
+from bench_validation import BatchV1, load_adapters, make_payload
+
+from contracts.core.types import Validation
+
+
+def legacy_codecs() -> tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    from bench_validation import v1
+
+    def default(obj: Any) -> Any:
+        if isinstance(obj, v1.BaseModel):
+            return obj.dict()
+        return str(obj)
+
+    return (
+        lambda value: json.dumps(value, default=default).encode(),
+        lambda data: v1.parse_raw_as(BatchV1, data),
+    )
+
+
+def timeit_us(func: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 1_000) -> None:
+    adapters = load_adapters()
+    codecs = {"legacy": legacy_codecs()}
+    for name, adapter in adapters.items():
+        codecs[name] = (adapter.encode, adapter.decode)
+    for count in (1, 50):
+        payload = make_payload(count)
+        data = json.dumps(payload).encode()
+        print(f"{count} events ({len(data)} bytes)")
+        print(f"  {'adapter':>12} | {'decode':>11} | {'encode':>11}")
+        for name, (encode, decode) in codecs.items():
+            message = decode(data)
+            decode_us = timeit_us(lambda: decode(data), number)
+            encode_us = timeit_us(lambda: encode(message), number)
+            print(f"  {name:>12} | {decode_us:8.2f} us | {encode_us:8.2f} us")
+        trusted = adapters["pydantic_v1"].with_validation(Validation.NONE)
+        decode_us = timeit_us(lambda: trusted.decode(data), number)
+        print(f"  {'v1 (none)':>12} | {decode_us:8.2f} us |")
+
+
+if __name__ == "__main__":
+    main()
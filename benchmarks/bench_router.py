@@ -0,0 +1,101 @@
+"""Benchmark subject dispatching using a router.
+
+Compare the number of subscriptions required to serve N operations
+with and without a router, the time needed to compile the router,
+and the time needed to dispatch a subject to an operation.
+
+Run with:
+
+    python benchmarks/bench_router.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+
+from contracts.core.address import Address
+from contracts.core.router import Router
+
+
+@dataclass
+class DeviceParams:
+    device_id: str
+
+
+@dataclass
+class ItemParams:
+    device_id: str
+    item_id: str
+
+
+def make_addresses(count: int) -> list[Address[object]]:
+    """Generate addresses looking like a real application."""
+    addresses: list[Address[object]] = []
+    for idx in range(count):
+        service = f"svc{idx % 10}"
+        if idx % 3 == 0:
+            addresses.append(Address(f"{service}.op{idx}", type(None)))
+        elif idx % 3 == 1:
+            addresses.append(Address(f"{service}.op{idx}.{{device_id}}", DeviceParams))
+        else:
+            addresses.append(
+                Address(f"{service}.op{idx}.{{device_id}}.{{item_id}}", ItemParams)
+            )
+    return addresses
+
+
+def make_subject(address: Address[object]) -> str:
+    return address.placeholders.subject.replace("*", "abc")
+
+
+def linear_match(addresses: list[Address[object]], subject: str) -> object:
+    """Naive dispatch: check each address in order."""
+    tokens = subject.split(".")
+    for address in addresses:
+        pattern = address.placeholders.subject.split(".")
+        if len(pattern) != len(tokens):
+            continue
+        for expected, token in zip(pattern, tokens):
+            if expected != "*" and expected != token:
+                break
+        else:
+            return address.get_params(subject)
+    return None
+
+
+def bench(count: int, iterations: int = 20_000) -> None:
+    addresses = make_addresses(count)
+    start = time.perf_counter()
+    router: Router[int] = Router(
+        (address, idx) for idx, address in enumerate(addresses)
+    )
+    compile_time = time.perf_counter() - start
+    subscriptions = router.subscriptions()
+    rng = random.Random(0)
+    subjects = [make_subject(rng.choice(addresses)) for _ in range(1000)]
+
+    start = time.perf_counter()
+    for idx in range(iterations):
+        router.match(subjects[idx % 1000])
+    router_time = (time.perf_counter() - start) / iterations
+
+    linear_iterations = max(100, iterations // max(1, count // 10))
+    start = time.perf_counter()
+    for idx in range(linear_iterations):
+        linear_match(addresses, subjects[idx % 1000])
+    linear_time = (time.perf_counter() - start) / linear_iterations
+
+    print(
+        f"{count:>6} operations | "
+        f"subscriptions: {count:>6} -> {len(subscriptions):<3} | "
+        f"compile: {compile_time * 1e3:8.2f} ms | "
+        f"router: {router_time * 1e6:6.2f} us/match | "
+        f"linear: {linear_time * 1e6:10.2f} us/match"
+    )
+
+
+if __name__ == "__main__":
+    for count in (10, 1_000, 10_000):
+        bench(count)
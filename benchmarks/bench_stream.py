@@ -0,0 +1,78 @@
+"""Benchmark peak memory of streaming payloads.
+
+Decode a large JSON array of records, processing records one at a time,
+and encode records produced by a generator:
+
+- `list`: the standard JSON adapter of `List[Record]`, which holds the
+  whole parsed array and all records at once.
+- `stream`: the adapter of `Iterable[Record]`, which decodes and encodes
+  one record at a time.
+
+Peak memory allocated during each run is measured with `tracemalloc`.
+It includes the text decoded from the payload, or the encoded payload,
+which is the lower bound of the streaming adapter.
+
+Run with:
+
+    python benchmarks/bench_stream.py
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List
+
+from contracts.backends.type_adapter.standard import StandardJSONAdapter
+from contracts.backends.type_adapter.stream import JSONStreamAdapter
+
+
+@dataclass
+class Record:
+    id: int
+    name: str
+    tags: List[str]
+    score: float
+
+
+def make_records(count: int) -> Iterator[Record]:
+    for idx in range(count):
+        yield Record(idx, f"record-{idx}", ["a", "b", "c"], idx / 3)
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, float]:
+    """Run a function and return its duration and peak memory in MiB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def consume(items: Iterable[Record]) -> None:
+    total = 0.0
+    for item in items:
+        total += item.score
+
+
+def main(count: int = 200_000) -> None:
+    list_adapter = StandardJSONAdapter(List[Record])
+    stream_adapter: Any = JSONStreamAdapter(Iterable[Record])
+    data = bytes(stream_adapter.encode(make_records(count)))
+    print(f"{count} records ({len(data) / 2**20:.1f} MiB)")
+    runs = {
+        "decode list": lambda: consume(list_adapter.decode(data)),
+        "decode stream": lambda: consume(stream_adapter.decode(data)),
+        "encode list": lambda: list_adapter.encode(list(make_records(count))),
+        "encode stream": lambda: stream_adapter.encode(make_records(count)),
+    }
+    for name, func in runs.items():
+        elapsed, peak = measure(func)
+        print(f"  {name:>13} | {elapsed * 1e3:8.1f} ms | peak {peak:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
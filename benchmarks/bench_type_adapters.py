@@ -0,0 +1,446 @@
+"""Benchmark suite of the type adapters.
+
+Every available type adapter is run against the payloads it supports:
+
+- shapes: `flat` records holding scalar fields only, `nested` records
+  holding nested objects, lists and enums, and `raw` bytes.
+- sizes: `small` (1 record), `medium` (100 records) and `large`
+  (5000 records).
+- families: dataclasses, pydantic v2 models and pydantic v1 models
+  (through `pydantic.v1` when pydantic v2 is installed).
+
+For each adapter, payload and operation (encode or decode), the suite
+reports operations per second, p50 and p99 latency, the peak memory
+allocated by a single call, and the size of the encoded payload.
+
+Latencies are measured on batches of calls lasting at least 20 us, so
+that timer overhead does not dominate small payloads. Payloads are
+generated deterministically and no network access is needed, so results
+can be compared across runs:
+
+    python benchmarks/bench_type_adapters.py --output baseline.json
+    python benchmarks/bench_type_adapters.py --compare baseline.json
+
+Adapters which cannot be imported are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from enum import Enum
+from importlib import metadata
+from typing import Any, Callable, List, Optional
+
+import pydantic
+
+from contracts.core.types import TypeAdapter
+
+if pydantic.__version__.startswith("1."):
+    v1 = pydantic
+    v2: Any = None
+else:
+    from pydantic import v1  # type: ignore[no-redef]
+
+    v2 = pydantic
+
+SIZES = {"small": 1, "medium": 100, "large": 5_000}
+BATCH_DURATION = 20e-6
+
+
+class Status(Enum):
+    ACTIVE = "active"
+    DISABLED = "disabled"
+
+
+# Dataclasses
+
+
+@dataclass
+class FlatRecord:
+    id: int
+    name: str
+    email: str
+    score: float
+    active: bool
+
+
+@dataclass
+class Address:
+    street: str
+    city: str
+    zip_code: str
+
+
+@dataclass
+class NestedRecord:
+    id: int
+    name: str
+    status: Status
+    address: Address
+    tags: List[str]
+    manager: Optional[Address] = None
+
+
+@dataclass
+class FlatBatch:
+    records: List[FlatRecord]
+
+
+@dataclass
+class NestedBatch:
+    records: List[NestedRecord]
+
+
+# Pydantic v1 models
+
+
+class FlatRecordV1(v1.BaseModel):  # type: ignore[name-defined,misc]
+    id: int
+    name: str
+    email: str
+    score: float
+    active: bool
+
+
+class AddressV1(v1.BaseModel):  # type: ignore[name-defined,misc]
+    street: str
+    city: str
+    zip_code: str
+
+
+class NestedRecordV1(v1.BaseModel):  # type: ignore[name-defined,misc]
+    id: int
+    name: str
+    status: Status
+    address: AddressV1
+    tags: List[str]
+    manager: Optional[AddressV1] = None
+
+
+class FlatBatchV1(v1.BaseModel):  # type: ignore[name-defined,misc]
+    records: List[FlatRecordV1]
+
+
+class NestedBatchV1(v1.BaseModel):  # type: ignore[name-defined,misc]
+    records: List[NestedRecordV1]
+
+
+def flat_values(idx: int) -> dict[str, Any]:
+    return {
+        "id": idx,
+        "name": f"user-{idx}",
+        "email": f"user-{idx}@example.com",
+        "score": idx / 7,
+        "active": idx % 2 == 0,
+    }
+
+
+def nested_values(idx: int) -> dict[str, Any]:
+    address = {"street": f"{idx} main street", "city": "Paris", "zip_code": "75001"}
+    return {
+        "id": idx,
+        "name": f"user-{idx}",
+        "status": Status.ACTIVE if idx % 3 else Status.DISABLED,
+        "address": address,
+        "tags": ["a", "b", f"tag-{idx % 10}"],
+        "manager": address if idx % 2 else None,
+    }
+
+
+def load_families() -> dict[str, dict[str, Any]]:
+    """Get the payload types of each family, by shape."""
+    families: dict[str, dict[str, Any]] = {
+        "dataclass": {
+            "flat": (FlatBatch, FlatRecord, None),
+            "nested": (NestedBatch, NestedRecord, Address),
+        },
+        "pydantic_v1": {
+            "flat": (FlatBatchV1, FlatRecordV1, None),
+            "nested": (NestedBatchV1, NestedRecordV1, AddressV1),
+        },
+    }
+    if v2 is not None:
+
+        class FlatRecordV2(v2.BaseModel):
+            id: int
+            name: str
+            email: str
+            score: float
+            active: bool
+
+        class AddressV2(v2.BaseModel):
+            street: str
+            city: str
+            zip_code: str
+
+        class NestedRecordV2(v2.BaseModel):
+            id: int
+            name: str
+            status: Status
+            address: AddressV2
+            tags: List[str]
+            manager: Optional[AddressV2] = None
+
+        class FlatBatchV2(v2.BaseModel):
+            records: List[FlatRecordV2]
+
+        class NestedBatchV2(v2.BaseModel):
+            records: List[NestedRecordV2]
+
+        families["pydantic_v2"] = {
+            "flat": (FlatBatchV2, FlatRecordV2, None),
+            "nested": (NestedBatchV2, NestedRecordV2, AddressV2),
+        }
+    return families
+
+
+def make_payload(batch: Any, record: Any, address: Any, count: int) -> Any:
+    if address is None:
+        return batch(records=[record(**flat_values(idx)) for idx in range(count)])
+    records = []
+    for idx in range(count):
+        values = nested_values(idx)
+        values["address"] = address(**values["address"])
+        if values["manager"] is not None:
+            values["manager"] = address(**values["manager"])
+        records.append(record(**values))
+    return batch(records=records)
+
+
+def load_adapters() -> dict[str, tuple[Callable[[Any], TypeAdapter[Any]], set[str]]]:
+    """Get the adapter constructors, with the families they support."""
+    from contracts.backends.type_adapter.pydantic_v1 import PydanticV1JSONAdapter
+    from contracts.backends.type_adapter.standard import (
+        RawTypeAdapter,
+        StandardJSONAdapter,
+    )
+
+    adapters: dict[str, tuple[Callable[[Any], TypeAdapter[Any]], set[str]]] = {
+        "raw": (RawTypeAdapter, {"raw"}),
+        "standard": (StandardJSONAdapter, {"dataclass"}),
+        # Pydantic v1 patches the dataclasses it validates, which breaks
+        # pydantic v2 validation of the same classes, so it only runs on
+        # pydantic v1 models.
+        "pydantic_v1": (PydanticV1JSONAdapter, {"pydantic_v1"}),
+    }
+    if v2 is not None:
+        from contracts.backends.type_adapter.pydantic_v2 import PydanticV2JSONAdapter
+
+        adapters["pydantic_v2"] = (PydanticV2JSONAdapter, {"dataclass", "pydantic_v2"})
+    try:
+        from contracts.backends.type_adapter.msgspec import MsgspecJSONAdapter
+    except ImportError:
+        pass
+    else:
+        adapters["msgspec"] = (MsgspecJSONAdapter, {"dataclass"})
+    models = {"dataclass", "pydantic_v1", "pydantic_v2"}
+    try:
+        from contracts.backends.type_adapter.msgpack import MsgPackAdapter
+    except ImportError:
+        pass
+    else:
+        adapters["msgpack"] = (MsgPackAdapter, models)
+    try:
+        from contracts.backends.type_adapter.cbor import CBORAdapter
+    except ImportError:
+        pass
+    else:
+        adapters["cbor"] = (CBORAdapter, models)
+    return adapters
+
+
+def load_cases() -> list[tuple[str, str, Any, Any]]:
+    """Get the payload cases as (name, family, type, value) tuples."""
+    cases: list[tuple[str, str, Any, Any]] = []
+    for size, count in SIZES.items():
+        cases.append((f"raw/{size}", "raw", bytes, bytes(range(256)) * (count * 2)))
+    for family, shapes in load_families().items():
+        for shape, types in shapes.items():
+            for size, count in SIZES.items():
+                payload = make_payload(*types, count)
+                cases.append((f"{family}/{shape}/{size}", family, types[0], payload))
+    return cases
+
+
+def calibrate(func: Callable[[], Any]) -> int:
+    """Get the number of calls in a batch lasting at least BATCH_DURATION."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= BATCH_DURATION:
+            return number
+        number *= 2
+
+
+def peak_allocation(func: Callable[[], Any], repeat: int = 5) -> int:
+    """Get the median peak memory in bytes allocated by a single call."""
+    peaks: list[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return int(statistics.median(peaks))
+
+
+def measure(func: Callable[[], Any], duration: float) -> dict[str, float]:
+    """Measure the throughput and latency of a function."""
+    number = calibrate(func)
+    samples: list[float] = []
+    total = 0.0
+    gc.collect()
+    while total < duration or len(samples) < 10:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / number)
+        total += elapsed
+    samples.sort()
+    return {
+        "ops_per_sec": len(samples) * number / total,
+        "p50_ns": samples[len(samples) // 2] * 1e9,
+        "p99_ns": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e9,
+    }
+
+
+def run(duration: float, pattern: str | None = None) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    adapters = load_adapters()
+    for payload, family, typ, value in load_cases():
+        for name, (factory, families) in adapters.items():
+            if family not in families:
+                continue
+            if pattern and pattern not in f"{name}/{payload}":
+                continue
+            adapter = factory(typ)
+            data = adapter.encode(value)
+            if adapter.decode(data) != value:
+                raise AssertionError(f"{name} does not round trip {payload}")
+            operations = {
+                "encode": lambda: adapter.encode(value),
+                "decode": lambda: adapter.decode(data),
+            }
+            for operation, func in operations.items():
+                result = {
+                    "adapter": name,
+                    "payload": payload,
+                    "operation": operation,
+                    **measure(func, duration),
+                    "peak_bytes": peak_allocation(func),
+                    "size_bytes": len(data),
+                }
+                results.append(result)
+                print_result(result)
+    return results
+
+
+def print_result(result: dict[str, Any]) -> None:
+    print(
+        f"{result['payload']:>26} | {result['adapter']:>12} | {result['operation']}"
+        f" | {result['ops_per_sec']:12,.0f} op/s"
+        f" | p50 {result['p50_ns'] / 1e3:10.2f} us"
+        f" | p99 {result['p99_ns'] / 1e3:10.2f} us"
+        f" | peak {result['peak_bytes'] / 1024:10.1f} KiB"
+    )
+
+
+def environment() -> dict[str, Any]:
+    versions: dict[str, str] = {}
+    for package in ("pydantic", "msgspec", "msgpack", "cbor2"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            pass
+    return {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "packages": versions,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], results: list[dict[str, Any]], threshold: float
+) -> int:
+    """Print the speed of results relative to a baseline.
+
+    Speed is compared using the p50 latency, which is less sensitive to
+    noise than the mean throughput.
+
+    Returns:
+        The number of regressions, where throughput dropped by more than the threshold.
+    """
+    reference = {
+        (item["adapter"], item["payload"], item["operation"]): item
+        for item in baseline["results"]
+    }
+    regressions = 0
+    print(f"Compared to baseline of {baseline['environment']['date']}:")
+    for result in results:
+        key = (result["adapter"], result["payload"], result["operation"])
+        if key not in reference:
+            continue
+        ratio = reference[key]["p50_ns"] / result["p50_ns"]
+        status = ""
+        if ratio < 1 - threshold:
+            status = "REGRESSION"
+            regressions += 1
+        elif ratio > 1 + threshold:
+            status = "improvement"
+        print(f"{'/'.join(key):>50} | x{ratio:5.2f} {status}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0.5,
+        help="Time spent measuring each operation, in seconds.",
+    )
+    parser.add_argument(
+        "--filter", help="Only run cases whose 'adapter/payload' contains this text."
+    )
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--compare", help="Compare results to a JSON results file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown of p50 latency reported as a regression.",
+    )
+    args = parser.parse_args(argv)
+    results = run(args.duration, args.filter)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Benchmark decoding with the different validation levels.
+
+Decode the same nested message with `full`, `shallow` and `none`
+validation, using pydantic v1 models (through `pydantic.v1` when
+pydantic v2 is installed) and pydantic v2 models.
+
+Pydantic v2 adapters ignore the validation level, because pydantic-core
+validation is faster than constructing models in Python, so they are
+reported as a reference.
+
+Run with:
+
+    python benchmarks/bench_validation.py
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import timeit
+from enum import Enum
+from typing import Any, List, Optional
+
+import pydantic
+
+from contracts.core.types import Validation, with_validation
+
+if pydantic.__version__.startswith("1."):
+    v1 = pydantic
+else:
+    from pydantic import v1  # type: ignore[no-redef]
+
+
+class Unit(Enum):
+    CELSIUS = "celsius"
+    FAHRENHEIT = "fahrenheit"
+
+
+class SensorV1(v1.BaseModel):  # type: ignore[name-defined,misc]
+    id: str
+    label: Optional[str] = None
+
+
+class EventV1(v1.BaseModel):  # type: ignore[name-defined,misc]
+    temperature: float
+    unit: Unit
+    timestamp: int
+    sensor: SensorV1
+
+
+class BatchV1(v1.BaseModel):  # type: ignore[name-defined,misc]
+    source: str
+    created_at: datetime.datetime
+    events: List[EventV1]
+
+
+def make_payload(count: int) -> dict[str, Any]:
+    return {
+        "source": "kitchen",
+        "created_at": "2024-01-01T00:00:00",
+        "events": [
+            {
+                "temperature": 20 + idx / 10,
+                "unit": "celsius",
+                "timestamp": idx,
+                "sensor": {"id": f"sensor-{idx % 4}", "label": None},
+            }
+            for idx in range(count)
+        ],
+    }
+
+
+def load_adapters() -> dict[str, Any]:
+    from contracts.backends.type_adapter.pydantic_v1 import PydanticV1JSONAdapter
+
+    adapters: dict[str, Any] = {"pydantic_v1": PydanticV1JSONAdapter(BatchV1)}
+    if pydantic.__version__.startswith("2."):
+        from contracts.backends.type_adapter.pydantic_v2 import PydanticV2JSONAdapter
+
+        class Sensor(pydantic.BaseModel):
+            id: str
+            label: Optional[str] = None
+
+        class Event(pydantic.BaseModel):
+            temperature: float
+            unit: Unit
+            timestamp: int
+            sensor: Sensor
+
+        class Batch(pydantic.BaseModel):
+            source: str
+            created_at: datetime.datetime
+            events: List[Event]
+
+        adapters["pydantic_v2"] = PydanticV2JSONAdapter(Batch)
+    return adapters
+
+
+def main(number: int = 1_000) -> None:
+    adapters = load_adapters()
+    for count in (1, 50):
+        data = json.dumps(make_payload(count)).encode()
+        print(f"{count} events ({len(data)} bytes)")
+        for name, base in adapters.items():
+            full = lambda: base.decode(data)  # noqa: E731
+            expected = full()
+            reference = min(timeit.repeat(full, number=number, repeat=5)) / number
+            for validation in Validation:
+                adapter = with_validation(base, validation)
+                if validation == Validation.FULL:
+                    elapsed = reference
+                else:
+                    assert adapter.decode(data) == expected
+                    elapsed = (
+                        min(
+                            timeit.repeat(
+                                lambda: adapter.decode(data), number=number, repeat=5
+                            )
+                        )
+                        / number
+                    )
+                print(
+                    f"  {name:>12} | {validation.value:>7} | "
+                    f"{elapsed * 1e6:8.2f} us | x{reference / elapsed:5.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,6 @@ async def test_my_producer():
         (
             "sensors.kitchen.thermometer",
             b'{"temperature":23.5,"timestamp":123456}',
-            {},
+            {"Nats-Msg-Id": client.events_published[0].id},
         )
     ]
@@ -7,7 +7,17 @@ from .abc.message import Message
 from .abc.request import Request
 
 # The decorator and helper classes for operations
-from .api import consumer, contact, event, exception, license, operation, schema, tag
+from .api import (
+    compression,
+    consumer,
+    contact,
+    event,
+    exception,
+    license,
+    operation,
+    schema,
+    tag,
+)
 
 # The base class for applications
 from .application import Application
@@ -24,6 +34,7 @@ __all__ = [
     "license",
     # Common
     "schema",
+    "compression",
     # Operation related
     "operation",
     "exception",
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import abc
-from typing import Generic
+from typing import Generic, Sequence
 
 from ..core.event_spec import EventSpec
 from ..core.types import ParamsT, S, T
@@ -27,3 +27,19 @@ class BaseConsumer(Generic[S, ParamsT, T], metaclass=abc.ABCMeta):
     @abc.abstractmethod
     async def handle(self, event: Message[BaseEvent[S, ParamsT, T]]) -> None:
         raise NotImplementedError
+
+    async def handle_batch(
+        self, events: Sequence[Message[BaseEvent[S, ParamsT, T]]]
+    ) -> None:
+        """Handle a batch of events.
+
+        Consumers override this method to process several events at once,
+        for example to write all events using a single database query.
+        When overridden, the server runtime delivers events in batches,
+        with payloads already decoded, and `handle` is only used by tests
+        or callers handling a single event.
+
+        By default, events are handled one at a time using `handle`.
+        """
+        for event in events:
+            await self.handle(event)
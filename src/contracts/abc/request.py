@@ -3,7 +3,7 @@ from __future__ import annotations
 import abc
 from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
 
-from ..core.types import ParamsT, R, T
+from ..core.types import Buffer, ParamsT, R, T
 
 if TYPE_CHECKING:
     from .operation import BaseOperation
@@ -24,6 +24,17 @@ class Request(Generic[OT], metaclass=abc.ABCMeta):
         """Get the message payload."""
         raise NotImplementedError
 
+    def raw_payload(self) -> Buffer:
+        """Get the message payload as received, without decoding it.
+
+        This method is not abstract, so that requests implemented before it
+        was added can still be created. Such requests raise
+        `NotImplementedError`.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not give access to the raw payload"
+        )
+
     @abc.abstractmethod
     def headers(self) -> dict[str, str]:
         """Get the message headers."""
@@ -7,13 +7,24 @@ from typing import Any, Callable, Generic, Iterable, cast, overload
 from .abc.consumer import BaseConsumer
 from .abc.event import BaseEvent
 from .abc.operation import BaseOperation
+from .backends.compression.defaults import ENCODINGS, available_compressors
 from .backends.type_adapter.defaults import sniff_type_adapter
+from .backends.type_adapter.stream import is_stream_type
 from .core.application_info import Contact, License, Tag
+from .core.compression import Compression
 from .core.event_spec import EventSpec
 from .core.exception_formatter import ExceptionFormatter
 from .core.operation_spec import OperationSpec
 from .core.schema import Schema
-from .core.types import ParametersFactory, ParamsT, R, S, T, TypeAdapter
+from .core.types import (
+    ParametersFactory,
+    ParamsT,
+    R,
+    S,
+    T,
+    TypeAdapter,
+    TypeAdapterFactory,
+)
 
 
 def license(name: str | None = None, url: str | None = None) -> License:
@@ -44,10 +55,34 @@ def exception(
     return ExceptionFormatter(origin, code, description, fmt)
 
 
+def compression(*encodings: str, threshold: int = 1024) -> Compression:
+    """Create compression settings for a schema.
+
+    Args:
+        encodings: The content encodings which can be used, in order of preference. Defaults to zstd, lz4 and gzip. Encodings whose optional dependency is not installed are ignored.
+        threshold: The minimum size in bytes of a payload to compress.
+
+    Returns:
+        The compression settings.
+    """
+    if threshold < 0:
+        raise ValueError("Compression threshold must be positive")
+    encodings = encodings or ENCODINGS
+    compressors = available_compressors(*encodings)
+    if not compressors:
+        raise ValueError(
+            f"None of the content encodings is available: {', '.join(encodings)}"
+        )
+    return Compression(compressors, threshold)
+
+
 def schema(
     type: type[T],
     content_type: str | None = None,
     type_adapter: TypeAdapter[T] | None = None,
+    adapter_factory: TypeAdapterFactory | None = None,
+    compression: Compression | None = None,
+    alternatives: Iterable[str] | None = None,
 ) -> Schema[T]:
     """Create a schema for the given type.
 
@@ -55,6 +90,9 @@ def schema(
         type: The type of the schema.
         content_type: The content type of the schema.
         type_adapter: The type adapter for the schema.
+        adapter_factory: The factory used to create the type adapter when `type_adapter` is not provided.
+        compression: The compression settings of the schema, created using `compression()`.
+        alternatives: Additional content types supported by the schema, such as `application/msgpack`. Requests and replies are encoded with the content type negotiated by the client, and `content_type` is used when client does not negotiate.
 
     Returns:
         The schema for the given type.
@@ -62,8 +100,16 @@ def schema(
     if not content_type:
         content_type = _sniff_content_type(type)
     if not type_adapter:
-        type_adapter = sniff_type_adapter(type)
-    return Schema(type, content_type, type_adapter)
+        if adapter_factory:
+            type_adapter = adapter_factory(type)
+        else:
+            type_adapter = sniff_type_adapter(type, content_type)
+    adapters = {
+        alternative: sniff_type_adapter(type, alternative)
+        for alternative in alternatives or ()
+        if alternative != content_type
+    }
+    return Schema(type, content_type, type_adapter, compression, adapters)
 
 
 def _sniff_content_type(typ: type[Any]) -> str:
@@ -77,6 +123,8 @@ def _sniff_content_type(typ: type[Any]) -> str:
     """
     if is_dataclass(typ):
         return "application/json"
+    if is_stream_type(typ):
+        return "application/json"
     if hasattr(typ, "model_fields"):
         return "application/json"
     if hasattr(typ, "__fields__"):
@@ -4,7 +4,10 @@ from typing import Any, Iterable
 
 from .abc.consumer import BaseConsumer
 from .abc.operation import BaseOperation
+from .core.address import Address
 from .core.application_info import Contact, License, Tag
+from .core.router import Router
+from .registry import ConsumerEntry, OperationEntry, Registry
 
 
 class Application:
@@ -56,6 +59,23 @@ class Application:
         self.tags = tags or []
         self.external_docs = external_docs
         self.title = title
+        self._registry: Registry | None = None
+        self._registry_components: tuple[type[Any], ...] = ()
+
+    def compile(self) -> Registry:
+        """Compile the application components into a read-only registry.
+
+        The registry is cached and compiled again only when the list of
+        components changes.
+        """
+        components = tuple(self.components)
+        if self._registry is None or self._registry_components != components:
+            self._registry = Registry.create(
+                components,
+                metadata={"id": self.id, "name": self.name, "version": self.version},
+            )
+            self._registry_components = components
+        return self._registry
 
 
 def validate_operations(
@@ -64,23 +84,17 @@ def validate_operations(
         BaseOperation[Any, Any, Any, Any] | BaseConsumer[Any, Any, Any]
     ],
 ) -> list[BaseOperation[Any, Any, Any, Any]]:
-    subjects: dict[str, str] = {}
+    registry = app.compile()
+    index = AddressIndex()
     operations: list[BaseOperation[Any, Any, Any, Any]] = []
     for endpoint in components:
         if isinstance(endpoint, BaseConsumer):
             continue
-        for candidate in app.components:
-            if isinstance(endpoint, candidate):
-                break
-        else:
+        if not isinstance(registry.lookup(endpoint), OperationEntry):
             raise ValueError(f"Endpoint {endpoint} is not supported by the service")
-        if endpoint.spec.address.subject in subjects:
-            existing_endpoint = subjects[endpoint.spec.address.subject]
-            raise ValueError(
-                f"Endpoint {endpoint} uses the same subject as endpoint {existing_endpoint}: {endpoint.spec.address.subject}"
-            )
-        subjects[endpoint.spec.address.subject] = endpoint.spec.name
+        index.add(endpoint.spec.address, f"endpoint {endpoint.spec.name}")
         operations.append(endpoint)
+    index.raise_on_overlap()
     return operations
 
 
@@ -90,21 +104,56 @@ def validate_consumers(
         BaseOperation[Any, Any, Any, Any] | BaseConsumer[Any, Any, Any]
     ],
 ) -> list[BaseConsumer[Any, Any, Any]]:
-    subjects: dict[str, str] = {}
+    registry = app.compile()
+    index = AddressIndex()
     consumers: list[BaseConsumer[Any, Any, Any]] = []
     for consumer in components:
         if isinstance(consumer, BaseOperation):
             continue
-        for candidate in app.components:
-            if isinstance(consumer, candidate):
-                break
-        else:
+        if not isinstance(registry.lookup(consumer), ConsumerEntry):
             raise ValueError(f"Consumer {consumer} is not supported by the service")
-        if consumer.event_spec.address.subject in subjects:
-            existing_consumer = subjects[consumer.event_spec.address.subject]
-            raise ValueError(
-                f"Consumer {consumer} uses the same subject as consumer {existing_consumer}: {consumer.event_spec.address.subject}"
-            )
-        subjects[consumer.event_spec.address.subject] = consumer.event_spec.name
+        index.add(consumer.event_spec.address, f"consumer {consumer.event_spec.name}")
         consumers.append(consumer)
+    index.raise_on_overlap()
     return consumers
+
+
+class AddressIndex:
+    """An index used to detect overlapping addresses.
+
+    Two addresses overlap when at least one subject matches both
+    addresses, for example `foo.{bar}` and `foo.baz`.
+    """
+
+    def __init__(self) -> None:
+        self._router: Router[str] = Router()
+        self._names: dict[str, list[tuple[str, str]]] = {}
+        self.overlaps: list[tuple[str, str, str, str]] = []
+
+    def add(self, address: Address[Any], name: str) -> None:
+        """Add an address to the index and record its overlaps.
+
+        Args:
+            address: The address to add.
+            name: The name used to report overlaps.
+        """
+        key = address.placeholders.subject
+        for route in self._router.overlapping(address):
+            for other_name, other_subject in self._names[route.target]:
+                self.overlaps.append((name, address.subject, other_name, other_subject))
+        if key in self._names:
+            self._names[key].append((name, address.subject))
+            return
+        self._names[key] = [(name, address.subject)]
+        self._router.add(address, key)
+
+    def raise_on_overlap(self) -> None:
+        """Raise a ValueError describing all overlaps found."""
+        if not self.overlaps:
+            return
+        raise ValueError(
+            "\n".join(
+                f"Address '{subject}' of {name} overlaps with address '{other_subject}' of {other_name}"
+                for name, subject, other_name, other_subject in self.overlaps
+            )
+        )
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Protocol
+from typing import TYPE_CHECKING, Any, List, Protocol
 
 import pydantic
+from typing_extensions import get_args
 
-from contracts.api import BaseOperation
-
+from ..backends.type_adapter.stream import is_stream_type
+from ..core.compression import ACCEPT_ENCODING, CONTENT_ENCODING
+from ..core.negotiation import ACCEPT, CONTENT_TYPE
 from .specification import (
     Action,
     AsyncAPI,
@@ -25,6 +27,7 @@ from .specification import (
 
 if TYPE_CHECKING:
     from ..application import Application
+    from ..core.schema import Schema
 
 
 if pydantic.__version__.startswith("1."):
@@ -86,97 +89,188 @@ def build_spec(
     spec = AsyncAPI(asyncapi="3.0.0", id=app.id, info=info, components=Components())
     # Now add the channels
     # For each channel, first add a component, then add the channel
-    for ep in app.components:
+    for entry in app.compile().operations:
         # FIXME: Refactor this ugly code
         # FIXME: Generate documentation for consumers
-        if issubclass(ep, BaseOperation):
-            ep_spec = (
-                ep._spec  # pyright: ignore[reportPrivateUsage,reportGeneralTypeIssues]
-            )
-            # Add payload schema
-            payload = (
-                ep._spec.payload  # pyright: ignore[reportPrivateUsage,reportGeneralTypeIssues]
-            )
-            schema = schema_adapter(payload.type)
-            spec.components.schemas[payload.type.__name__] = schema
-            request_ref = Reference.from_ref(
-                f"#/components/schemas/{payload.type.__name__}"
-            )
-            # Add response schema
-            response = ep_spec.reply_payload
-            schema = schema_adapter(response.type)
-            spec.components.schemas[response.type.__name__] = schema
-            response_ref = Reference.from_ref(
-                f"#/components/schemas/{response.type.__name__}"
-            )
-            # Add parameters
-            params = ep_spec.address._fields  # pyright: ignore[reportPrivateUsage]
-            params_refs: dict[str, Reference] = {}
-            for param in params:
-                spec.components.parameters[param] = Parameter()
-                params_refs[param] = Reference.from_ref(
-                    f"#/components/parameters/{param}"
-                )
-
-            # Add payload message
-            message = Message(
-                name=payload.type.__name__,
-                description=payload.type.__doc__,
-                payload=request_ref,
-            )
-            spec.components.messages[payload.type.__name__] = message
-            request_message_ref = Reference.from_ref(
-                f"#/components/messages/{payload.type.__name__}"
-            )
-            # Add response message
-            message = Message(
-                name=response.type.__name__,
-                description=response.type.__doc__,
-                payload=response_ref,
-            )
-            spec.components.messages[response.type.__name__] = message
-            response_message_ref = Reference.from_ref(
-                f"#/components/messages/{response.type.__name__}"
-            )
-            # Add channel
-            spec.components.channels[ep_spec.name + "_request"] = Channel(
-                address=ep_spec.address.subject,
-                parameters=params_refs,
-                messages={
-                    payload.type.__name__: request_message_ref,
-                },
-            )
-            channel_ref = Reference.from_ref(
-                f"#/components/channels/{ep_spec.name + '_request'}"
-            )
-            # Add reply channel
-            spec.components.channels[ep_spec.name + "_reply"] = Channel(
-                address=None,
-                summary=f"Reply channel for {ep_spec.name} operation",
-                messages={
-                    response.type.__name__: response_message_ref,
-                },
-            )
-            reply_channel_ref = Reference.from_ref(
-                f"#/components/channels/{ep_spec.name + '_reply'}"
-            )
-            # Add reply object
-            reply = OperationReply(
-                channel=reply_channel_ref,
-            )
-            # Add operation
-            spec.components.operations[ep_spec.name] = Operation(
-                action=Action.RECEIVE,
-                channel=channel_ref,
-                description=ep.__doc__,
-                reply=reply,
-            )
-            operation_ref = Reference.from_ref(
-                ref=f"#/components/operations/{ep_spec.name}"
-            )
-            # Add the channel and the operations to the root spec
-            spec.channels[ep_spec.name + "_request"] = channel_ref
-            spec.channels[ep_spec.name + "_reply"] = reply_channel_ref
-            spec.operations[ep_spec.name] = operation_ref
+        ep = entry.cls
+        ep_spec = entry.spec
+        # Add payload schema
+        payload = ep_spec.payload
+        schema = schema_adapter(_schema_type(payload.type))
+        spec.components.schemas[_type_name(payload.type)] = schema
+        request_ref = Reference.from_ref(
+            f"#/components/schemas/{_type_name(payload.type)}"
+        )
+        # Add response schema
+        response = ep_spec.reply_payload
+        schema = schema_adapter(_schema_type(response.type))
+        spec.components.schemas[_type_name(response.type)] = schema
+        response_ref = Reference.from_ref(
+            f"#/components/schemas/{_type_name(response.type)}"
+        )
+        # Add parameters
+        params = ep_spec.address._fields  # pyright: ignore[reportPrivateUsage]
+        params_refs: dict[str, Reference] = {}
+        for param in params:
+            spec.components.parameters[param] = Parameter()
+            params_refs[param] = Reference.from_ref(f"#/components/parameters/{param}")
+
+        # Add headers schemas
+        request_headers_ref = _add_headers_schema(
+            spec,
+            ep_spec.name + "_request_headers",
+            payload,
+            response,
+        )
+        response_headers_ref = _add_headers_schema(
+            spec,
+            ep_spec.name + "_reply_headers",
+            response,
+            None,
+        )
+        # Add payload message
+        message = Message(
+            name=_type_name(payload.type),
+            description=payload.type.__doc__,
+            headers=request_headers_ref,
+            payload=request_ref,
+            contentType=payload.content_type or None,
+        )
+        spec.components.messages[_type_name(payload.type)] = message
+        request_message_ref = Reference.from_ref(
+            f"#/components/messages/{_type_name(payload.type)}"
+        )
+        # Add response message
+        message = Message(
+            name=_type_name(response.type),
+            description=response.type.__doc__,
+            headers=response_headers_ref,
+            payload=response_ref,
+            contentType=response.content_type or None,
+        )
+        spec.components.messages[_type_name(response.type)] = message
+        response_message_ref = Reference.from_ref(
+            f"#/components/messages/{_type_name(response.type)}"
+        )
+        # Add channel
+        spec.components.channels[ep_spec.name + "_request"] = Channel(
+            address=ep_spec.address.subject,
+            parameters=params_refs,
+            messages={
+                _type_name(payload.type): request_message_ref,
+            },
+        )
+        channel_ref = Reference.from_ref(
+            f"#/components/channels/{ep_spec.name + '_request'}"
+        )
+        # Add reply channel
+        spec.components.channels[ep_spec.name + "_reply"] = Channel(
+            address=None,
+            summary=f"Reply channel for {ep_spec.name} operation",
+            messages={
+                _type_name(response.type): response_message_ref,
+            },
+        )
+        reply_channel_ref = Reference.from_ref(
+            f"#/components/channels/{ep_spec.name + '_reply'}"
+        )
+        # Add reply object
+        reply = OperationReply(
+            channel=reply_channel_ref,
+        )
+        # Add operation
+        spec.components.operations[ep_spec.name] = Operation(
+            action=Action.RECEIVE,
+            channel=channel_ref,
+            description=ep.__doc__,
+            reply=reply,
+        )
+        operation_ref = Reference.from_ref(
+            ref=f"#/components/operations/{ep_spec.name}"
+        )
+        # Add the channel and the operations to the root spec
+        spec.channels[ep_spec.name + "_request"] = channel_ref
+        spec.channels[ep_spec.name + "_reply"] = reply_channel_ref
+        spec.operations[ep_spec.name] = operation_ref
 
     return spec
+
+
+def _add_headers_schema(
+    spec: AsyncAPI,
+    name: str,
+    schema: Schema[Any],
+    reply: Schema[Any] | None,
+) -> Reference | None:
+    """Add the schema of the headers used to negotiate the encoding of a message.
+
+    Args:
+        spec: The specification to update.
+        name: The name of the headers schema.
+        schema: The schema of the message payload.
+        reply: The schema of the reply to the message, if any.
+
+    Returns:
+        A reference to the headers schema, or `None` when message does not use negotiation headers.
+    """
+    properties: dict[str, Any] = {}
+    if schema.alternatives:
+        properties[CONTENT_TYPE] = {
+            "type": "string",
+            "enum": list(schema.content_types),
+            "default": schema.content_type,
+            "description": "Content type of the payload.",
+        }
+    if schema.compression:
+        properties[CONTENT_ENCODING] = {
+            "type": "string",
+            "enum": list(schema.compression.encodings),
+            "description": (
+                "Compression applied to the payload. "
+                f"Payloads smaller than {schema.compression.threshold} bytes are not compressed."
+            ),
+        }
+    if reply and reply.alternatives:
+        properties[ACCEPT] = {
+            "type": "string",
+            "description": (
+                "Comma-separated list of content types the reply may be encoded with. "
+                f"Supported content types: {', '.join(reply.content_types)}."
+            ),
+        }
+    if reply and reply.compression:
+        properties[ACCEPT_ENCODING] = {
+            "type": "string",
+            "description": (
+                "Comma-separated list of encodings the reply may be compressed with. "
+                f"Supported encodings: {', '.join(reply.compression.encodings)}."
+            ),
+        }
+    if not properties:
+        return None
+    spec.components.schemas[name] = {"type": "object", "properties": properties}
+    return Reference.from_ref(f"#/components/schemas/{name}")
+
+
+def _type_name(typ: Any) -> str:
+    """Get the name of a type in the components of the specification.
+
+    Generic types, such as streams of items, are named after their
+    arguments as well.
+    """
+    name = getattr(typ, "__name__", None) or str(typ)
+    args = get_args(typ)
+    if not args:
+        return name
+    return "_".join([name, *(_type_name(arg) for arg in args)])
+
+
+def _schema_type(typ: Any) -> Any:
+    """Get the type documented for a payload.
+
+    Streams of items are documented as the JSON array sent on the wire.
+    """
+    if is_stream_type(typ):
+        args = get_args(typ)
+        return List[args[0] if args else Any]  # type: ignore[valid-type]
+    return typ
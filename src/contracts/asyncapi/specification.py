@@ -221,6 +221,9 @@ class Message(BaseModel):
     correlationId: dict[str, Any] | None = None
     """Definition of the correlation ID used for message tracing or matching."""
 
+    contentType: str | None = None
+    """The content type to use when encoding/decoding a message's payload. When omitted, the value MUST be the one specified on the defaultContentType field."""
+
     name: str | None = None
     """A human-friendly name for the message."""
 
@@ -1,3 +1,4 @@
-from .client import Client
+from .client import Client, MicroClientAdapter
+from .jetstream import JetStreamPublisher, PublishStats
 
-__all__ = ["Client"]
+__all__ = ["Client", "JetStreamPublisher", "MicroClientAdapter", "PublishStats"]
@@ -1,37 +1,70 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Any, Iterable
+
 from nats.aio.client import Client as NatsClient
 from nats_contrib.micro.client import Client as BaseMicroClient
 from nats_contrib.micro.client import ServiceError
 
 from contracts.client import Client as BaseClient
-from contracts.client import RawOperationError, RawReply
+from contracts.client import ClientAdapter, RawOperationError, RawReply
+from contracts.core.buffers import BufferPool
+from contracts.core.types import Buffer, Validation
+from contracts.outbox import Outbox
 
+from .jetstream import JetStreamPublisher
+
+
+class MicroClientAdapter(ClientAdapter):
+    """A client adapter sending requests to micro services.
+
+    Events are published using core NATS, or to JetStream when a publisher
+    is given, in which case sending an event waits for its acknowledgement.
+
+    Args:
+        client: The NATS client.
+        api_prefix: The API prefix of micro services.
+        publisher: The publisher used to publish events to JetStream.
+    """
 
-class Client(BaseClient):
     def __init__(
         self,
         client: NatsClient,
+        api_prefix: str | None = None,
+        publisher: JetStreamPublisher | None = None,
     ) -> None:
-        self._client = BaseMicroClient(client)
+        self._nc = client
+        self._client = BaseMicroClient(client, api_prefix=api_prefix)
+        self.publisher = publisher
 
-    async def __send_event__(
+    async def send_event(
         self,
         subject: str,
-        payload: bytes,
+        payload: Buffer,
         headers: dict[str, str] | None = None,
     ) -> None:
         """Send an event."""
-        await self._client.nc.publish(
-            subject=subject,
-            payload=payload,
-            headers=headers,
-        )
+        if self.publisher is None:
+            await self._nc.publish(subject, payload, headers=headers)
+            return
+        await (await self.publisher.publish(subject, payload, headers))
+
+    async def publish_event(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> asyncio.Future[Any]:
+        """Send an event without waiting for its acknowledgement."""
+        if self.publisher is None:
+            return await super().publish_event(subject, payload, headers)
+        return await self.publisher.publish(subject, payload, headers)
 
-    async def __send_request__(
+    async def send_request(
         self,
         subject: str,
-        payload: bytes,
+        payload: Buffer,
         headers: dict[str, str] | None = None,
         timeout: float = 1,
     ) -> RawReply:
@@ -49,3 +82,33 @@ class Client(BaseClient):
             response.data,
             response.headers or {},
         )
+
+
+class Client(BaseClient):
+    """A client sending requests to micro services and publishing events.
+
+    Args:
+        client: The NATS client.
+        content_types: The preferred content types, in order of preference.
+        validation: The validation applied when decoding replies.
+        buffers: The pool of buffers used to encode payloads.
+        publisher: The publisher used to publish events to JetStream. Events are published using core NATS by default.
+        outbox: The outbox events are appended to before they are published.
+    """
+
+    def __init__(
+        self,
+        client: NatsClient,
+        content_types: Iterable[str] = (),
+        validation: Validation | str = Validation.FULL,
+        buffers: BufferPool | None = None,
+        publisher: JetStreamPublisher | None = None,
+        outbox: Outbox | None = None,
+    ) -> None:
+        super().__init__(
+            MicroClientAdapter(client, publisher=publisher),
+            content_types,
+            validation,
+            buffers,
+            outbox,
+        )
@@ -0,0 +1,155 @@
+"""The jetstream module publishes events to JetStream streams.
+
+Events are published without waiting for the acknowledgement of the
+previous ones, up to a window of outstanding acknowledgements. Publishing
+blocks once the window is full, until an acknowledgement is received, so
+that producers cannot outrun the server.
+
+Events which are not acknowledged within a timeout are published again,
+once the attempt which timed out released its slot in the window. Each
+event carries a `Nats-Msg-Id` header, so that the stream discards
+duplicates when the first attempt was stored but its acknowledgement was
+lost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+
+from nats.aio.client import Client as NatsClient
+from nats.js.api import Header, PubAck
+from nats.js.errors import TooManyStalledMsgsError
+
+from contracts.core.types import Buffer
+
+MSG_ID = Header.MSG_ID.value
+
+
+@dataclass
+class PublishStats:
+    """Statistics of a JetStream publisher.
+
+    Args:
+        published: The number of events published, not counting retries.
+        acknowledged: The number of events acknowledged by the server.
+        retried: The number of attempts which timed out and were published again.
+        failed: The number of events which were not acknowledged after all attempts, or were rejected.
+    """
+
+    published: int = 0
+    acknowledged: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def pending(self) -> int:
+        """The number of events waiting for an acknowledgement."""
+        return self.published - self.acknowledged - self.failed
+
+
+class JetStreamPublisher:
+    """Publish events to JetStream with a window of outstanding acknowledgements.
+
+    Args:
+        client: The NATS client.
+        window: The maximum number of events waiting for an acknowledgement.
+        ack_timeout: The time in seconds to wait for an acknowledgement before publishing an event again.
+        max_retries: The maximum number of times an event is published again.
+    """
+
+    def __init__(
+        self,
+        client: NatsClient,
+        window: int = 256,
+        ack_timeout: float = 5.0,
+        max_retries: int = 2,
+    ) -> None:
+        if window < 1:
+            raise ValueError("Window must be at least 1")
+        if max_retries < 0:
+            raise ValueError("Max retries must be positive")
+        self.client = client
+        self.window = window
+        self.ack_timeout = ack_timeout
+        self.max_retries = max_retries
+        self.stats = PublishStats()
+        self._js = client.jetstream(publish_async_max_pending=window)
+        self._tasks: set[asyncio.Future[PubAck]] = set()
+
+    async def publish(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> asyncio.Future[PubAck]:
+        """Publish an event, waiting only for a free slot in the window.
+
+        The payload is copied, so the buffer can be reused as soon as this
+        method returns.
+
+        Returns:
+            A future resolved with the acknowledgement of the event. It fails with `asyncio.TimeoutError` when no attempt was acknowledged, or with the error returned by the server.
+        """
+        headers = dict(headers) if headers else {}
+        if MSG_ID not in headers:
+            headers[MSG_ID] = uuid.uuid4().hex
+        data = bytes(payload)
+        ack = await self._js.publish_async(subject, data, headers=headers)
+        self.stats.published += 1
+        future = asyncio.ensure_future(self._wait(ack, subject, data, headers))
+        self._tasks.add(future)
+        future.add_done_callback(self._tasks.discard)
+        return future
+
+    async def flush(self) -> None:
+        """Wait until all published events are acknowledged or failed."""
+        # Finished events may still be in the set until their callback runs,
+        # and waiting for tasks which are already done does not yield
+        while True:
+            pending = [task for task in self._tasks if not task.done()]
+            if not pending:
+                return
+            await asyncio.wait(pending)
+
+    async def _wait(
+        self,
+        ack: asyncio.Future[PubAck],
+        subject: str,
+        data: bytes,
+        headers: dict[str, str],
+    ) -> PubAck:
+        attempt = ack
+        stats = self.stats
+        try:
+            for retry in range(self.max_retries + 1):
+                if retry:
+                    stats.retried += 1
+                    attempt = await self._publish_again(subject, data, headers)
+                done, _ = await asyncio.wait([attempt], timeout=self.ack_timeout)
+                if done:
+                    result = attempt.result()
+                    stats.acknowledged += 1
+                    return result
+                # An attempt holds a window slot until it is done, so it is
+                # abandoned before publishing again. The stream acknowledges
+                # the next attempt as a duplicate when the event was stored.
+                attempt.cancel()
+            raise asyncio.TimeoutError("Event was not acknowledged")
+        except BaseException:
+            stats.failed += 1
+            raise
+        finally:
+            attempt.cancel()
+
+    async def _publish_again(
+        self, subject: str, data: bytes, headers: dict[str, str]
+    ) -> asyncio.Future[PubAck]:
+        """Publish an event again, waiting for a free slot up to the ack timeout."""
+        try:
+            return await self._js.publish_async(
+                subject, data, wait_stall=self.ack_timeout, headers=headers
+            )
+        except TooManyStalledMsgsError as e:
+            raise asyncio.TimeoutError("Event was not acknowledged") from e
@@ -0,0 +1,12 @@
+from contracts.core.compression import Compression, Compressor
+
+from .defaults import ENCODINGS, available_compressors, decompress, get_compressor
+
+__all__ = [
+    "Compression",
+    "Compressor",
+    "ENCODINGS",
+    "available_compressors",
+    "decompress",
+    "get_compressor",
+]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from contracts.core.compression import Compressor
+from contracts.core.types import Buffer
+
+ENCODINGS = ("zstd", "lz4", "gzip")
+"""The supported content encodings, in default order of preference."""
+
+
+@lru_cache(maxsize=None)
+def get_compressor(encoding: str) -> Compressor:
+    """Get the compressor for a content encoding.
+
+    Raises:
+        ValueError: When the encoding is not supported.
+        ImportError: When the optional dependency required by the encoding is not installed.
+    """
+    if encoding == "gzip":
+        from .standard import GzipCompressor
+
+        return GzipCompressor()
+    if encoding == "zstd":
+        from .zstd import ZstdCompressor
+
+        return ZstdCompressor()
+    if encoding == "lz4":
+        from .lz4 import Lz4Compressor
+
+        return Lz4Compressor()
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def available_compressors(*encodings: str) -> dict[str, Compressor]:
+    """Get the compressors of the encodings whose dependencies are installed.
+
+    Raises:
+        ValueError: When an encoding is not supported.
+    """
+    compressors: dict[str, Compressor] = {}
+    for encoding in encodings:
+        try:
+            compressors[encoding] = get_compressor(encoding)
+        except ImportError:
+            continue
+    return compressors
+
+
+def decompress(data: Buffer, encoding: str | None) -> Buffer:
+    """Decompress data according to the value of a `Content-Encoding` header.
+
+    Raises:
+        ValueError: When the encoding is not supported or cannot be decoded.
+    """
+    if not encoding or encoding == "identity":
+        return data
+    try:
+        compressor = get_compressor(encoding.strip().lower())
+    except ImportError as exc:
+        raise ValueError(f"Unsupported content encoding: {encoding}") from exc
+    return compressor.decompress(data)
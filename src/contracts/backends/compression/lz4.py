@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import lz4.frame
+
+from contracts.core.compression import Compressor
+from contracts.core.types import Buffer
+
+
+class Lz4Compressor(Compressor):
+    """A compressor using lz4 frames."""
+
+    def __init__(self, level: int = 0) -> None:
+        self.level = level
+
+    def compress(self, data: Buffer) -> bytes:
+        return lz4.frame.compress(data, compression_level=self.level)
+
+    def decompress(self, data: Buffer) -> bytes:
+        return lz4.frame.decompress(data)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import gzip
+
+from contracts.core.compression import Compressor
+from contracts.core.types import Buffer
+
+
+class GzipCompressor(Compressor):
+    """A compressor using gzip from standard library."""
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def compress(self, data: Buffer) -> bytes:
+        # A fixed modification time makes the output deterministic
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def decompress(self, data: Buffer) -> bytes:
+        return gzip.decompress(data)
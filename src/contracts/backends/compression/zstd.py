@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import zstandard
+
+from contracts.core.compression import Compressor
+from contracts.core.types import Buffer
+
+
+class ZstdCompressor(Compressor):
+    """A compressor using zstandard."""
+
+    def __init__(self, level: int = 3) -> None:
+        self.level = level
+        self.compressor = zstandard.ZstdCompressor(level=level)
+        self.decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: Buffer) -> bytes:
+        return self.compressor.compress(data)
+
+    def decompress(self, data: Buffer) -> bytes:
+        return self.decompressor.decompress(data)
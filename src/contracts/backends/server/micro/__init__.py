@@ -1,3 +1,10 @@
+from .jetstream import ConsumerOptions, header_key, params_key
 from .server import MicroAdapter, create_micro_server, start_micro_server
 
-__all__ = ["MicroAdapter", "start_micro_server"]
+__all__ = [
+    "ConsumerOptions",
+    "MicroAdapter",
+    "header_key",
+    "params_key",
+    "start_micro_server",
+]
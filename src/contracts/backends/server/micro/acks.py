@@ -0,0 +1,179 @@
+"""The acks module coalesces acknowledgements of JetStream messages.
+
+JetStream has no message acknowledging several messages delivered to a
+consumer with an explicit ack policy: each message is acknowledged by
+publishing to its own reply subject. Acknowledgements are queued instead,
+then published together and confirmed by a single flush of the
+connection, once enough acknowledgements are pending or once a delay
+elapsed since the first one was queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from nats.aio.client import Client as NatsClient
+from nats.aio.msg import Msg
+
+logger = logging.getLogger(__name__)
+
+ACK = Msg.Ack.Ack
+TERM = Msg.Ack.Term
+
+
+@lru_cache(maxsize=64)
+def nak_payload(delay: float | None = None) -> bytes:
+    """Get the payload of a negative acknowledgement.
+
+    Payloads are cached, so that naks with the same delay share the same
+    payload.
+    """
+    if not delay:
+        return Msg.Ack.Nak
+    return Msg.Ack.Nak + b" " + json.dumps({"delay": int(delay * 10**9)}).encode()
+
+
+@dataclass
+class AckStats:
+    """Statistics of an ack buffer.
+
+    Args:
+        queued: The number of acknowledgements queued.
+        sent: The number of acknowledgements published and flushed.
+        failed: The number of acknowledgements which could not be published or flushed.
+        flushes: The number of flushes.
+        pending: The number of acknowledgements queued and not flushed yet.
+        max_pending: The highest number of acknowledgements pending at once.
+        total_latency: The sum of the time in seconds between queuing and flushing each acknowledgement.
+        max_latency: The highest time in seconds between queuing and flushing an acknowledgement.
+    """
+
+    queued: int = 0
+    sent: int = 0
+    failed: int = 0
+    flushes: int = 0
+    pending: int = 0
+    max_pending: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """The mean time in seconds between queuing and flushing an acknowledgement."""
+        return self.total_latency / self.sent if self.sent else 0.0
+
+    @property
+    def batch_size(self) -> float:
+        """The mean number of acknowledgements per flush."""
+        return self.sent / self.flushes if self.flushes else 0.0
+
+
+class AckBuffer:
+    """Queue acknowledgements and flush them in batches.
+
+    Queued acknowledgements are lost when the connection fails before they
+    are flushed, in which case messages are redelivered once their ack
+    deadline expires, just like acknowledgements published directly.
+
+    Args:
+        client: The NATS client used to publish acknowledgements.
+        max_pending: The number of pending acknowledgements which triggers a flush.
+        flush_interval: The maximum time in seconds an acknowledgement stays queued before a flush.
+        flush_timeout: The time in seconds to wait for the server to confirm a flush.
+    """
+
+    def __init__(
+        self,
+        client: NatsClient,
+        max_pending: int = 100,
+        flush_interval: float = 0.01,
+        flush_timeout: float = 5.0,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("Max pending acknowledgements must be at least 1")
+        self.client = client
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.flush_timeout = flush_timeout
+        self.stats = AckStats()
+        self._pending: list[tuple[str, bytes, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    def ack(self, msg: Msg) -> None:
+        """Queue an acknowledgement."""
+        self._queue(msg, ACK)
+
+    def nak(self, msg: Msg, delay: float | None = None) -> None:
+        """Queue a negative acknowledgement."""
+        self._queue(msg, nak_payload(delay))
+
+    def term(self, msg: Msg) -> None:
+        """Queue a termination."""
+        self._queue(msg, TERM)
+
+    async def close(self) -> None:
+        """Flush pending acknowledgements and wait for all flushes."""
+        self._flush()
+        # Finished flushes may still be in the set until their callback runs,
+        # and waiting for tasks which are already done does not yield
+        while True:
+            pending = [task for task in self._flushes if not task.done()]
+            if not pending:
+                return
+            await asyncio.wait(pending)
+
+    def _queue(self, msg: Msg, payload: bytes) -> None:
+        if not msg.reply:
+            raise ValueError("Message is not a JetStream message")
+        pending = self._pending
+        pending.append((msg.reply, payload, time.perf_counter()))
+        stats = self.stats
+        stats.queued += 1
+        stats.pending += 1
+        if stats.pending > stats.max_pending:
+            stats.max_pending = stats.pending
+        if len(pending) >= self.max_pending:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._flush
+            )
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._send(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send(self, batch: list[tuple[str, bytes, float]]) -> None:
+        stats = self.stats
+        try:
+            publish = self.client.publish
+            for reply, payload, _ in batch:
+                await publish(reply, payload)
+            await self.client.flush(self.flush_timeout)
+        except Exception:
+            logger.exception("Failed to flush %d acknowledgements", len(batch))
+            stats.failed += len(batch)
+            return
+        finally:
+            stats.pending -= len(batch)
+        now = time.perf_counter()
+        stats.flushes += 1
+        stats.sent += len(batch)
+        for _, _, queued_at in batch:
+            latency = now - queued_at
+            stats.total_latency += latency
+            if latency > stats.max_latency:
+                stats.max_latency = latency
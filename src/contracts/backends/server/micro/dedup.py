@@ -0,0 +1,212 @@
+"""The dedup module discards events which were already handled.
+
+Events are identified by their `Nats-Msg-Id` header, which is set when
+events are published. The ids of handled events are remembered in two
+Bloom filters: new ids are added to the current filter, and lookups check
+both filters. The current filter replaces the previous one once a window
+elapsed, or once it holds as many ids as it was sized for, so that memory
+and the false positive rate stay bounded. An id is remembered for at
+least one window, unless more ids than the capacity are handled within a
+window.
+
+A false positive discards an event which was never handled, so the
+filters are sized for a low error rate, which is reported along with the
+memory used by the filters.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+
+# The minimum number of bits of a filter (8 KiB)
+_MIN_SIZE = 1 << 16
+
+
+class BloomFilter:
+    """A Bloom filter of strings.
+
+    Items are given by their positions in the filter, computed once using
+    `positions`, so that an item can be looked up in several filters of
+    the same size without hashing it again.
+
+    Args:
+        capacity: The number of items the filter is sized for.
+        error_rate: The false positive rate once the filter holds `capacity` items.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Positions are derived from a single 64-bit hash, so two items
+        # share all their positions with a probability close to 1 / size^2,
+        # which exceeds the error rate of small filters
+        self.size = max(
+            math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2),
+            _MIN_SIZE,
+        )
+        self.hashes = max(1, round(-math.log2(error_rate)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def memory(self) -> int:
+        """The size of the filter in bytes."""
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """The estimated false positive rate for the items in the filter."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def positions(self, item: str) -> list[int]:
+        """Get the positions of an item."""
+        # Positions are derived from two hashes (Kirsch-Mitzenmacher). The
+        # hash of strings is randomized per process, which is fine for
+        # filters kept in memory.
+        value = hash(item) & 0xFFFFFFFFFFFFFFFF
+        first = value & 0xFFFFFFFF
+        second = value >> 32 | 1
+        size = self.size
+        return [
+            position % size
+            for position in range(first, first + self.hashes * second, second)
+        ]
+
+    def add(self, positions: list[int]) -> None:
+        """Add an item."""
+        bits = self._bits
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def contains(self, positions: list[int]) -> bool:
+        """Check whether an item may have been added."""
+        bits = self._bits
+        for position in positions:
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def clear(self) -> None:
+        """Remove all items."""
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+
+@dataclass
+class DedupStats:
+    """Statistics of a deduplicator.
+
+    Args:
+        checked: The number of events checked.
+        duplicates: The number of events discarded as duplicates.
+        remembered: The number of event ids added to the filters.
+        rotations: The number of times the previous filter was discarded.
+        memory: The size of the filters in bytes.
+        false_positive_rate: The estimated probability that an event which was never handled is discarded.
+    """
+
+    checked: int = 0
+    duplicates: int = 0
+    remembered: int = 0
+    rotations: int = 0
+    memory: int = 0
+    false_positive_rate: float = 0.0
+
+    @property
+    def duplicate_rate(self) -> float:
+        """The ratio of checked events which were discarded."""
+        return self.duplicates / self.checked if self.checked else 0.0
+
+
+class Deduplicator:
+    """Remember the ids of handled events within a time window.
+
+    Ids of events being handled are tracked exactly, so that duplicates
+    delivered concurrently are detected as well. Ids are only remembered
+    once their event is handled successfully, so that events which failed
+    are handled again when redelivered.
+
+    Args:
+        window: The time in seconds ids are remembered.
+        capacity: The number of ids each filter is sized for.
+        error_rate: The false positive rate of a full filter.
+    """
+
+    def __init__(
+        self,
+        window: float = 300.0,
+        capacity: int = 100_000,
+        error_rate: float = 1e-6,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("Window must be positive")
+        self.window = window
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._rotated_at = time.monotonic()
+        # Positions of ids being handled, computed when they are claimed
+        self._handling: dict[str, list[int]] = {}
+        self._stats = DedupStats(memory=self._current.memory + self._previous.memory)
+
+    @property
+    def stats(self) -> DedupStats:
+        """Statistics of the deduplicator."""
+        # An id is looked up in both filters
+        self._stats.false_positive_rate = 1 - (
+            (1 - self._current.false_positive_rate)
+            * (1 - self._previous.false_positive_rate)
+        )
+        return self._stats
+
+    def claim(self, message_id: str) -> bool:
+        """Start handling an event.
+
+        Returns:
+            `False` when the event was already handled or is being handled, in which case it must not be handled. Use `handling` to tell both cases apart.
+        """
+        if time.monotonic() - self._rotated_at >= self.window:
+            self._expire()
+        stats = self._stats
+        stats.checked += 1
+        if message_id in self._handling:
+            stats.duplicates += 1
+            return False
+        positions = self._current.positions(message_id)
+        if self._current.contains(positions) or self._previous.contains(positions):
+            stats.duplicates += 1
+            return False
+        self._handling[message_id] = positions
+        return True
+
+    def handling(self, message_id: str) -> bool:
+        """Check whether an event is being handled."""
+        return message_id in self._handling
+
+    def release(self, message_id: str, handled: bool) -> None:
+        """Stop handling an event, remembering its id when it was handled."""
+        positions = self._handling.pop(message_id, None)
+        if positions is None or not handled:
+            return
+        if self._current.count >= self._current.capacity:
+            self._rotate()
+        self._current.add(positions)
+        self._stats.remembered += 1
+
+    def _expire(self) -> None:
+        if time.monotonic() - self._rotated_at >= 2 * self.window:
+            # Ids of both filters are older than the window
+            self._current.clear()
+        self._rotate()
+
+    def _rotate(self) -> None:
+        self._previous.clear()
+        self._current, self._previous = self._previous, self._current
+        self._rotated_at = time.monotonic()
+        self._stats.rotations += 1
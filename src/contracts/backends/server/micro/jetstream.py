@@ -0,0 +1,658 @@
+"""The jetstream module runs consumers using JetStream pull consumers.
+
+Each consumer is bound to a durable pull consumer filtering the subject of
+its event address. Messages are fetched in batches, and handled
+concurrently up to a limit: a batch never requests more messages than
+there are free handler slots, so that fetched messages do not wait in
+memory while their ack deadline runs.
+
+Consumers overriding `handle_batch` receive events in batches, which are
+handled once they are full or once a delay elapsed since their first
+event was fetched. Payloads of a batch are decoded before the handler is
+called, and events which cannot be decoded are terminated.
+
+When a partition key is configured, messages sharing the same key are
+handled one at a time, in the order they were fetched, while messages of
+distinct keys are handled concurrently. When a message is not
+acknowledged, its key is blocked until the message is redelivered and
+settled: messages of the same key which are already fetched, or fetched
+while the key is blocked, are not acknowledged either, and are only
+handled once redelivered in stream order, so that they are never handled
+before the failed message. A key stays blocked while its failed message
+is not redelivered, for example once it reached the maximum number of
+deliveries of the consumer, until the consumer is restarted.
+
+Handlers settle messages using `ack`, `nack` or `term`, individually
+within a batch. Messages which are not settled once the handler returns
+are acknowledged, and messages whose handler raises an exception are not
+acknowledged, so that they are redelivered. Acknowledgements are queued
+and flushed in batches (see `AckBuffer`), and pending acknowledgements
+are flushed when the consumer stops.
+
+When deduplication is enabled, messages whose id was already handled
+successfully are acknowledged without calling the handler (see
+`Deduplicator`). Messages whose id is being handled are not acknowledged,
+and redelivered after a delay, since the message being handled may still
+fail.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Hashable, Literal
+
+from nats.aio.client import Client as NatsClient
+from nats.aio.msg import Msg
+from nats.errors import TimeoutError as NatsTimeoutError
+from nats.js.client import JetStreamContext
+
+from contracts.abc.consumer import BaseConsumer
+from contracts.abc.event import BaseEvent
+from contracts.abc.message import Message
+from contracts.backends.compression.defaults import decompress
+from contracts.core.compression import CONTENT_ENCODING
+from contracts.core.event_spec import MESSAGE_ID
+from contracts.core.negotiation import CONTENT_TYPE
+from contracts.core.types import Buffer, ParamsT, T, Validation
+from contracts.registry import ConsumerEntry
+
+from .acks import AckBuffer, AckStats
+from .dedup import DedupStats, Deduplicator
+
+logger = logging.getLogger(__name__)
+
+_INVALID_DURABLE_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+# Fetch requests expire slightly before their timeout, so short timeouts
+# used to fill up a batch are rounded up
+_MIN_FETCH_TIMEOUT = 0.001
+
+
+@dataclass(frozen=True)
+class ConsumerOptions:
+    """Options of the consumers runtime.
+
+    Args:
+        batch_size: The maximum number of messages fetched at once.
+        max_concurrency: The maximum number of messages handled concurrently by each consumer.
+        fetch_timeout: The time in seconds to wait for messages on each fetch.
+        durable_prefix: The prefix of durable consumer names. The application name is used by default.
+        handler_batch_size: The maximum number of events given to `handle_batch` at once.
+        handler_batch_delay: The maximum time in seconds to wait for a batch to fill up before it is handled.
+        partition_key: A function returning the key of a message. Messages with the same key are handled in order. See `params_key` and `header_key`.
+        ack_batch_size: The number of pending acknowledgements which triggers a flush. Use 0 to publish each acknowledgement directly.
+        ack_flush_interval: The maximum time in seconds an acknowledgement is pending before a flush.
+        dedup_window: The time in seconds ids of handled messages are remembered to discard duplicates. Use 0 to disable deduplication.
+        dedup_capacity: The number of message ids remembered within a window. Older ids are forgotten early when more messages are handled.
+        dedup_error_rate: The maximum probability that a message which was never handled is discarded as a duplicate.
+        dedup_retry_delay: The delay in seconds before a message is redelivered when a message with the same id is being handled.
+    """
+
+    batch_size: int = 100
+    max_concurrency: int = 100
+    fetch_timeout: float = 5.0
+    durable_prefix: str | None = None
+    handler_batch_size: int = 100
+    handler_batch_delay: float = 0.05
+    partition_key: Callable[[Message[Any]], Hashable] | None = None
+    ack_batch_size: int = 100
+    ack_flush_interval: float = 0.01
+    dedup_window: float = 0.0
+    dedup_capacity: int = 100_000
+    dedup_error_rate: float = 1e-6
+    dedup_retry_delay: float = 1.0
+
+    def __post_init__(self) -> None:
+        if self.batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        if self.max_concurrency < 1:
+            raise ValueError("Max concurrency must be at least 1")
+        if self.fetch_timeout <= 0:
+            raise ValueError("Fetch timeout must be positive")
+        if self.handler_batch_size < 1:
+            raise ValueError("Handler batch size must be at least 1")
+        if self.handler_batch_delay < 0:
+            raise ValueError("Handler batch delay must be positive")
+        if self.ack_batch_size < 0:
+            raise ValueError("Ack batch size must be positive")
+        if self.ack_flush_interval < 0:
+            raise ValueError("Ack flush interval must be positive")
+        if self.dedup_window < 0:
+            raise ValueError("Dedup window must be positive")
+        if self.dedup_capacity < 1:
+            raise ValueError("Dedup capacity must be at least 1")
+        if not 0 < self.dedup_error_rate < 1:
+            raise ValueError("Dedup error rate must be between 0 and 1")
+        if self.dedup_retry_delay < 0:
+            raise ValueError("Dedup retry delay must be positive")
+
+
+@dataclass
+class _BlockedKey:
+    """Messages of a partition key waiting to be redelivered in order.
+
+    Args:
+        sequences: The stream sequences of the messages, in the order they must be handled. The first one is the message which was not acknowledged.
+        delay: The delay of the negative acknowledgement of the first message, used for messages which are not acknowledged while the key is blocked.
+    """
+
+    sequences: dict[int, None]
+    delay: float | None
+
+
+def durable_name(prefix: str, entry: ConsumerEntry) -> str:
+    """Get the name of the durable consumer of a consumer entry.
+
+    The name of the consumer class is used rather than the event name, so
+    that several consumers of the same event each receive all events.
+    Durable names cannot contain dots, wildcards or whitespaces, so any
+    character other than letters, digits, `-` and `_` is replaced by `_`.
+    """
+    return _INVALID_DURABLE_CHARS.sub("_", f"{prefix}_{entry.cls.__name__}")
+
+
+def params_key(*names: str) -> Callable[[Message[Any]], Hashable]:
+    """Partition messages by address parameters.
+
+    Args:
+        names: The names of the parameters. All parameters are used when no name is given.
+    """
+
+    def key(message: Message[Any]) -> Hashable:
+        params = message.params()
+        if not names:
+            return params
+        if len(names) == 1:
+            return getattr(params, names[0])
+        return tuple(getattr(params, name) for name in names)
+
+    return key
+
+
+def header_key(name: str) -> Callable[[Message[Any]], Hashable]:
+    """Partition messages by the value of a header.
+
+    Messages without the header share the same partition.
+    """
+
+    def key(message: Message[Any]) -> Hashable:
+        return message.headers().get(name)
+
+    return key
+
+
+class JetStreamMessage(Message[BaseEvent[Any, ParamsT, T]]):
+    """A message received from a JetStream consumer."""
+
+    def __init__(
+        self,
+        msg: Msg,
+        entry: ConsumerEntry,
+        validation: Validation = Validation.FULL,
+        acks: AckBuffer | None = None,
+    ) -> None:
+        self._msg = msg
+        self._acks = acks
+        self._validation = validation
+        self._data: Any = ...
+        self._params: Any = ...
+        self._address = entry.spec.address
+        self._entry = entry
+        self._status: Literal["pending", "acked", "nacked", "termed"] = "pending"
+        self._delay: float | None = None
+
+    def params(self) -> ParamsT:
+        # Parameters are extracted on first access only
+        if self._params is ...:
+            self._params = self._address.get_params(self._msg.subject)
+        return self._params
+
+    def payload(self) -> T:
+        # Payload is decoded on first access only
+        if self._data is ...:
+            headers = self.headers()
+            data = decompress(self._msg.data, headers.get(CONTENT_ENCODING))
+            type_adapter = self._entry.get_payload_adapter(
+                headers.get(CONTENT_TYPE), self._validation
+            )
+            self._data = type_adapter.decode(data)
+        return self._data
+
+    def raw_payload(self) -> Buffer:
+        return self._msg.data
+
+    def headers(self) -> dict[str, str]:
+        return self._msg.headers or {}
+
+    @property
+    def settled(self) -> bool:
+        """Whether the message has been acknowledged, not acknowledged or terminated."""
+        return self._status != "pending"
+
+    async def ack(self) -> None:
+        self._settle("acked")
+        if self._acks is None:
+            await self._msg.ack()
+        else:
+            self._acks.ack(self._msg)
+
+    async def nack(self, delay: float | None = None) -> None:
+        self._settle("nacked")
+        self._delay = delay
+        if self._acks is None:
+            await self._msg.nak(delay)
+        else:
+            self._acks.nak(self._msg, delay)
+
+    async def term(self) -> None:
+        self._settle("termed")
+        if self._acks is None:
+            await self._msg.term()
+        else:
+            self._acks.term(self._msg)
+
+    def _settle(self, status: Literal["acked", "nacked", "termed"]) -> None:
+        if self._status != "pending":
+            raise ValueError("Event has already been acknowledged")
+        self._status = status
+
+
+class PullConsumer:
+    """Run a consumer using a durable JetStream pull consumer.
+
+    Args:
+        client: The NATS client.
+        consumer: The consumer handling messages.
+        entry: The compiled consumer.
+        durable: The name of the durable pull consumer.
+        options: The options of the runtime.
+        validation: The validation level used to decode payloads.
+    """
+
+    def __init__(
+        self,
+        client: NatsClient,
+        consumer: BaseConsumer[Any, Any, Any],
+        entry: ConsumerEntry,
+        durable: str,
+        options: ConsumerOptions = ConsumerOptions(),
+        validation: Validation = Validation.FULL,
+    ) -> None:
+        self.client = client
+        self.js = client.jetstream()
+        self.consumer = consumer
+        self.entry = entry
+        self.durable = durable
+        self.options = options
+        self.validation = validation
+        self._subscription: JetStreamContext.PullSubscription | None = None
+        self._fetcher: asyncio.Task[None] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._in_flight = 0
+        self._slot_freed = asyncio.Event()
+        self._partitions: dict[Hashable, deque[JetStreamMessage[Any, Any]]] = {}
+        self._blocked: dict[Hashable, _BlockedKey] = {}
+        self._acks = (
+            AckBuffer(client, options.ack_batch_size, options.ack_flush_interval)
+            if options.ack_batch_size
+            else None
+        )
+        self._dedup = (
+            Deduplicator(
+                options.dedup_window, options.dedup_capacity, options.dedup_error_rate
+            )
+            if options.dedup_window
+            else None
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """The number of messages fetched and not handled yet."""
+        return self._in_flight
+
+    @property
+    def ack_stats(self) -> AckStats | None:
+        """Statistics of acknowledgements, when they are flushed in batches."""
+        return self._acks.stats if self._acks is not None else None
+
+    @property
+    def dedup_stats(self) -> DedupStats | None:
+        """Statistics of deduplication, when it is enabled."""
+        return self._dedup.stats if self._dedup is not None else None
+
+    @property
+    def batched(self) -> bool:
+        """Whether the consumer handles events in batches."""
+        return is_batch_consumer(self.consumer)
+
+    async def start(self) -> None:
+        """Bind the durable consumer and start fetching messages.
+
+        The durable consumer is created when it does not exist yet.
+        """
+        if self._fetcher is not None:
+            raise RuntimeError("Consumer is already started")
+        if self.batched and self.options.partition_key is not None:
+            raise ValueError("Partition keys are not supported by batch consumers")
+        self._subscription = await self.js.pull_subscribe(
+            self.entry.spec.address.get_subject(),
+            durable=self.durable,
+        )
+        fetch_loop = self._fetch_batches_loop if self.batched else self._fetch_loop
+        self._fetcher = asyncio.create_task(fetch_loop())
+
+    async def stop(self) -> None:
+        """Stop fetching messages and wait for messages being handled.
+
+        The durable consumer is kept, so that messages published while the
+        consumer is stopped are delivered once it is started again.
+        """
+        if self._fetcher is not None:
+            self._fetcher.cancel()
+            try:
+                await self._fetcher
+            except asyncio.CancelledError:
+                pass
+            self._fetcher = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._acks is not None:
+            await self._acks.close()
+        if self._subscription is not None:
+            await self._subscription.unsubscribe()
+            self._subscription = None
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _release(self, count: int) -> None:
+        """Release the slots of messages which are not in flight anymore."""
+        self._in_flight -= count
+        self._slot_freed.set()
+
+    async def _wait_for_slot(self) -> None:
+        self._slot_freed.clear()
+        await self._slot_freed.wait()
+
+    async def _fetch_loop(self) -> None:
+        subscription = self._subscription
+        assert subscription is not None
+        batch_size = self.options.batch_size
+        max_concurrency = self.options.max_concurrency
+        timeout = self.options.fetch_timeout
+        partition_key = self.options.partition_key
+        while True:
+            free = max_concurrency - self._in_flight
+            if free <= 0:
+                await self._wait_for_slot()
+                continue
+            try:
+                msgs = await subscription.fetch(min(batch_size, free), timeout)
+            except NatsTimeoutError:
+                continue
+            self._in_flight += len(msgs)
+            for msg in msgs:
+                message: JetStreamMessage[Any, Any] = JetStreamMessage(
+                    msg, self.entry, self.validation, self._acks
+                )
+                if partition_key is None:
+                    self._spawn(self._handle(message))
+                else:
+                    await self._dispatch(message, partition_key)
+
+    async def _fetch_batches_loop(self) -> None:
+        """Accumulate messages into batches handled by `handle_batch`.
+
+        A batch is handled once it holds `handler_batch_size` messages, or
+        `handler_batch_delay` seconds after its first message was fetched.
+        Messages of a batch count as in flight while the batch fills up.
+        """
+        subscription = self._subscription
+        assert subscription is not None
+        loop = asyncio.get_running_loop()
+        batch_size = self.options.batch_size
+        max_concurrency = self.options.max_concurrency
+        fetch_timeout = self.options.fetch_timeout
+        handler_batch_size = self.options.handler_batch_size
+        handler_batch_delay = self.options.handler_batch_delay
+        pending: list[Msg] = []
+        deadline = 0.0
+        try:
+            while True:
+                free = max_concurrency - self._in_flight
+                if pending:
+                    timeout = deadline - loop.time()
+                    if free <= 0 or timeout <= 0 or len(pending) >= handler_batch_size:
+                        self._spawn(self._handle_batch(pending))
+                        pending = []
+                        continue
+                elif free <= 0:
+                    await self._wait_for_slot()
+                    continue
+                else:
+                    timeout = fetch_timeout
+                try:
+                    msgs = await subscription.fetch(
+                        min(batch_size, free, handler_batch_size - len(pending)),
+                        max(timeout, _MIN_FETCH_TIMEOUT),
+                    )
+                except NatsTimeoutError:
+                    continue
+                if not pending:
+                    deadline = loop.time() + handler_batch_delay
+                self._in_flight += len(msgs)
+                pending.extend(msgs)
+        finally:
+            # Messages already fetched are handled before stopping
+            if pending:
+                self._spawn(self._handle_batch(pending))
+
+    async def _dispatch(
+        self,
+        message: JetStreamMessage[Any, Any],
+        partition_key: Callable[[Message[Any]], Hashable],
+    ) -> None:
+        """Queue a message behind messages of the same key."""
+        try:
+            key = partition_key(message)
+        except Exception:
+            logger.exception("Failed to get partition key of event %s", self.entry.name)
+            try:
+                await message.term()
+            finally:
+                self._release(1)
+            return
+        blocked = self._blocked.get(key)
+        if blocked is not None:
+            sequence = _sequence(message)
+            if sequence != next(iter(blocked.sequences)):
+                # Only the message blocking the key can be handled
+                blocked.sequences[sequence] = None
+                await self._nack_message(message, blocked.delay)
+                return
+        queue = self._partitions.get(key)
+        if queue is not None:
+            queue.append(message)
+            return
+        queue = self._partitions[key] = deque([message])
+        self._spawn(self._run_partition(key, queue))
+
+    async def _run_partition(
+        self, key: Hashable, queue: deque[JetStreamMessage[Any, Any]]
+    ) -> None:
+        """Handle messages of a partition until its queue is empty."""
+        try:
+            while queue:
+                # The message stays in the queue while it is handled, so that
+                # messages with the same key are queued behind it
+                message = queue[0]
+                await self._handle(message, release=False)
+                queue.popleft()
+                self._release(1)
+                if message._status == "nacked":
+                    await self._block(key, message, queue)
+                elif key in self._blocked:
+                    self._unblock(key, message)
+        finally:
+            del self._partitions[key]
+
+    async def _block(
+        self,
+        key: Hashable,
+        message: JetStreamMessage[Any, Any],
+        queue: deque[JetStreamMessage[Any, Any]],
+    ) -> None:
+        """Block a key until a message which was not acknowledged is settled.
+
+        Messages queued behind the message are not acknowledged, and must
+        be handled in order once redelivered.
+        """
+        blocked = self._blocked.get(key)
+        if blocked is None:
+            blocked = self._blocked[key] = _BlockedKey(
+                {_sequence(message): None}, message._delay
+            )
+        else:
+            blocked.delay = message._delay
+        while queue:
+            message = queue.popleft()
+            blocked.sequences[_sequence(message)] = None
+            await self._nack_message(message, blocked.delay)
+
+    def _unblock(self, key: Hashable, message: JetStreamMessage[Any, Any]) -> None:
+        """Let the next message of a blocked key be handled once settled."""
+        blocked = self._blocked[key]
+        sequence = _sequence(message)
+        if sequence != next(iter(blocked.sequences)):
+            return
+        del blocked.sequences[sequence]
+        if not blocked.sequences:
+            del self._blocked[key]
+
+    async def _nack_message(
+        self, message: JetStreamMessage[Any, Any], delay: float | None
+    ) -> None:
+        try:
+            await message.nack(delay)
+        except Exception:
+            logger.exception("Failed to acknowledge event %s", self.entry.name)
+        finally:
+            self._release(1)
+
+    def _claim(self, message: JetStreamMessage[Any, Any]) -> bool:
+        """Check that a message is not a duplicate before handling it.
+
+        Messages without id are always handled.
+        """
+        if self._dedup is None:
+            return True
+        message_id = message.headers().get(MESSAGE_ID)
+        return message_id is None or self._dedup.claim(message_id)
+
+    async def _discard(self, message: JetStreamMessage[Any, Any]) -> None:
+        """Settle a duplicate without handling it.
+
+        Duplicates of a message being handled are redelivered later, so
+        that they are handled if the message fails. Duplicates of handled
+        messages are acknowledged.
+        """
+        assert self._dedup is not None
+        if self._dedup.handling(message.headers()[MESSAGE_ID]):
+            await message.nack(self.options.dedup_retry_delay)
+        else:
+            await message.ack()
+
+    def _unclaim(self, message: JetStreamMessage[Any, Any]) -> None:
+        """Remember the id of a claimed message once it is acknowledged."""
+        if self._dedup is None:
+            return
+        message_id = message.headers().get(MESSAGE_ID)
+        if message_id is not None:
+            self._dedup.release(message_id, message._status == "acked")
+
+    async def _handle(
+        self, message: JetStreamMessage[Any, Any], release: bool = True
+    ) -> None:
+        claimed = False
+        try:
+            claimed = self._claim(message)
+            if not claimed:
+                await self._discard(message)
+                return
+            try:
+                await self.consumer.handle(message)
+            except Exception:
+                logger.exception("Failed to handle event %s", self.entry.name)
+                if not message.settled:
+                    await message.nack()
+                return
+            if not message.settled:
+                await message.ack()
+        except Exception:
+            logger.exception("Failed to acknowledge event %s", self.entry.name)
+        finally:
+            if claimed:
+                self._unclaim(message)
+            if release:
+                self._release(1)
+
+    async def _handle_batch(self, msgs: list[Msg]) -> None:
+        """Decode payloads of a batch, then handle valid events at once.
+
+        Events whose payload cannot be decoded are terminated, since they
+        would never be decoded on redelivery. Duplicates are left out of
+        the batch.
+        """
+        events: list[JetStreamMessage[Any, Any]] = []
+        claimed: list[JetStreamMessage[Any, Any]] = []
+        try:
+            for msg in msgs:
+                message: JetStreamMessage[Any, Any] = JetStreamMessage(
+                    msg, self.entry, self.validation, self._acks
+                )
+                if not self._claim(message):
+                    await self._discard(message)
+                    continue
+                claimed.append(message)
+                try:
+                    message.payload()
+                except Exception:
+                    logger.exception("Failed to decode event %s", self.entry.name)
+                    await message.term()
+                    continue
+                events.append(message)
+            if not events:
+                return
+            try:
+                await self.consumer.handle_batch(events)
+            except Exception:
+                logger.exception("Failed to handle events %s", self.entry.name)
+                for message in events:
+                    if not message.settled:
+                        await message.nack()
+                return
+            for message in events:
+                if not message.settled:
+                    await message.ack()
+        except Exception:
+            logger.exception("Failed to acknowledge events %s", self.entry.name)
+        finally:
+            for message in claimed:
+                self._unclaim(message)
+            self._release(len(msgs))
+
+
+def _sequence(message: JetStreamMessage[Any, Any]) -> int:
+    """Get the stream sequence of a message."""
+    return message._msg.metadata.sequence.stream
+
+
+def is_batch_consumer(consumer: BaseConsumer[Any, Any, Any]) -> bool:
+    """Check whether a consumer overrides `handle_batch`."""
+    return type(consumer).handle_batch is not BaseConsumer.handle_batch
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import datetime
 from contextlib import AsyncExitStack
-from typing import Any, Callable, Iterable
+from typing import Any, Awaitable, Callable, Iterable
 
 from nats.aio.client import Client as NatsClient
 from nats_contrib import micro
@@ -15,25 +15,49 @@ from contracts.abc.operation import BaseOperation
 from contracts.abc.request import OT, Request
 from contracts.application import Application
 from contracts.asyncapi.renderer import create_docs_server
-from contracts.core.types import ParamsT, T
+from contracts.backends.compression.defaults import decompress
+from contracts.core.buffers import BufferPool
+from contracts.core.compression import ACCEPT_ENCODING, CONTENT_ENCODING, Compression
+from contracts.core.negotiation import ACCEPT, CONTENT_TYPE, negotiate
+from contracts.core.router import Router
+from contracts.core.types import (
+    Buffer,
+    ParamsT,
+    T,
+    TypeAdapter,
+    Validation,
+    encode_async,
+)
+from contracts.registry import ConsumerEntry, OperationEntry, Registry
 from contracts.instance import Instance
 from contracts.server import Server, ServerAdapter
 
+from .jetstream import ConsumerOptions, PullConsumer, durable_name
 
-async def _add_operation(
-    service: Service,
+
+def _create_operation_handler(
     operation: BaseOperation[Any, Any, Any, Any],
-    queue_group: str | None = None,
-) -> Endpoint:
-    """Add an operation to a service."""
+    entry: OperationEntry,
+    validation: Validation = Validation.FULL,
+    buffers: BufferPool | None = None,
+) -> Callable[[MicroRequest, Any], Awaitable[None]]:
+    """Create a handler for an operation.
+
+    The handler accepts the parameters extracted from the request subject,
+    or `...` when parameters must be extracted by the message. Replies are
+    encoded into buffers of the pool when given.
+    """
     errors_to_catch = {e.origin: e for e in operation.spec.catch}
 
-    async def handler(request: MicroRequest) -> None:
+    async def handler(request: MicroRequest, params: Any = ...) -> None:
         try:
             await operation.handle(
                 MicroMessage(
                     request,
-                    operation,
+                    entry,
+                    params,
+                    validation,
+                    buffers,
                 )
             )
         except BaseException as e:
@@ -43,23 +67,147 @@ async def _add_operation(
                     code = error.code
                     description = error.description
                     data = error.fmt(e) if error.fmt else None
+                    headers: dict[str, str] = {}
                     if data:
-                        payload = operation.spec.reply_payload.type_adapter.encode(data)
+                        type_adapter = _negotiate_reply(entry, request, headers)
+                        payload = type_adapter.encode(data)
+                        payload = _compress_reply(
+                            entry.spec.reply_payload.compression,
+                            request,
+                            payload,
+                            headers,
+                        )
                     else:
                         payload = b""
-                    await request.respond_error(code, description, data=payload)
+                    await request.respond_error(
+                        code, description, data=payload, headers=headers or None
+                    )
                     return
             raise
 
+    return handler
+
+
+def _negotiate_reply(
+    entry: OperationEntry,
+    request: MicroRequest,
+    headers: dict[str, str],
+) -> TypeAdapter[Any]:
+    """Get the type adapter used to encode a reply.
+
+    The content type accepted by the requester is used when the schema
+    supports several content types, and the `Content-Type` header is set
+    accordingly.
+    """
+    schema = entry.spec.reply_payload
+    if not schema.alternatives:
+        return entry.reply_adapter
+    content_type = (
+        negotiate(schema.content_types, request.headers().get(ACCEPT))
+        or entry.reply_content_type
+    )
+    headers[CONTENT_TYPE] = content_type
+    return entry.get_reply_adapter(content_type)
+
+
+def _compress_reply(
+    compression: Compression | None,
+    request: MicroRequest,
+    payload: Buffer,
+    headers: dict[str, str],
+) -> Buffer:
+    """Compress a reply payload using an encoding accepted by the requester.
+
+    The `Content-Encoding` header is set when payload is compressed.
+    """
+    if compression is None:
+        return payload
+    encoding = compression.negotiate(request.headers().get(ACCEPT_ENCODING))
+    payload, encoding = compression.compress(payload, encoding)
+    if encoding:
+        headers[CONTENT_ENCODING] = encoding
+    return payload
+
+
+async def _add_operation(
+    service: Service,
+    operation: BaseOperation[Any, Any, Any, Any],
+    entry: OperationEntry,
+    queue_group: str | None = None,
+    validation: Validation = Validation.FULL,
+    buffers: BufferPool | None = None,
+) -> Endpoint:
+    """Add an operation to a service."""
     return await service.add_endpoint(
-        operation.spec.name,
-        handler=handler,
-        subject=operation.spec.address.get_subject(),
-        metadata=operation.spec.metadata,
+        entry.spec.name,
+        handler=_create_operation_handler(operation, entry, validation, buffers),
+        subject=entry.spec.address.get_subject(),
+        metadata=entry.spec.metadata,
         queue_group=queue_group,
     )
 
 
+async def _add_router(
+    service: Service,
+    operations: Iterable[BaseOperation[Any, Any, Any, Any]],
+    registry: Registry,
+    queue_group: str | None = None,
+    depth: int = 1,
+    validation: Validation = Validation.FULL,
+    buffers: BufferPool | None = None,
+) -> list[Endpoint]:
+    """Add operations to a service using a router.
+
+    A single endpoint is added for each subject covering the operations
+    addresses, and requests are dispatched to operations according to
+    their subject.
+    """
+    router: Router[Callable[[MicroRequest, Any], Awaitable[None]]] = Router()
+    for operation in operations:
+        entry = _get_operation_entry(registry, operation)
+        router.add(
+            entry.spec.address,
+            _create_operation_handler(operation, entry, validation, buffers),
+        )
+
+    async def handler(request: MicroRequest) -> None:
+        match = router.match(request.subject())
+        if match is None:
+            await request.respond_error(404, "No operation found for subject")
+            return
+        route, params = match
+        await route.target(request, params)
+
+    endpoints: list[Endpoint] = []
+    for idx, subject in enumerate(router.subscriptions(depth)):
+        endpoint = await service.add_endpoint(
+            f"router_{idx}",
+            handler=handler,
+            subject=subject,
+            queue_group=queue_group,
+        )
+        endpoints.append(endpoint)
+    return endpoints
+
+
+def _get_operation_entry(
+    registry: Registry, operation: BaseOperation[Any, Any, Any, Any]
+) -> OperationEntry:
+    entry = registry.lookup(operation)
+    if not isinstance(entry, OperationEntry):
+        raise ValueError(f"Endpoint {operation} is not supported by the service")
+    return entry
+
+
+def _get_consumer_entry(
+    registry: Registry, consumer: BaseConsumer[Any, Any, Any]
+) -> ConsumerEntry:
+    entry = registry.lookup(consumer)
+    if not isinstance(entry, ConsumerEntry):
+        raise ValueError(f"Consumer {consumer} is not supported by the service")
+    return entry
+
+
 def create_micro_server(
     ctx: micro.Context,
     queue_group: str | None = None,
@@ -69,8 +217,33 @@ def create_micro_server(
     http_port: int | None = None,
     docs_path: str = "/docs",
     asyncapi_path: str = "/asyncapi.json",
+    use_router: bool = False,
+    router_depth: int = 1,
+    validation: Validation | str = Validation.FULL,
+    buffers: BufferPool | None = None,
+    consumer_options: ConsumerOptions | None = None,
 ) -> Server:
-    """Create a micro server."""
+    """Create a micro server.
+
+    When `use_router` is `True`, operations are not registered as individual
+    endpoints. Instead, a few endpoints subscribe to subjects covering all
+    operations (truncated after `router_depth` tokens), and requests are
+    dispatched to operations using a router.
+
+    When `validation` is `shallow` or `none`, request payloads are decoded
+    without validation. This must only be used for trusted traffic, when
+    all clients share the same contract.
+
+    When `buffers` is given, replies are encoded into buffers of the pool,
+    which are reused once replies are sent. Pooling only saves allocations
+    with type adapters encoding directly into buffers, such as the msgspec
+    adapter.
+
+    Consumers are run using durable JetStream pull consumers, which are
+    created when they do not exist yet. A stream must capture the subjects
+    of consumed events. `consumer_options` configures the size of fetched
+    batches and the number of events handled concurrently by each consumer.
+    """
     adapter = MicroAdapter(
         ctx.client,
         queue_group=queue_group,
@@ -80,6 +253,11 @@ def create_micro_server(
         http_port=http_port,
         docs_path=docs_path,
         asyncapi_path=asyncapi_path,
+        use_router=use_router,
+        router_depth=router_depth,
+        validation=validation,
+        buffers=buffers,
+        consumer_options=consumer_options,
     )
     return Server(adapter)
 
@@ -97,6 +275,11 @@ async def start_micro_server(
     http_port: int | None = None,
     docs_path: str = "/docs",
     asyncapi_path: str = "/asyncapi.json",
+    use_router: bool = False,
+    router_depth: int = 1,
+    validation: Validation | str = Validation.FULL,
+    buffers: BufferPool | None = None,
+    consumer_options: ConsumerOptions | None = None,
 ) -> Server:
     """Start a micro server."""
     server = create_micro_server(
@@ -108,6 +291,11 @@ async def start_micro_server(
         http_port=http_port,
         docs_path=docs_path,
         asyncapi_path=asyncapi_path,
+        use_router=use_router,
+        router_depth=router_depth,
+        validation=validation,
+        buffers=buffers,
+        consumer_options=consumer_options,
     )
     server.bind(app, *components)
     return await ctx.enter(server)
@@ -124,6 +312,12 @@ class MicroInstance(Instance):
         http_port: int | None = None,
         docs_path: str = "/docs",
         asyncapi_path: str = "/asyncapi.json",
+        use_router: bool = False,
+        router_depth: int = 1,
+        validation: Validation | str = Validation.FULL,
+        buffers: BufferPool | None = None,
+        client: NatsClient | None = None,
+        consumer_options: ConsumerOptions | None = None,
     ) -> None:
         self.queue_group = queue_group
         self.service = service
@@ -133,15 +327,55 @@ class MicroInstance(Instance):
         self.http_port = http_port
         self.docs_path = docs_path
         self.asyncapi_path = asyncapi_path
+        self.use_router = use_router
+        self.router_depth = router_depth
+        self.validation = Validation(validation)
+        self.buffers = buffers
+        self.client = client
+        self.consumer_options = consumer_options or ConsumerOptions()
+        self.pull_consumers: list[PullConsumer] = []
         self.stack = AsyncExitStack()
 
     async def start(self) -> None:
         await self.stack.__aenter__()
         await self.stack.enter_async_context(self.service)
-        for endpoint in self.operations:
-            await _add_operation(self.service, endpoint)
+        registry = self.app.compile()
+        if self.use_router:
+            await _add_router(
+                self.service,
+                self.operations,
+                registry,
+                depth=self.router_depth,
+                validation=self.validation,
+                buffers=self.buffers,
+            )
+        else:
+            for endpoint in self.operations:
+                entry = _get_operation_entry(registry, endpoint)
+                await _add_operation(
+                    self.service,
+                    endpoint,
+                    entry,
+                    validation=self.validation,
+                    buffers=self.buffers,
+                )
+        durable_prefix = self.consumer_options.durable_prefix or self.app.name
         for consumer in self.consumers:
-            raise NotImplementedError
+            if self.client is None:
+                raise RuntimeError("A NATS client is required to run consumers")
+            entry = _get_consumer_entry(registry, consumer)
+            runner = PullConsumer(
+                self.client,
+                consumer,
+                entry,
+                durable_name(durable_prefix, entry),
+                options=self.consumer_options,
+                validation=self.validation,
+            )
+            await runner.start()
+            # Pending acknowledgements are flushed when the consumer stops
+            self.stack.push_async_callback(runner.stop)
+            self.pull_consumers.append(runner)
         if self.http_port:
             server = create_docs_server(
                 self.app,
@@ -166,6 +400,11 @@ class MicroAdapter(ServerAdapter):
         http_port: int | None = None,
         docs_path: str = "/docs",
         asyncapi_path: str = "/asyncapi.json",
+        use_router: bool = False,
+        router_depth: int = 1,
+        validation: Validation | str = Validation.FULL,
+        buffers: BufferPool | None = None,
+        consumer_options: ConsumerOptions | None = None,
     ) -> None:
         self._nc = client
         self._client = BaseMicroClient(client, api_prefix=api_prefix)
@@ -176,6 +415,11 @@ class MicroAdapter(ServerAdapter):
         self.http_port = http_port
         self.docs_path = docs_path
         self.asyncapi_path = asyncapi_path
+        self.use_router = use_router
+        self.router_depth = router_depth
+        self.validation = Validation(validation)
+        self.buffers = buffers
+        self.consumer_options = consumer_options
 
     def create_instance(
         self,
@@ -205,6 +449,12 @@ class MicroAdapter(ServerAdapter):
             http_port=self.http_port,
             docs_path=self.docs_path,
             asyncapi_path=self.asyncapi_path,
+            use_router=self.use_router,
+            router_depth=self.router_depth,
+            validation=self.validation,
+            buffers=self.buffers,
+            client=self._nc,
+            consumer_options=self.consumer_options,
         )
 
 
@@ -214,36 +464,62 @@ class MicroMessage(Request[OT]):
     def __init__(
         self,
         request: MicroRequest,
-        operation: OT,
+        entry: OperationEntry,
+        params: Any = ...,
+        validation: Validation = Validation.FULL,
+        buffers: BufferPool | None = None,
     ) -> None:
-        data = operation.spec.payload.type_adapter.decode(request.data())
-        params = operation.spec.address.get_params(request.subject())
         self._request = request
-        self._data = data
+        self._validation = validation
+        self._buffers = buffers
+        self._data: Any = ...
         self._params = params
-        self._response_type_adapter = operation.spec.reply_payload.type_adapter
-        self._status_code = operation.spec.status_code
-        self._response_content_type = operation.spec.reply_payload.content_type
+        self._entry = entry
+        self._address = entry.spec.address
+        self._response_schema = entry.spec.reply_payload
+        self._status_code = entry.spec.status_code
+        self._response_headers = entry.reply_headers
 
     def params(
         self: MicroMessage[BaseOperation[Any, ParamsT, Any, Any]],
     ) -> ParamsT:
+        # Parameters are extracted on first access only
+        if self._params is ...:
+            self._params = self._address.get_params(self._request.subject())
         return self._params
 
     def payload(self: MicroMessage[BaseOperation[Any, Any, T, Any]]) -> T:
+        # Payload is decoded on first access only
+        if self._data is ...:
+            headers = self._request.headers()
+            data = decompress(self._request.data(), headers.get(CONTENT_ENCODING))
+            type_adapter = self._entry.get_request_adapter(
+                headers.get(CONTENT_TYPE), self._validation
+            )
+            self._data = type_adapter.decode(data)
         return self._data
 
+    def raw_payload(self) -> Buffer:
+        return self._request.data()
+
     def headers(self) -> dict[str, str]:
         return self._request.headers()
 
     async def respond(
         self, data: Any = None, *, headers: dict[str, str] | None = None
     ) -> None:
-        headers = headers or {}
-        if self._response_content_type:
-            headers["Content-Type"] = self._response_content_type
-        response = self._response_type_adapter.encode(data)
-        await self._request.respond_success(self._status_code, response, headers)
+        if headers:
+            headers = {**headers, **self._response_headers}
+        else:
+            headers = dict(self._response_headers)
+        buffers = self._buffers
+        buffer = buffers.acquire() if buffers is not None else None
+        try:
+            response = await self._encode_reply(data, headers, buffer)
+            await self._request.respond_success(self._status_code, response, headers)
+        finally:
+            if buffers is not None and buffer is not None:
+                buffers.release(buffer)
 
     async def respond_error(
         self,
@@ -253,8 +529,25 @@ class MicroMessage(Request[OT]):
         data: Any = None,
         headers: dict[str, str] | None = None,
     ) -> None:
-        headers = headers or {}
-        if self._response_content_type:
-            headers["Content-Type"] = self._response_content_type
-        response = self._response_type_adapter.encode(data)
-        await self._request.respond_error(code, description, response, headers)
+        if headers:
+            headers = {**headers, **self._response_headers}
+        else:
+            headers = dict(self._response_headers)
+        buffers = self._buffers
+        buffer = buffers.acquire() if buffers is not None else None
+        try:
+            response = await self._encode_reply(data, headers, buffer)
+            await self._request.respond_error(code, description, response, headers)
+        finally:
+            if buffers is not None and buffer is not None:
+                buffers.release(buffer)
+
+    async def _encode_reply(
+        self, data: Any, headers: dict[str, str], buffer: bytearray | None
+    ) -> Buffer:
+        """Encode and compress a reply, updating headers accordingly."""
+        type_adapter = _negotiate_reply(self._entry, self._request, headers)
+        response = await encode_async(type_adapter, data, buffer)
+        return _compress_reply(
+            self._response_schema.compression, self._request, response, headers
+        )
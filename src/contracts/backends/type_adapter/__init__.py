@@ -1,3 +1,19 @@
-from .defaults import TypeAdapter, TypeAdapterFactory, sniff_type_adapter
+from contracts.core.types import Buffer, BufferTypeAdapter
 
-__all__ = ["TypeAdapterFactory", "TypeAdapter", "sniff_type_adapter"]
+from .defaults import (
+    TypeAdapter,
+    TypeAdapterFactory,
+    clear_type_adapters,
+    register_type_adapter,
+    sniff_type_adapter,
+)
+
+__all__ = [
+    "Buffer",
+    "BufferTypeAdapter",
+    "TypeAdapterFactory",
+    "TypeAdapter",
+    "clear_type_adapters",
+    "register_type_adapter",
+    "sniff_type_adapter",
+]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any
+
+import cbor2
+
+from contracts.core.buffers import write_into
+from contracts.core.types import (
+    Buffer,
+    T,
+    TypeAdapter,
+    TypeAdapterFactory,
+    Validation,
+)
+
+from .primitives import primitive_codecs
+from .standard import _default_serializer
+
+
+class CBORAdapter(TypeAdapter[T]):
+    """A type adapter encoding data using CBOR.
+
+    Values are converted using the same rules as JSON adapters, so that
+    the JSON schema of the type documents both encodings.
+    """
+
+    def __init__(self, typ: type[T], validation: Validation = Validation.FULL) -> None:
+        self.typ = typ
+        self.validation = Validation(validation)
+        self._encode, self._decode = primitive_codecs(typ, self.validation)
+        self._variants = {self.validation: self}
+
+    def with_validation(self, validation: Validation) -> TypeAdapter[T]:
+        validation = Validation(validation)
+        try:
+            return self._variants[validation]
+        except KeyError:
+            variant = CBORAdapter(self.typ, validation)
+            variant._variants = self._variants
+            self._variants[validation] = variant
+            return variant
+
+    def encode(self, message: T) -> bytes:
+        if self.typ is type(None):
+            if message is not None:
+                raise ValueError("No value expected")
+            return b""
+        return cbor2.dumps(self._encode(message), default=_default_encoder)
+
+    def encode_into(self, message: T, buffer: bytearray, offset: int = -1) -> None:
+        write_into(buffer, self.encode(message), offset)
+
+    def decode(self, data: Buffer) -> T:
+        if self.typ is type(None):
+            if data:
+                raise ValueError("No value expected")
+            return None  # type: ignore
+        result = cbor2.loads(data)
+        try:
+            return self._decode(result)
+        except (TypeError, KeyError, AttributeError) as exc:
+            raise ValueError("Failed to decode data") from exc
+
+
+class CBORAdapterFactory(TypeAdapterFactory):
+    """A type adapter factory using CBOR."""
+
+    def __call__(self, schema: type[T]) -> TypeAdapter[T]:
+        return CBORAdapter(schema)
+
+
+def _default_encoder(encoder: Any, value: Any) -> None:
+    encoder.encode(_default_serializer(value))
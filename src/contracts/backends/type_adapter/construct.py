@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any
+
+from typing_extensions import get_args, get_origin
+
+from contracts.core.types import Validation
+
+from .standard import _UNION_TYPES, Codec, Hook, _compile_decoder
+
+
+def compile_construct_decoder(typ: Any, validation: Validation) -> Codec:
+    """Create a function converting JSON objects into a value of given type without validation.
+
+    Pydantic v1 models are created using `construct()`. Nested models,
+    dataclasses, enums and datetimes are converted, but values are never
+    validated. When validation is `shallow`, missing required fields raise
+    a `ValueError`.
+
+    Fields annotated with a union of several types cannot be constructed
+    without validation, and are always validated.
+
+    Pydantic v2 models are not supported: validation performed by
+    pydantic-core is faster than constructing models in Python.
+    """
+    shallow = validation == Validation.SHALLOW
+
+    def hook(cls: Any, cache: dict[Any, Codec | None]) -> Codec | None:
+        if not (hasattr(cls, "__fields__") and hasattr(cls, "construct")):
+            return None
+        if hasattr(cls, "model_fields"):
+            return None
+        fields = [
+            (
+                name,
+                field.alias or name,
+                getattr(field, "annotation", field.outer_type_),
+                field.required is True,
+            )
+            for name, field in cls.__fields__.items()
+        ]
+        construct = cls.construct
+        cache[cls] = None
+        decoders = [
+            (name, alias, _compile_field_decoder(annotation, cache, hook))
+            for name, alias, annotation, _ in fields
+        ]
+        required = [alias for _, alias, _, is_required in fields if is_required]
+
+        def decode_model(value: Any) -> Any:
+            if shallow:
+                missing = [alias for alias in required if alias not in value]
+                if missing:
+                    raise ValueError(f"Missing required fields: {', '.join(missing)}")
+            kwargs: dict[str, Any] = {}
+            for name, alias, decode in decoders:
+                if alias in value:
+                    kwargs[name] = decode(value[alias])
+            return construct(**kwargs)
+
+        cache[cls] = decode_model
+        return decode_model
+
+    return _compile_decoder(typ, {}, hook)
+
+
+def _compile_field_decoder(
+    annotation: Any, cache: dict[Any, Codec | None], hook: Hook
+) -> Codec:
+    if get_origin(annotation) in _UNION_TYPES:
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(members) > 1:
+            return _validator(annotation)
+    return _compile_decoder(annotation, cache, hook)
+
+
+def _validator(annotation: Any) -> Codec:
+    """Create a function validating values using pydantic v1."""
+    import pydantic
+
+    if pydantic.__version__.startswith("1."):
+        parse_obj_as = pydantic.parse_obj_as
+    else:
+        from pydantic.v1 import parse_obj_as
+
+    return lambda value: parse_obj_as(annotation, value)
@@ -1,10 +1,26 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import is_dataclass
+from functools import lru_cache
+from typing import Any
 
 from contracts.core.types import T, TypeAdapter, TypeAdapterFactory
 
+# Adapters shared by all schemas using the same type
+_adapters: dict[Any, TypeAdapter[Any]] = {}
+_adapters_lock = threading.Lock()
 
+# Binary formats selected according to the content type of a schema
+_BINARY_FORMATS = {
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/cbor": "cbor",
+}
+
+
+@lru_cache(maxsize=None)
 def default_json_adapter() -> TypeAdapterFactory:
     try:
         import pydantic
@@ -25,11 +41,103 @@ def default_json_adapter() -> TypeAdapterFactory:
     raise ImportError("Cannot find a suitable pydantic version.")
 
 
-def sniff_type_adapter(typ: type[T]) -> TypeAdapter[T]:
+def binary_adapter(content_type: str | None) -> TypeAdapterFactory | None:
+    """Get the type adapter factory of a binary content type.
+
+    Returns:
+        The type adapter factory, or `None` if the content type is not a supported binary format.
+    """
+    fmt = _BINARY_FORMATS.get(content_type or "")
+    if fmt == "msgpack":
+        from .msgpack import MsgPackAdapterFactory
+
+        return MsgPackAdapterFactory()
+    if fmt == "cbor":
+        from .cbor import CBORAdapterFactory
+
+        return CBORAdapterFactory()
+    return None
+
+
+def register_type_adapter(
+    typ: type[T], adapter: TypeAdapter[T], content_type: str | None = None
+) -> None:
+    """Register the type adapter returned by `sniff_type_adapter` for a type.
+
+    This can be used to override the default type adapter of a type, and
+    must be called before the schemas using this type are created.
+
+    Args:
+        typ: The type for which adapter is registered.
+        adapter: The type adapter to use for the type.
+        content_type: The content type for which adapter is registered. Only binary content types are distinguished.
+    """
+    with _adapters_lock:
+        _adapters[_adapter_key(typ, content_type)] = adapter
+
+
+def clear_type_adapters() -> None:
+    """Forget all type adapters, including registered ones."""
+    with _adapters_lock:
+        _adapters.clear()
+
+
+def sniff_type_adapter(typ: type[T], content_type: str | None = None) -> TypeAdapter[T]:
+    """Get the type adapter for a type.
+
+    Type adapters are created once for each type and shared by all
+    callers.
+
+    Args:
+        typ: The type to encode and decode.
+        content_type: The content type of the schema. A binary adapter is used for `application/msgpack` and `application/cbor`.
+
+    Streams of items, such as `Iterable[T]` or `AsyncIterator[T]`, are
+    encoded as JSON arrays and decoded one item at a time.
+    """
+    key = _adapter_key(typ, content_type)
+    try:
+        return _adapters[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable type annotations are never cached
+        return _create_type_adapter(typ, content_type)
+    with _adapters_lock:
+        try:
+            return _adapters[key]
+        except KeyError:
+            adapter = _adapters[key] = _create_type_adapter(typ, content_type)
+            return adapter
+
+
+def _adapter_key(typ: Any, content_type: str | None) -> Any:
+    fmt = _BINARY_FORMATS.get(content_type or "")
+    return typ if fmt is None else (typ, fmt)
+
+
+def _create_type_adapter(
+    typ: type[T], content_type: str | None = None
+) -> TypeAdapter[T]:
     from .standard import RawTypeAdapter
+    from .stream import JSONStreamAdapter, is_stream_type
+
+    factory = binary_adapter(content_type)
+    if is_stream_type(typ):
+        if factory is not None:
+            raise TypeError(
+                f"Streaming payloads cannot be encoded as {content_type}: {typ}"
+            )
+        return JSONStreamAdapter(typ)
+    if factory is not None:
+        return factory(typ)
 
     if typ is bytes:
         return RawTypeAdapter(typ)
+    if typ is bytearray:
+        return RawTypeAdapter(typ)
+    if typ is memoryview:
+        return RawTypeAdapter(typ)
     if typ is str:
         return RawTypeAdapter(typ)
     if typ is int:
@@ -41,9 +149,14 @@ def sniff_type_adapter(typ: type[T]) -> TypeAdapter[T]:
     if typ is type(None):
         return RawTypeAdapter(typ)
     if is_dataclass(typ):
+        # The msgspec adapter is faster but stricter, and skips validators of
+        # pydantic dataclasses, so it must be selected explicitly
         return default_json_adapter()(typ)
     if hasattr(typ, "model_fields"):
         return default_json_adapter()(typ)
     if hasattr(typ, "__fields__"):
-        return default_json_adapter()(typ)
+        # Pydantic v1 models, including models from pydantic.v1 namespace
+        from .pydantic_v1 import PydanticV1JSONAdapterFactory
+
+        return PydanticV1JSONAdapterFactory()(typ)
     raise TypeError(f"Cannot find a type adapter for the given type: {typ}")
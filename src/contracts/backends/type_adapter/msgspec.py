@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import msgspec
+
+from contracts.core.buffers import write_into
+from contracts.core.types import Buffer, T, TypeAdapter, TypeAdapterFactory
+
+
+class MsgspecJSONAdapter(TypeAdapter[T]):
+    """A type adapter using msgspec.
+
+    Dataclasses, enums, datetimes and nested types are encoded and
+    decoded natively, without building intermediate dictionaries.
+    """
+
+    def __init__(self, typ: type[T]) -> None:
+        self.typ = typ
+        self.encoder = msgspec.json.Encoder()
+        self.decoder = msgspec.json.Decoder(typ)
+
+    def encode(self, message: T) -> bytes:
+        if self.typ is type(None):
+            if message is not None:
+                raise ValueError("No value expected")
+            return b""
+        return self.encoder.encode(message)
+
+    def encode_into(self, message: T, buffer: bytearray, offset: int = -1) -> None:
+        if self.typ is type(None):
+            if message is not None:
+                raise ValueError("No value expected")
+            write_into(buffer, b"", offset)
+            return
+        # Buffer memory is kept when truncated, so pooled buffers are reused
+        self.encoder.encode_into(message, buffer, offset)
+
+    def decode(self, data: Buffer) -> T:
+        if self.typ is type(None):
+            if data:
+                raise ValueError("No value expected")
+            return None  # type: ignore
+        return self.decoder.decode(data)
+
+
+class MsgspecJSONAdapterFactory(TypeAdapterFactory):
+    """A type adapter factory using msgspec.
+
+    This factory is never selected automatically: use it with
+    `schema(adapter_factory=MsgspecJSONAdapterFactory())`. Values are
+    decoded strictly, without the coercion applied by pydantic adapters.
+    """
+
+    def __call__(self, schema: type[T]) -> TypeAdapter[T]:
+        if is_pydantic_dataclass(schema):
+            raise TypeError(
+                f"Pydantic dataclasses cannot be decoded with msgspec, since their validators would be skipped: {schema}"
+            )
+        return MsgspecJSONAdapter(schema)
+
+
+def is_pydantic_dataclass(typ: object) -> bool:
+    """Check whether a type is a pydantic dataclass."""
+    return (
+        hasattr(typ, "__pydantic_validator__")
+        or hasattr(typ, "__pydantic_fields__")
+        # Pydantic v1 dataclasses
+        or hasattr(typ, "__pydantic_model__")
+    )
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from contracts.core.types import Validation
+
+from .construct import compile_construct_decoder
+from .standard import _compile_decoder, _compile_encoder
+
+Codec = Callable[[Any], Any]
+
+
+def primitive_codecs(
+    typ: Any, validation: Validation = Validation.FULL
+) -> tuple[Codec, Codec]:
+    """Get functions converting values of a type to and from primitive objects.
+
+    Primitive objects are dictionaries, lists, strings, numbers, booleans,
+    `None` and bytes, which can be serialized by any binary format.
+
+    Pydantic models are converted using pydantic, so that validation and
+    custom serializers are applied, and other types are converted using
+    the same rules as the standard JSON adapter. Pydantic v1 models are
+    constructed without validation when `validation` is not `full`.
+
+    Returns:
+        A tuple holding the encoding function and the decoding function.
+    """
+    if hasattr(typ, "model_fields"):
+        import pydantic
+
+        adapter = pydantic.TypeAdapter(typ)
+        return (
+            lambda value: adapter.dump_python(value, mode="json"),
+            adapter.validate_python,
+        )
+    if hasattr(typ, "__fields__") and hasattr(typ, "parse_obj"):
+        # Pydantic v1 models. JSON export honors json_encoders config.
+        return (
+            lambda value: json.loads(value.json()),
+            (
+                typ.parse_obj
+                if validation == Validation.FULL
+                else compile_construct_decoder(typ, validation)
+            ),
+        )
+    return _compile_encoder(typ, {}, binary=True), _compile_decoder(typ, {})
@@ -5,36 +5,89 @@ import json
 import numbers
 from dataclasses import asdict, is_dataclass
 from enum import Enum
-from typing import Any
+from typing import Any, Callable
 
-import pydantic
+try:
+    # Use pydantic v1 API when pydantic v2 is installed
+    from pydantic.v1 import BaseModel, create_model
+    from pydantic.v1.json import pydantic_encoder
+except ImportError:
+    from pydantic import BaseModel, create_model  # type: ignore[assignment]
+    from pydantic.json import pydantic_encoder  # type: ignore[no-redef]
 
-from contracts.core.types import T, TypeAdapter, TypeAdapterFactory
+from contracts.core.buffers import write_into
+from contracts.core.types import (
+    Buffer,
+    T,
+    TypeAdapter,
+    TypeAdapterFactory,
+    Validation,
+)
+
+from .construct import compile_construct_decoder
 
 
 class PydanticV1JSONAdapter(TypeAdapter[T]):
-    """A type adapter for Pydantic v1 models."""
+    """A type adapter for Pydantic v1 models.
+
+    The parser of the type is created once. Models are encoded using
+    their own JSON export, so that `json_encoders` and `json_dumps`
+    config are honored.
+    """
 
-    def __init__(self, typ: type[T]) -> None:
+    def __init__(self, typ: type[T], validation: Validation = Validation.FULL) -> None:
         self.typ = typ
+        self.validation = Validation(validation)
+        self._construct = (
+            None
+            if self.validation == Validation.FULL
+            else compile_construct_decoder(typ, self.validation)
+        )
+        self._parse = _create_parser(typ)
+        self._is_model = isinstance(typ, type) and issubclass(typ, BaseModel)
+        self._dumps_kwargs: dict[str, Any] = (
+            {"separators": (",", ":")}
+            if self._is_model and typ.__config__.json_dumps is json.dumps  # type: ignore[attr-defined]
+            else {}
+        )
+        self._variants = {self.validation: self}
+
+    def with_validation(self, validation: Validation) -> TypeAdapter[T]:
+        validation = Validation(validation)
+        try:
+            return self._variants[validation]
+        except KeyError:
+            variant = PydanticV1JSONAdapter(self.typ, validation)
+            variant._variants = self._variants
+            self._variants[validation] = variant
+            return variant
 
     def encode(self, message: T) -> bytes:
         if self.typ is type(None):
             if message:
                 raise ValueError("No value expected")
             return b""
-        return json.dumps(
-            message,
-            default=_default_serializer,
-            separators=(",", ":"),
-        ).encode("utf-8")
+        if self._is_model and isinstance(message, BaseModel):
+            return message.json(**self._dumps_kwargs).encode("utf-8")
+        return _json_encoder.encode(message).encode("utf-8")
+
+    def encode_into(self, message: T, buffer: bytearray, offset: int = -1) -> None:
+        write_into(buffer, self.encode(message), offset)
 
-    def decode(self, data: bytes) -> T:
+    def decode(self, data: Buffer) -> T:
         if self.typ is type(None):
             if data:
                 raise ValueError("No value expected")
             return None  # type: ignore
-        return pydantic.parse_raw_as(self.typ, data)  # type: ignore
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        if self._construct is not None:
+            result = json.loads(data)
+            try:
+                return self._construct(result)
+            except (TypeError, KeyError, AttributeError) as exc:
+                raise ValueError("Failed to decode data") from exc
+        return self._parse(data)
 
 
 class PydanticV1JSONAdapterFactory(TypeAdapterFactory):
@@ -44,12 +97,24 @@ class PydanticV1JSONAdapterFactory(TypeAdapterFactory):
         return PydanticV1JSONAdapter(schema)
 
 
+def _create_parser(typ: Any) -> Callable[[bytes], Any]:
+    """Create a function parsing JSON data into a value of given type."""
+    if isinstance(typ, type) and issubclass(typ, BaseModel):
+        loads = typ.__config__.json_loads
+        parse_obj = typ.parse_obj
+        return lambda data: parse_obj(loads(data))
+    # Other types are validated using a model with a custom root
+    name = getattr(typ, "__name__", None) or str(typ)
+    model: Any = create_model(f"ParsingModel[{name}]", __root__=(typ, ...))
+    return lambda data: model(__root__=json.loads(data)).__root__
+
+
 def _default_serializer(obj: Any) -> Any:
-    if isinstance(obj, datetime):
+    if isinstance(obj, datetime.datetime):
         return obj.isoformat()
     if isinstance(obj, (bytes, bytearray, set)):
         return list(obj)  # pyright: ignore[reportUnknownArgumentType]
-    if isinstance(obj, pydantic.BaseModel):
+    if isinstance(obj, BaseModel):
         return obj.dict()
     if is_dataclass(obj):
         return asdict(obj)
@@ -59,4 +124,7 @@ def _default_serializer(obj: Any) -> Any:
         return int(obj)
     if isinstance(obj, numbers.Real):
         return float(obj)
-    raise TypeError
+    return pydantic_encoder(obj)
+
+
+_json_encoder = json.JSONEncoder(default=_default_serializer, separators=(",", ":"))
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import pydantic
 
-from contracts.core.types import T, TypeAdapter, TypeAdapterFactory
+from contracts.core.buffers import write_into
+from contracts.core.types import Buffer, T, TypeAdapter, TypeAdapterFactory
 
 
 class PydanticV2JSONAdapter(TypeAdapter[T]):
@@ -19,11 +20,16 @@ class PydanticV2JSONAdapter(TypeAdapter[T]):
             return b""
         return self.adapter.dump_json(message)
 
-    def decode(self, data: bytes) -> T:
+    def encode_into(self, message: T, buffer: bytearray, offset: int = -1) -> None:
+        write_into(buffer, self.encode(message), offset)
+
+    def decode(self, data: Buffer) -> T:
         if self.typ is type(None):
             if data:
                 raise ValueError("No value expected")
             return None  # type: ignore
+        if isinstance(data, memoryview):
+            data = data.tobytes()
         return self.adapter.validate_json(data)
 
 
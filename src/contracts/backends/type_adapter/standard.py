@@ -3,36 +3,58 @@ from __future__ import annotations
 import datetime
 import json
 import numbers
-from dataclasses import asdict, is_dataclass
+import sys
+from dataclasses import asdict, fields, is_dataclass
+from decimal import Decimal
 from enum import Enum
-from typing import Any
+from operator import attrgetter
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Union
+from uuid import UUID
 
-from contracts.core.types import T, TypeAdapter, TypeAdapterFactory
+from typing_extensions import get_args, get_origin, get_type_hints
+
+from contracts.core.buffers import write_into
+from contracts.core.types import Buffer, T, TypeAdapter, TypeAdapterFactory
+
+_BUFFER_TYPES = (bytes, bytearray, memoryview)
 
 
 class RawTypeAdapter(TypeAdapter[T]):
-    """A type adapter using standard library."""
+    """A type adapter using standard library.
+
+    Buffers (`bytes`, `bytearray` and `memoryview`) are passed through
+    without copy whenever the target type allows it.
+    """
 
     def __init__(self, typ: type[T]) -> None:
         self.typ = typ
 
-    def encode(self, message: T) -> bytes:
+    def encode(self, message: T) -> Buffer:
         if self.typ is type(None):
             if message:
                 raise ValueError("No value expected")
             return b""
-        if isinstance(message, bytes):
+        if isinstance(message, _BUFFER_TYPES):
             return message
         return str(message).encode("utf-8")
 
-    def decode(self, data: bytes) -> T:
-        if self.typ is bytes:
-            return data  # type: ignore
-        if self.typ is type(None):
+    def encode_into(self, message: T, buffer: bytearray, offset: int = -1) -> None:
+        write_into(buffer, self.encode(message), offset)
+
+    def decode(self, data: Buffer) -> T:
+        typ = self.typ
+        if typ is bytes:
+            return data if type(data) is bytes else bytes(data)  # type: ignore
+        if typ is memoryview:
+            return memoryview(data)  # type: ignore
+        if typ is bytearray:
+            return bytearray(data)  # type: ignore
+        if typ is type(None):
             if data:
                 raise ValueError("No value expected")
             return None  # type: ignore
-        return self.typ(data.decode("utf-8"))
+        return typ(str(data, "utf-8"))  # type: ignore
 
 
 class RawTypeAdapterFactory(TypeAdapterFactory):
@@ -43,31 +65,39 @@ class RawTypeAdapterFactory(TypeAdapterFactory):
 
 
 class StandardJSONAdapter(TypeAdapter[T]):
-    """A type adapter using standard library."""
+    """A type adapter using standard library.
+
+    Encoding and decoding functions are generated once for the type, so
+    that nested dataclasses, containers, enums and datetimes are converted
+    without inspecting types on each call.
+    """
 
     def __init__(self, typ: type[T]) -> None:
         self.typ = typ
+        self._encode = _compile_encoder(typ, {})
+        self._decode = _compile_decoder(typ, {})
 
     def encode(self, message: T) -> bytes:
         if self.typ is type(None):
             if message:
                 raise ValueError("No value expected")
             return b""
-        return json.dumps(
-            message,
-            default=_default_serializer,
-            separators=(",", ":"),
-        ).encode("utf-8")
+        return _json_encoder.encode(self._encode(message)).encode("utf-8")
+
+    def encode_into(self, message: T, buffer: bytearray, offset: int = -1) -> None:
+        write_into(buffer, self.encode(message), offset)
 
-    def decode(self, data: bytes) -> T:
+    def decode(self, data: Buffer) -> T:
         if self.typ is type(None):
             if data:
                 raise ValueError("No value expected")
             return None  # type: ignore
+        if isinstance(data, memoryview):
+            data = data.tobytes()
         result = json.loads(data)
         try:
-            return self.typ(**result)
-        except TypeError as exc:
+            return self._decode(result)
+        except (TypeError, KeyError, AttributeError) as exc:
             raise ValueError("Failed to decode data") from exc
 
 
@@ -92,3 +122,205 @@ def _default_serializer(obj: Any) -> Any:
     if isinstance(obj, numbers.Real):
         return float(obj)
     raise TypeError
+
+
+_json_encoder = json.JSONEncoder(default=_default_serializer, separators=(",", ":"))
+
+Codec = Callable[[Any], Any]
+Hook = Callable[[Any, "dict[Any, Codec | None]"], "Codec | None"]
+
+if sys.version_info >= (3, 10):
+    from types import UnionType
+
+    _UNION_TYPES: tuple[Any, ...] = (Union, UnionType)
+else:
+    _UNION_TYPES = (Union,)
+
+_SCALARS = (str, int, float, bool, type(None))
+_SEQUENCES = (list, set, frozenset, Sequence)
+_MAPPINGS = (dict, Mapping)
+_ISO_TYPES = (datetime.datetime, datetime.date, datetime.time)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _optional(codec: Codec) -> Codec:
+    return lambda value: None if value is None else codec(value)
+
+
+def _forward(cache: dict[Any, Codec | None], typ: Any) -> Codec:
+    """Create a codec resolved lazily, used for recursive types."""
+    return lambda value: cache[typ](value)  # type: ignore[misc]
+
+
+def _compile_encoder(
+    typ: Any, cache: dict[Any, Codec | None], binary: bool = False
+) -> Codec:
+    """Create a function converting a value into JSON compatible objects.
+
+    Values of unsupported types are returned as is and converted later
+    by `_default_serializer`. Bytes are kept as is when `binary` is true,
+    for formats which support binary values natively.
+    """
+    if typ in cache:
+        return cache[typ] or _forward(cache, typ)
+    if typ is Any or typ in _SCALARS:
+        return _identity
+    origin = get_origin(typ)
+    args = get_args(typ)
+    if origin in _UNION_TYPES:
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) == 1:
+            return _optional(_compile_encoder(members[0], cache, binary))
+        return _identity
+    if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+        items = [_compile_encoder(arg, cache, binary) for arg in args]
+        return lambda value: [encode(v) for encode, v in zip(items, value)]
+    if origin in _SEQUENCES or origin is tuple:
+        item = _compile_encoder(args[0], cache, binary) if args else _identity
+        if item is _identity and origin in (list, tuple, Sequence):
+            return _identity
+        return lambda value: [item(v) for v in value]
+    if origin in _MAPPINGS:
+        item = _compile_encoder(args[1], cache, binary) if len(args) == 2 else _identity
+        if item is _identity:
+            return _identity
+        return lambda value: {k: item(v) for k, v in value.items()}
+    if not isinstance(typ, type):
+        return _identity
+    if is_dataclass(typ):
+        cache[typ] = None
+        hints = _get_type_hints(typ)
+        names = [item.name for item in fields(typ)]
+        encoders = [
+            (idx, _compile_encoder(hints.get(name, Any), cache, binary))
+            for idx, name in enumerate(names)
+        ]
+        converting = [
+            (idx, encode) for idx, encode in encoders if encode is not _identity
+        ]
+        getter = _tuple_getter(names)
+
+        if converting:
+
+            def encode_dataclass(value: Any) -> Any:
+                values = list(getter(value))
+                for idx, encode in converting:
+                    values[idx] = encode(values[idx])
+                return dict(zip(names, values))
+
+        else:
+
+            def encode_dataclass(value: Any) -> Any:
+                return dict(zip(names, getter(value)))
+
+        cache[typ] = encode_dataclass
+        return encode_dataclass
+    if issubclass(typ, Enum):
+        return lambda value: value.value
+    if issubclass(typ, _ISO_TYPES):
+        return lambda value: value.isoformat()
+    if issubclass(typ, (UUID, Decimal)):
+        return str
+    if issubclass(typ, (bytes, bytearray)):
+        return _identity if binary else list
+    return _identity
+
+
+def _compile_decoder(
+    typ: Any, cache: dict[Any, Codec | None], hook: Hook | None = None
+) -> Codec:
+    """Create a function converting JSON objects into a value of given type.
+
+    Scalar values are not validated. The hook, when provided, is called
+    first for each class and may return the decoder of the class.
+    """
+    if typ in cache:
+        return cache[typ] or _forward(cache, typ)
+    if typ is Any or typ in _SCALARS:
+        return _identity
+    origin = get_origin(typ)
+    args = get_args(typ)
+    if origin in _UNION_TYPES:
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) == 1:
+            return _optional(_compile_decoder(members[0], cache, hook))
+        return _identity
+    if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+        items = [_compile_decoder(arg, cache, hook) for arg in args]
+        return lambda value: tuple(decode(v) for decode, v in zip(items, value))
+    if origin in (tuple, set, frozenset):
+        item = _compile_decoder(args[0], cache, hook) if args else _identity
+        return lambda value: origin(item(v) for v in value)
+    if origin in _SEQUENCES:
+        item = _compile_decoder(args[0], cache, hook) if args else _identity
+        if item is _identity:
+            return list
+        return lambda value: [item(v) for v in value]
+    if origin in _MAPPINGS:
+        item = _compile_decoder(args[1], cache, hook) if len(args) == 2 else _identity
+        if item is _identity:
+            return dict
+        return lambda value: {k: item(v) for k, v in value.items()}
+    if not isinstance(typ, type):
+        return _identity
+    if hook is not None:
+        codec = hook(typ, cache)
+        if codec is not None:
+            return codec
+    if is_dataclass(typ):
+        cache[typ] = None
+        hints = _get_type_hints(typ)
+        decoders = [
+            (item.name, _compile_decoder(hints.get(item.name, Any), cache, hook))
+            for item in fields(typ)
+            if item.init
+        ]
+        converting = [
+            (name, decode) for name, decode in decoders if decode is not _identity
+        ]
+
+        if converting:
+
+            def decode_dataclass(value: Any) -> Any:
+                kwargs = dict(value)
+                for name, decode in converting:
+                    if name in kwargs:
+                        kwargs[name] = decode(kwargs[name])
+                return typ(**kwargs)
+
+        else:
+
+            def decode_dataclass(value: Any) -> Any:
+                return typ(**value)
+
+        cache[typ] = decode_dataclass
+        return decode_dataclass
+    if issubclass(typ, Enum):
+        return typ
+    if issubclass(typ, _ISO_TYPES):
+        return typ.fromisoformat
+    if issubclass(typ, (UUID, Decimal)):
+        return typ
+    if issubclass(typ, (bytes, bytearray)):
+        return typ
+    return _identity
+
+
+def _tuple_getter(names: list[str]) -> Callable[[Any], tuple[Any, ...]]:
+    """Create a function getting attributes of an object as a tuple."""
+    if not names:
+        return lambda value: ()
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return lambda value: (getter(value),)
+    return attrgetter(*names)
+
+
+def _get_type_hints(typ: Any) -> dict[str, Any]:
+    try:
+        return get_type_hints(typ)
+    except Exception:
+        return {}
@@ -0,0 +1,227 @@
+"""Type adapters for payloads streaming a sequence of items.
+
+Payloads annotated with `Iterable[T]`, `Iterator[T]`, `AsyncIterable[T]`
+or `AsyncIterator[T]` are sent as a JSON array. Items are decoded and
+validated one at a time while the payload is iterated, and encoded one at
+a time while the iterable is consumed, so that the whole sequence is never
+held as Python objects. Payloads are decoded from the buffer by chunks, so
+that the whole payload is never copied into a single string either.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Generator,
+    Iterable,
+    Iterator,
+)
+from typing import Any
+
+from typing_extensions import get_args, get_origin
+
+from contracts.core.types import Buffer, T, TypeAdapter, Validation
+
+from .primitives import primitive_codecs
+from .standard import _json_encoder
+
+_SYNC_ORIGINS = (Iterable, Iterator, Generator)
+_ASYNC_ORIGINS = (AsyncIterable, AsyncIterator, AsyncGenerator)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_json_decoder = json.JSONDecoder()
+_CHUNK_SIZE = 64 * 1024
+
+
+def is_stream_type(typ: Any) -> bool:
+    """Check whether a type annotation is a stream of items."""
+    return get_origin(typ) in _SYNC_ORIGINS + _ASYNC_ORIGINS
+
+
+class JSONStreamAdapter(TypeAdapter[T]):
+    """A type adapter for streams of items encoded as a JSON array.
+
+    Decoding returns an iterator, or an async iterator when the type is
+    asynchronous, yielding validated items as the array is parsed. Invalid
+    items raise a `ValueError` when they are reached.
+    """
+
+    def __init__(self, typ: Any, validation: Validation = Validation.FULL) -> None:
+        if not is_stream_type(typ):
+            raise TypeError(f"Not a stream type: {typ}")
+        args = get_args(typ)
+        self.typ = typ
+        self.item_type = args[0] if args else Any
+        self.is_async = get_origin(typ) in _ASYNC_ORIGINS
+        self.validation = Validation(validation)
+        self._encode_item, self._decode_item = primitive_codecs(
+            self.item_type, self.validation
+        )
+        self._variants = {self.validation: self}
+
+    def with_validation(self, validation: Validation) -> TypeAdapter[T]:
+        validation = Validation(validation)
+        try:
+            return self._variants[validation]
+        except KeyError:
+            variant = JSONStreamAdapter(self.typ, validation)
+            variant._variants = self._variants
+            self._variants[validation] = variant
+            return variant
+
+    def encode(self, message: T) -> Buffer:
+        buffer = bytearray()
+        self.encode_into(message, buffer)
+        return buffer
+
+    def encode_into(self, message: T, buffer: bytearray, offset: int = -1) -> None:
+        if isinstance(message, AsyncIterable):
+            raise TypeError("Async iterables must be encoded using encode_async()")
+        if offset >= 0:
+            del buffer[offset:]
+        encode = self._encode_item
+        separator = b"["
+        for item in message:  # type: ignore[attr-defined]
+            buffer += separator
+            buffer += _json_encoder.encode(encode(item)).encode("utf-8")
+            separator = b","
+        buffer += b"[]" if separator == b"[" else b"]"
+
+    async def encode_async(self, message: T) -> Buffer:
+        """Encode a stream, consuming async iterables as well."""
+        if not isinstance(message, AsyncIterable):
+            return self.encode(message)
+        encode = self._encode_item
+        buffer = bytearray()
+        separator = b"["
+        async for item in message:  # pyright: ignore[reportUnknownVariableType]
+            buffer += separator
+            buffer += _json_encoder.encode(encode(item)).encode("utf-8")
+            separator = b","
+        buffer += b"[]" if separator == b"[" else b"]"
+        return buffer
+
+    def decode(self, data: Buffer) -> T:
+        reader = _TextReader(data)
+        if reader.peek() != "[":
+            raise ValueError("Expected a JSON array")
+        reader.idx += 1
+        items = self._iter_items(reader)
+        if self.is_async:
+            return _aiter(items)  # type: ignore[return-value]
+        return items  # type: ignore[return-value]
+
+    def _iter_items(self, reader: _TextReader) -> Iterator[Any]:
+        decode = self._decode_item
+        if reader.peek() == "]":
+            reader.idx += 1
+        else:
+            while True:
+                value = reader.value()
+                try:
+                    item = decode(value)
+                except (TypeError, KeyError, AttributeError) as exc:
+                    raise ValueError("Failed to decode data") from exc
+                yield item
+                char = reader.peek()
+                if char == ",":
+                    reader.idx += 1
+                    continue
+                if char != "]":
+                    raise ValueError(
+                        f"Expected ',' or ']' at position {reader.position}"
+                    )
+                reader.idx += 1
+                break
+        if reader.peek():
+            raise ValueError("Extra data after JSON array")
+
+
+class _TextReader:
+    """Decode UTF-8 text incrementally from a buffer.
+
+    The buffer is decoded by chunks, and only the text which was not parsed
+    yet is kept, so that the whole payload is never copied into a single
+    string. The window grows beyond a chunk only to hold an item larger
+    than a chunk.
+    """
+
+    def __init__(self, data: Buffer) -> None:
+        self._view = memoryview(data).cast("B")
+        self._size = len(self._view)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._offset = 0
+        self._consumed = 0
+        self._chunk_size = _CHUNK_SIZE
+        self.text = ""
+        self.idx = 0
+
+    @property
+    def position(self) -> int:
+        """The position of the next character in the whole text."""
+        return self._consumed + self.idx
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the whole buffer was decoded."""
+        return self._offset >= self._size
+
+    def read(self, size: int) -> bool:
+        """Decode the next bytes of the buffer, dropping parsed text.
+
+        Args:
+            size: The number of bytes to decode.
+
+        Returns:
+            `False` if the whole buffer was already decoded.
+        """
+        if self.exhausted:
+            return False
+        end = self._offset + size
+        final = end >= self._size
+        chunk = self._decoder.decode(self._view[self._offset : end], final)
+        self._offset = end
+        if final:
+            self._view.release()
+        self._consumed += self.idx
+        self.text = self.text[self.idx :] + chunk
+        self.idx = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and get the next character, or "" at the end."""
+        while True:
+            self.idx = _WHITESPACE.match(self.text, self.idx).end()  # type: ignore[union-attr]
+            if self.idx < len(self.text) or not self.read(self._chunk_size):
+                return self.text[self.idx : self.idx + 1]
+
+    def value(self) -> Any:
+        """Parse the next JSON value, decoding more of the buffer as needed."""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(self.text, self.idx)
+            except json.JSONDecodeError:
+                if not self.read(size):
+                    raise
+            else:
+                # A value ending with the window may continue in the next
+                # chunk, such as a number.
+                if end < len(self.text) or self.exhausted:
+                    self.idx = end
+                    return value
+                self.read(size)
+            # Grow reads with the pending text so that parsing a large item
+            # is retried a logarithmic number of times.
+            size = max(size, len(self.text) - self.idx)
+
+
+async def _aiter(items: Iterator[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
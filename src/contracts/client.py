@@ -1,20 +1,29 @@
 from __future__ import annotations
 
 import abc
-from typing import Any, Generic, overload
+import asyncio
+from typing import TYPE_CHECKING, Any, Generic, Iterable, overload
 
 from contracts.abc.operation import BaseOperation
 
-from .core.event_spec import MessageToPublish
+from .backends.compression.defaults import decompress
+from .core.buffers import BufferPool
+from .core.compression import ACCEPT_ENCODING, CONTENT_ENCODING, Compression
+from .core.event_spec import MESSAGE_ID, MessageToPublish
+from .core.negotiation import ACCEPT, CONTENT_TYPE
 from .core.operation_spec import RequestToSend
-from .core.types import ParamsT, R, T
+from .core.schema import Schema
+from .core.types import Buffer, ParamsT, R, T, Validation, encode_async
+
+if TYPE_CHECKING:
+    from .outbox import Outbox
 
 
 class RawOperationError(Exception):
     """Request error."""
 
     def __init__(
-        self, code: int, description: str, headers: dict[str, str] | None, data: bytes
+        self, code: int, description: str, headers: dict[str, str] | None, data: Buffer
     ) -> None:
         self.description = description
         self.code = code
@@ -46,7 +55,7 @@ class OperationError(Exception):
         return self.raw.description
 
     @property
-    def raw_data(self) -> bytes:
+    def raw_data(self) -> Buffer:
         """Get the raw data."""
         return self.raw.data
 
@@ -54,7 +63,7 @@ class OperationError(Exception):
 class RawReply:
     """Raw reply to a request."""
 
-    def __init__(self, data: bytes, headers: dict[str, str]) -> None:
+    def __init__(self, data: Buffer, headers: dict[str, str]) -> None:
         self.data = data
         self.headers = headers
 
@@ -67,6 +76,7 @@ class Reply(Generic[ParamsT, T, R]):
         request: RequestToSend[ParamsT, T, R],
         reply: RawReply | None,
         error: RawOperationError | None,
+        validation: Validation = Validation.FULL,
     ) -> None:
         if reply is None and error is None:
             raise ValueError("data and error cannot be both None")
@@ -75,12 +85,18 @@ class Reply(Generic[ParamsT, T, R]):
         self.request = request
         self._reply = reply
         self._error = error
+        self._validation = validation
         self._data: R = ...  # type: ignore[assignment]
 
-    def _decode_data(self, data: bytes) -> R:
+    def _decode_data(self, data: Buffer) -> R:
         """Decode the data."""
         if self._data is ...:
-            self._data = self.request._spec.reply_payload.type_adapter.decode(data)
+            headers = self.headers()
+            data = decompress(data, headers.get(CONTENT_ENCODING))
+            type_adapter = self.request._spec.reply_payload.get_type_adapter(
+                headers.get(CONTENT_TYPE), self._validation
+            )
+            self._data = type_adapter.decode(data)
         return self._data
 
     def raise_on_error(self) -> None:
@@ -130,7 +146,7 @@ class ClientAdapter(metaclass=abc.ABCMeta):
     async def send_request(
         self,
         subject: str,
-        payload: bytes,
+        payload: Buffer,
         headers: dict[str, str] | None = None,
         timeout: float = 1,
     ) -> RawReply:
@@ -140,15 +156,58 @@ class ClientAdapter(metaclass=abc.ABCMeta):
     async def send_event(
         self,
         subject: str,
-        payload: bytes,
+        payload: Buffer,
         headers: dict[str, str] | None = None,
     ) -> None:
         """Send an event."""
 
+    async def publish_event(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> asyncio.Future[Any]:
+        """Send an event without waiting for the broker to acknowledge it.
+
+        The returned future is resolved once the event is acknowledged. The
+        payload must not be referenced once this method returns. By default,
+        the event is sent using `send_event`, and a resolved future is
+        returned.
+        """
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        try:
+            await self.send_event(subject, payload, headers)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
+        return future
+
 
 class Client:
-    def __init__(self, adapter: ClientAdapter) -> None:
+    """A client used to send requests and publish events.
+
+    Args:
+        adapter: The client adapter used to send messages.
+        content_types: The preferred content types, in order of preference. Payloads are encoded, and replies are requested, using the first preferred content type supported by the schema. The default content type of the schema is used otherwise.
+        validation: The validation applied when decoding replies. Use `shallow` or `none` only when replies are trusted.
+        buffers: The pool of buffers used to encode payloads. Buffers are reused as soon as messages are sent, so the adapter must not keep references to payloads. Pooling only saves allocations with type adapters encoding directly into buffers, such as the msgspec adapter.
+        outbox: The outbox events are appended to. Sending an event then only waits for the event to be synced to disk, and the outbox publishes it in the background.
+    """
+
+    def __init__(
+        self,
+        adapter: ClientAdapter,
+        content_types: Iterable[str] = (),
+        validation: Validation | str = Validation.FULL,
+        buffers: BufferPool | None = None,
+        outbox: Outbox | None = None,
+    ) -> None:
         self._adapter = adapter
+        self._content_types = tuple(content_types)
+        self._validation = Validation(validation)
+        self._buffers = buffers
+        self._outbox = outbox
 
     @overload
     async def send(
@@ -175,21 +234,88 @@ class Client:
         raise_on_error: bool = True,
     ) -> Reply[Any, Any, Any] | None:
         """Send a request or an event."""
-        if isinstance(msg, RequestToSend):
-            data = msg._spec.payload.type_adapter.encode(msg.payload)
-            try:
-                reply = await self._adapter.send_request(
-                    msg.subject, payload=data, headers=msg.headers, timeout=timeout
+        buffers = self._buffers
+        buffer = buffers.acquire() if buffers is not None else None
+        try:
+            if isinstance(msg, RequestToSend):
+                return await self._send_request(
+                    msg, buffer, timeout=timeout, raise_on_error=raise_on_error
                 )
-            except RawOperationError as e:
-                if raise_on_error:
-                    raise OperationError(e)
-                return Reply(msg, None, e)
-            return Reply(msg, reply, None)
-        data = msg._spec.payload.type_adapter.encode(msg.payload)
-        return await self._adapter.send_event(
-            msg.subject, payload=data, headers=msg.headers
+            data, headers = await self._encode(
+                msg._spec.payload, msg.payload, _event_headers(msg), buffer
+            )
+            if self._outbox is not None:
+                await (await self._outbox.append(msg.subject, data, headers))
+                return None
+            return await self._adapter.send_event(
+                msg.subject, payload=data, headers=headers
+            )
+        finally:
+            if buffers is not None and buffer is not None:
+                buffers.release(buffer)
+
+    async def publish_many(
+        self, messages: Iterable[MessageToPublish[Any, Any]]
+    ) -> list[asyncio.Future[Any]]:
+        """Publish several events without waiting for each acknowledgement.
+
+        Events are published in order. Publishing only waits when the
+        adapter limits the number of events waiting for an acknowledgement.
+
+        Returns:
+            A future for each event, resolved once the event is acknowledged, or synced to disk when the client has an outbox.
+        """
+        buffers = self._buffers
+        buffer = buffers.acquire() if buffers is not None else None
+        futures: list[asyncio.Future[Any]] = []
+        try:
+            for msg in messages:
+                data, headers = await self._encode(
+                    msg._spec.payload, msg.payload, _event_headers(msg), buffer
+                )
+                if self._outbox is not None:
+                    future = await self._outbox.append(msg.subject, data, headers)
+                else:
+                    future = await self._adapter.publish_event(
+                        msg.subject, data, headers
+                    )
+                futures.append(future)
+        finally:
+            if buffers is not None and buffer is not None:
+                buffers.release(buffer)
+        return futures
+
+    async def _send_request(
+        self,
+        msg: RequestToSend[Any, Any, Any],
+        buffer: bytearray | None,
+        timeout: float,
+        raise_on_error: bool,
+    ) -> Reply[Any, Any, Any]:
+        spec = msg._spec
+        data, headers = await self._encode(
+            spec.payload, msg.payload, msg.headers, buffer
         )
+        reply_payload = spec.reply_payload
+        if headers is msg.headers and (
+            reply_payload.compression or reply_payload.alternatives
+        ):
+            headers = dict(headers)
+        if reply_payload.compression:
+            headers[ACCEPT_ENCODING] = reply_payload.compression.accept_encoding()
+        if reply_payload.alternatives:
+            accepted = self._accepted(reply_payload)
+            if accepted:
+                headers[ACCEPT] = ", ".join(accepted)
+        try:
+            reply = await self._adapter.send_request(
+                msg.subject, payload=data, headers=headers, timeout=timeout
+            )
+        except RawOperationError as e:
+            if raise_on_error:
+                raise OperationError(e)
+            return Reply(msg, None, e, self._validation)
+        return Reply(msg, reply, None, self._validation)
 
     def decode_error(
         self,
@@ -198,9 +324,77 @@ class Client:
     ) -> R:
         """Decode an error."""
         spec = operation._spec  # pyright: ignore[reportGeneralTypeIssues]
-        return spec.reply_payload.type_adapter.decode(exc.raw.data)
-
-
-def new_client(adapter: ClientAdapter) -> Client:
+        data = decompress(exc.raw.data, exc.headers.get(CONTENT_ENCODING))
+        type_adapter = spec.reply_payload.get_type_adapter(
+            exc.headers.get(CONTENT_TYPE), self._validation
+        )
+        return type_adapter.decode(data)
+
+    def _accepted(self, schema: Schema[Any]) -> list[str]:
+        """Get the preferred content types supported by a schema."""
+        supported = schema.content_types
+        return [
+            content_type
+            for content_type in self._content_types
+            if content_type in supported
+        ]
+
+    async def _encode(
+        self,
+        schema: Schema[Any],
+        payload: Any,
+        headers: dict[str, str],
+        buffer: bytearray | None = None,
+    ) -> tuple[Buffer, dict[str, str]]:
+        """Encode a payload using the preferred content type supported by the schema.
+
+        Streaming payloads are consumed item by item, without building the
+        whole sequence first. The payload is written into the buffer when
+        given. Headers are copied only when they are updated.
+        """
+        if schema.alternatives or schema.compression:
+            headers = dict(headers)
+        if schema.alternatives:
+            accepted = self._accepted(schema)
+            content_type = accepted[0] if accepted else schema.content_type
+            adapter = schema.get_type_adapter(content_type)
+            headers[CONTENT_TYPE] = content_type
+        else:
+            adapter = schema.type_adapter
+        data = await encode_async(adapter, payload, buffer)
+        return _compress(schema.compression, data, headers), headers
+
+
+def _event_headers(msg: MessageToPublish[Any, Any]) -> dict[str, str]:
+    """Get the headers of an event, including its id."""
+    if MESSAGE_ID in msg.headers:
+        return msg.headers
+    return {**msg.headers, MESSAGE_ID: msg.id}
+
+
+def _compress(
+    compression: Compression | None,
+    data: Buffer,
+    headers: dict[str, str],
+) -> Buffer:
+    """Compress data using the preferred encoding of the schema.
+
+    The `Content-Encoding` header is set when data is compressed.
+    """
+    if compression is None:
+        return data
+    data, encoding = compression.compress(data, compression.encodings[0])
+    if encoding:
+        headers[CONTENT_ENCODING] = encoding
+    return data
+
+
+def new_client(
+    adapter: ClientAdapter,
+    content_types: Iterable[str] = (),
+    validation: Validation | str = Validation.FULL,
+    buffers: BufferPool | None = None,
+    outbox: Outbox | None = None,
+) -> Client:
     """Create a new client."""
-    return Client(adapter)
+    return Client(adapter, content_types, validation, buffers, outbox)
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 import re
+import sys
 from dataclasses import dataclass, field, fields, is_dataclass
-from typing import Generic
+from decimal import Decimal
+from enum import Enum
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Generic, List, Optional, Tuple, Union
+from uuid import UUID
+
+from typing_extensions import Annotated, get_args, get_origin, get_type_hints
 
 from .types import ParamsT
 
@@ -67,6 +74,8 @@ class Address(Generic[ParamsT]):
         self.placeholders = Placeholders.from_subject(subject, parameters)
         self._fields: list[str] = []
         self._verify()
+        self._extractor = self.placeholders.compile_extractor()
+        self._builder = self.placeholders.compile_builder()
 
     def __str__(self) -> str:
         return self.subject
@@ -113,7 +122,18 @@ class Address(Generic[ParamsT]):
         Returns:
             The extracted parameters.
         """
-        return self.placeholders.extract_parameters(subject)
+        return self._extractor(subject.split(SEPARATOR))
+
+    def get_params_from_tokens(self, tokens: list[str]) -> ParamsT:
+        """Extract parameters from a subject already split into tokens.
+
+        Args:
+            tokens: The tokens of the subject to extract parameters from.
+
+        Returns:
+            The extracted parameters.
+        """
+        return self._extractor(tokens)
 
     def get_subject(self, parameters: ParamsT | None = None) -> str:
         """Get a valid NATS subject for given parameters.
@@ -123,19 +143,13 @@ class Address(Generic[ParamsT]):
 
         Returns:
             A valid NATS subject.
+
+        Raises:
+            ValueError: When the value of a parameter is `None`, since it cannot be written as a token.
         """
         if parameters is None:
             return self.placeholders.subject
-        tokens = self.placeholders.subject.split(".")
-        for name, pos in self.placeholders.mapping.items():
-            tokens[pos] = getattr(parameters, name)
-        if self.placeholders.wildcard:
-            values = getattr(parameters, self.placeholders.wildcard[0])
-            wildcard_start = self.placeholders.wildcard[1]
-            tokens[wildcard_start] = values[0]
-            for value in values[1:]:
-                tokens.append(value)
-        return ".".join(tokens)
+        return self._builder(parameters)
 
 
 @dataclass
@@ -149,8 +163,10 @@ class Placeholders(Generic[ParamsT]):
         return f"Placeholders({self.mapping}, wildcard={self.wildcard})"
 
     def extract_parameters(self, subject: str) -> ParamsT:
+        return self.extract_from_tokens(subject.split("."))
+
+    def extract_from_tokens(self, tokens: list[str]) -> ParamsT:
         kwargs = {}
-        tokens = subject.split(".")
         for name, pos in self.mapping.items():
             kwargs[name] = tokens[pos]
         if self.wildcard:
@@ -158,6 +174,110 @@ class Placeholders(Generic[ParamsT]):
             kwargs[self.wildcard[0]] = tokens[wildcard_start:]
         return self.typ(**kwargs)
 
+    def compile_extractor(self) -> Callable[[list[str]], ParamsT]:
+        """Create a function extracting parameters from subject tokens.
+
+        Token positions and converters are resolved once, and parameters
+        are constructed using positional arguments when the parameters type
+        is a dataclass. Pydantic models are created without validation when
+        all fields can be converted from annotations.
+        """
+        typ = self.typ
+        if typ is type(None):
+            return lambda tokens: None  # type: ignore[return-value]
+        keys: dict[str, int | slice] = dict(self.mapping)
+        if self.wildcard:
+            keys[self.wildcard[0]] = slice(self.wildcard[1], None)
+        if not keys:
+            return lambda tokens: typ()
+        codecs = _get_codecs(typ, self.wildcard[0] if self.wildcard else None)
+        construct = _get_constructor(typ, codecs)
+        positional = _get_positional_fields(typ)
+        if positional is not None and set(positional) == set(keys):
+            names = positional
+        else:
+            names = list(keys)
+            positional = None
+        converters = [codecs[name][0] if name in codecs else None for name in names]
+        if any(converters):
+            readers = [
+                _reader(keys[name], converter)
+                for name, converter in zip(names, converters)
+            ]
+            if positional is not None:
+                return lambda tokens: construct(*[read(tokens) for read in readers])
+            return lambda tokens: construct(
+                **{name: read(tokens) for name, read in zip(names, readers)}
+            )
+        if len(names) == 1:
+            key = keys[names[0]]
+            if positional is not None:
+                return lambda tokens: construct(tokens[key])
+            name = names[0]
+            return lambda tokens: construct(**{name: tokens[key]})
+        getter = itemgetter(*(keys[name] for name in names))
+        if positional is not None:
+            return lambda tokens: construct(*getter(tokens))
+        return lambda tokens: construct(**dict(zip(names, getter(tokens))))
+
+    def compile_builder(self) -> Callable[[ParamsT], str]:
+        """Create a function generating a subject from parameters.
+
+        The subject template is converted into a format string once, so
+        that building a subject does not split or join tokens. Values are
+        formatted according to the annotations of the parameters type.
+        `None` values are rejected rather than written as `"None"`.
+        """
+        if not self.mapping and not self.wildcard:
+            subject = self.subject
+            return lambda parameters: subject
+        tokens = [
+            token.replace("{", "{{").replace("}", "}}")
+            for token in self.subject.split(SEPARATOR)
+        ]
+        slots = sorted(self.mapping.items(), key=itemgetter(1))
+        for _, pos in slots:
+            tokens[pos] = "{}"
+        names = [name for name, _ in slots]
+        if self.wildcard:
+            tokens[self.wildcard[1]] = "{}"
+        fmt = SEPARATOR.join(tokens).format
+        codecs = _get_codecs(self.typ, self.wildcard[0] if self.wildcard else None)
+        formatters = [codecs[name][1] if name in codecs else None for name in names]
+        if self.wildcard:
+            remaining = self.wildcard[0]
+            remaining_formatter = codecs[remaining][1] if remaining in codecs else None
+            writers = [
+                _writer(name, formatter) for name, formatter in zip(names, formatters)
+            ]
+            writers.append(_remaining_writer(remaining, remaining_formatter))
+            return lambda parameters: fmt(*[write(parameters) for write in writers])
+        if any(formatters):
+            writers = [
+                _writer(name, formatter) for name, formatter in zip(names, formatters)
+            ]
+            return lambda parameters: fmt(*[write(parameters) for write in writers])
+        if len(names) == 1:
+            name = names[0]
+            single = attrgetter(name)
+
+            def build_single(parameters: ParamsT) -> str:
+                value = single(parameters)
+                if value is None:
+                    raise _none_error(name)
+                return fmt(value)
+
+            return build_single
+        getter = attrgetter(*names)
+
+        def build(parameters: ParamsT) -> str:
+            values = getter(parameters)
+            if None in values:
+                raise _none_error(names[values.index(None)])
+            return fmt(*values)
+
+        return build
+
     @classmethod
     def from_subject(
         cls,
@@ -203,11 +323,13 @@ class Placeholders(Generic[ParamsT]):
 
             # Append placeholder
             pos = (
-                subject.replace("...", MATCH_ONE)
+                subject.replace("...", MATCH_ALL)
                 .split(".")
                 .index(placeholder.replace("...", MATCH_ALL))
             )
             if is_wildcard:
+                if end != len(subject):
+                    raise ValueError("Match all placeholder must be the last token")
                 placeholders.wildcard = (placeholder_name, pos)
             else:
                 placeholders.mapping[placeholder_name] = pos
@@ -215,6 +337,22 @@ class Placeholders(Generic[ParamsT]):
         return placeholders
 
 
+def _get_positional_fields(obj: object) -> list[str] | None:
+    """Get the fields of a dataclass accepted as positional arguments.
+
+    Returns `None` when object cannot be constructed using positional
+    arguments only.
+    """
+    if not is_dataclass(obj):
+        return None
+    names: list[str] = []
+    for item in fields(obj):
+        if not item.init or getattr(item, "kw_only", False):
+            return None
+        names.append(item.name)
+    return names
+
+
 def _get_fields(obj: object) -> list[str]:
     """Get all fields of an object."""
     # Dataclasses (standard library)
@@ -227,3 +365,221 @@ def _get_fields(obj: object) -> list[str]:
     if hasattr(obj, "__fields__"):
         return list(obj.__fields__.keys())  # type: ignore
     raise TypeError(f"Cannot get fields of object: {obj} ({type(obj)})")
+
+
+Converter = Callable[[str], Any]
+"""A function converting a subject token into a parameter value."""
+
+Formatter = Callable[[Any], str]
+"""A function converting a parameter value into a subject token."""
+
+Codec = Tuple[Optional[Converter], Optional[Formatter]]
+"""A converter and a formatter. `None` is used when no conversion is required."""
+
+_BOOLEANS = {"true": True, "false": False, "1": True, "0": False}
+
+
+def _convert_bool(token: str) -> bool:
+    try:
+        return _BOOLEANS[token.lower()]
+    except KeyError:
+        raise ValueError(f"Invalid boolean value: '{token}'") from None
+
+
+def _format_bool(value: Any) -> str:
+    return "true" if value else "false"
+
+
+def _format_enum(value: Any) -> str:
+    return str(getattr(value, "value", value))
+
+
+def _enum_converter(typ: type[Enum]) -> Converter:
+    members = {str(member.value): member for member in typ}
+
+    def convert(token: str) -> Enum:
+        try:
+            return members[token]
+        except KeyError:
+            raise ValueError(f"Invalid value for {typ.__name__}: '{token}'") from None
+
+    return convert
+
+
+if sys.version_info >= (3, 10):
+    from types import UnionType
+
+    _UNION_TYPES: tuple[Any, ...] = (Union, UnionType)
+else:
+    _UNION_TYPES = (Union,)
+
+
+def _get_codec(annotation: Any) -> Codec | None:
+    """Get the converter and formatter for an annotation.
+
+    `None` is used instead of a function when no conversion is required,
+    and `None` is returned when the annotation is not supported.
+    """
+    if annotation is Any or annotation is str:
+        return None, None
+    origin = get_origin(annotation)
+    if origin in _UNION_TYPES:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return _get_codec(args[0])
+        return None
+    if not isinstance(annotation, type):
+        return None
+    if issubclass(annotation, bool):
+        return _convert_bool, _format_bool
+    if issubclass(annotation, Enum):
+        return _enum_converter(annotation), _format_enum
+    if issubclass(annotation, str):
+        return None, None
+    if issubclass(annotation, (int, float, Decimal, UUID)):
+        return annotation, None
+    return None
+
+
+def _get_remaining_codec(annotation: Any) -> Codec | None:
+    """Get the converter and formatter for items of a match-all placeholder."""
+    if annotation is Any:
+        return None, None
+    origin = get_origin(annotation)
+    if origin in _UNION_TYPES:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return _get_remaining_codec(args[0])
+        return None
+    if origin not in (list, List, tuple, Tuple):
+        return None
+    args = get_args(annotation)
+    if not args:
+        return None, None
+    codec = _get_codec(args[0])
+    if codec is None:
+        return None
+    converter, formatter = codec
+    if converter is not None and formatter is None:
+        formatter = str
+    return converter, formatter
+
+
+def _get_annotations(obj: Any) -> dict[str, Any]:
+    """Get the type annotations of all fields of an object."""
+    # Dataclasses (standard library)
+    if is_dataclass(obj):
+        try:
+            hints = get_type_hints(obj)
+        except Exception:
+            hints = {}
+        return {item.name: hints.get(item.name, item.type) for item in fields(obj)}
+    # Pydantic V2 (constraints are kept as annotated metadata)
+    if hasattr(obj, "model_fields"):
+        return {
+            name: (
+                Annotated[(info.annotation, *info.metadata)]
+                if info.metadata
+                else info.annotation
+            )
+            for name, info in obj.model_fields.items()  # type: ignore
+        }
+    # Pydantic V1 (constrained types are defined in pydantic package)
+    if hasattr(obj, "__fields__"):
+        return {
+            name: (
+                Annotated[info.outer_type_, info.outer_type_]
+                if info.outer_type_.__module__.startswith("pydantic")
+                else info.outer_type_
+            )
+            for name, info in obj.__fields__.items()  # type: ignore
+        }
+    raise TypeError(f"Cannot get fields of object: {obj} ({type(obj)})")
+
+
+def _get_codecs(obj: Any, remaining: str | None = None) -> dict[str, Codec]:
+    """Get the converter and formatter of each supported field of an object.
+
+    Fields with unsupported annotations are omitted.
+    """
+    if obj is type(None):
+        return {}
+    codecs: dict[str, Codec] = {}
+    for name, annotation in _get_annotations(obj).items():
+        if name == remaining:
+            codec = _get_remaining_codec(annotation)
+        else:
+            codec = _get_codec(annotation)
+        if codec is not None:
+            codecs[name] = codec
+    return codecs
+
+
+def _get_constructor(obj: Any, codecs: dict[str, Codec]) -> Callable[..., Any]:
+    """Get the function used to create parameters.
+
+    Pydantic models are created without validation when values of
+    all fields are already converted.
+    """
+    if is_dataclass(obj):
+        return obj
+    if set(codecs) != set(_get_fields(obj)):
+        return obj
+    # Pydantic V2
+    if hasattr(obj, "model_construct"):
+        decorators = obj.__pydantic_decorators__
+        if decorators.field_validators or decorators.model_validators:
+            return obj
+        return obj.model_construct
+    # Pydantic V1
+    if hasattr(obj, "construct"):
+        if (
+            obj.__validators__
+            or obj.__pre_root_validators__
+            or obj.__post_root_validators__
+        ):
+            return obj
+        return obj.construct
+    return obj
+
+
+def _reader(
+    key: int | slice, converter: Converter | None
+) -> Callable[[list[str]], Any]:
+    if converter is None:
+        return itemgetter(key)
+    if isinstance(key, slice):
+        return lambda tokens: [converter(token) for token in tokens[key]]
+    return lambda tokens: converter(tokens[key])
+
+
+def _none_error(name: str) -> ValueError:
+    return ValueError(f"Parameter '{name}' cannot be None")
+
+
+def _writer(name: str, formatter: Formatter | None) -> Callable[[Any], Any]:
+    getter = attrgetter(name)
+
+    def write(parameters: Any) -> Any:
+        value = getter(parameters)
+        if value is None:
+            raise _none_error(name)
+        return value if formatter is None else formatter(value)
+
+    return write
+
+
+def _remaining_writer(name: str, formatter: Formatter | None) -> Callable[[Any], str]:
+    getter = attrgetter(name)
+    join = SEPARATOR.join
+
+    def write(parameters: Any) -> str:
+        values = getter(parameters)
+        if values is None or None in values:
+            raise _none_error(name)
+        if not values:
+            # An empty subject token would not match the address
+            raise ValueError(f"Parameter '{name}' cannot be empty")
+        return join(values if formatter is None else map(formatter, values))
+
+    return write
@@ -0,0 +1,100 @@
+"""The buffers module defines a pool of buffers used to encode payloads.
+
+Buffers are returned to the pool once the payload has been sent, and are
+never cleared, so that their memory is reused by the next payload: type
+adapters write into pooled buffers starting at offset 0, and the buffer
+is truncated to the end of the message without releasing its memory.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .types import Buffer
+
+
+@dataclass
+class BufferPoolStats:
+    """Statistics of a buffer pool.
+
+    Args:
+        acquired: The number of buffers acquired.
+        reused: The number of acquired buffers which were taken from the pool.
+        released: The number of buffers returned to the pool.
+        discarded: The number of buffers which were not returned to the pool, because the pool was full or the buffer was too large.
+    """
+
+    acquired: int = 0
+    reused: int = 0
+    released: int = 0
+    discarded: int = 0
+
+    @property
+    def created(self) -> int:
+        """The number of buffers created by the pool."""
+        return self.acquired - self.reused
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of acquired buffers which were reused."""
+        return self.reused / self.acquired if self.acquired else 0.0
+
+
+class BufferPool:
+    """A bounded pool of buffers.
+
+    Buffers must be released once they are not used anymore, and must not
+    be used after they have been released. Buffers are not thread safe,
+    and a pool must be used by a single event loop.
+
+    Args:
+        size: The maximum number of buffers kept in the pool.
+        max_buffer_size: The maximum size in bytes of a buffer kept in the pool. Larger buffers are discarded when released, so that a single large payload does not hold memory forever.
+    """
+
+    def __init__(self, size: int = 64, max_buffer_size: int = 64 * 1024) -> None:
+        if size < 0:
+            raise ValueError("Buffer pool size must be positive")
+        self.size = size
+        self.max_buffer_size = max_buffer_size
+        self.stats = BufferPoolStats()
+        self._buffers: list[bytearray] = []
+
+    @property
+    def available(self) -> int:
+        """The number of buffers currently kept in the pool."""
+        return len(self._buffers)
+
+    def acquire(self) -> bytearray:
+        """Get a buffer from the pool, or a new buffer if the pool is empty.
+
+        The buffer may hold the data of a previous payload, and must be
+        written starting at offset 0.
+        """
+        self.stats.acquired += 1
+        if self._buffers:
+            self.stats.reused += 1
+            return self._buffers.pop()
+        return bytearray()
+
+    def release(self, buffer: bytearray) -> None:
+        """Return a buffer to the pool."""
+        if len(self._buffers) >= self.size or len(buffer) > self.max_buffer_size:
+            self.stats.discarded += 1
+            return
+        self.stats.released += 1
+        self._buffers.append(buffer)
+
+
+def write_into(buffer: bytearray, data: Buffer, offset: int = -1) -> None:
+    """Write data into a buffer.
+
+    Args:
+        buffer: The buffer to write into.
+        data: The data to write.
+        offset: The position at which data is written. The buffer is truncated to the end of the data. A negative offset appends data to the end of the buffer.
+    """
+    if offset < 0:
+        buffer += data
+    else:
+        buffer[offset:] = data
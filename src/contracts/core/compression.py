@@ -0,0 +1,81 @@
+"""The compression module defines how the payloads of a schema may be compressed.
+
+Compression is negotiated using headers:
+
+- The sender of a compressed payload sets the `Content-Encoding` header.
+- The sender of a request sets the `Accept-Encoding` header to the encodings
+  it is able to decode, so that replies are compressed only when the
+  requester can decompress them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Protocol
+
+from .negotiation import parse_accept
+from .types import Buffer
+
+CONTENT_ENCODING = "Content-Encoding"
+ACCEPT_ENCODING = "Accept-Encoding"
+
+
+class Compressor(Protocol):
+    """A compressor is a class providing methods to compress and decompress data."""
+
+    def compress(self, data: Buffer) -> bytes: ...
+
+    def decompress(self, data: Buffer) -> bytes: ...
+
+
+@dataclass(frozen=True)
+class Compression:
+    """Compression settings of a schema.
+
+    Args:
+        compressors: The compressors by content encoding, in order of preference.
+        threshold: The minimum size in bytes of a payload to compress. Smaller payloads are sent uncompressed.
+    """
+
+    compressors: Mapping[str, Compressor]
+    threshold: int = 1024
+
+    @property
+    def encodings(self) -> tuple[str, ...]:
+        """The content encodings, in order of preference."""
+        return tuple(self.compressors)
+
+    def accept_encoding(self) -> str:
+        """Get the value of the `Accept-Encoding` header."""
+        return ", ".join(self.compressors)
+
+    def negotiate(self, accept_encoding: str | None) -> str | None:
+        """Select the preferred encoding accepted by the peer.
+
+        Args:
+            accept_encoding: The value of the `Accept-Encoding` header sent by the peer.
+
+        Returns:
+            The selected encoding, or `None` if the peer does not accept any of the encodings.
+        """
+        accepted = set(parse_accept(accept_encoding))
+        if not accepted:
+            return None
+        for encoding in self.compressors:
+            if encoding in accepted or "*" in accepted:
+                return encoding
+        return None
+
+    def compress(self, data: Buffer, encoding: str | None) -> tuple[Buffer, str | None]:
+        """Compress data if it is large enough.
+
+        Args:
+            data: The payload to compress.
+            encoding: The encoding to use, or `None` to never compress.
+
+        Returns:
+            A tuple holding the payload and the encoding which was applied, if any.
+        """
+        if encoding is None or len(data) < self.threshold:
+            return data, None
+        return self.compressors[encoding].compress(data), encoding
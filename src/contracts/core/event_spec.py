@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import uuid
 from typing import Any, Generic, cast
 
 from .address import Address
 from .schema import Schema
 from .types import ParametersFactory, ParamsT, S, T
 
+# The header used by JetStream to discard duplicates, so that the same id
+# identifies an event in streams and in consumers
+MESSAGE_ID = "Nats-Msg-Id"
+
 
 class EventSpec(Generic[S, ParamsT, T]):
     """Event specification."""
@@ -50,6 +55,9 @@ class MessageToPublish(Generic[ParamsT, T]):
         self.payload = payload
         self.headers = headers or {}
         self._spec = spec
+        # Sending the same message again reuses its id, so that consumers
+        # can discard duplicates
+        self.id = self.headers.get(MESSAGE_ID) or uuid.uuid4().hex
 
     def __eq__(self, __value: object) -> bool:
         if not isinstance(__value, MessageToPublish):
@@ -0,0 +1,66 @@
+"""The negotiation module defines helpers used to negotiate the content type
+and the content encoding of payloads using headers.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+CONTENT_TYPE = "Content-Type"
+ACCEPT = "Accept"
+
+
+def parse_accept(value: str | None) -> list[str]:
+    """Parse the value of an `Accept` or `Accept-Encoding` header.
+
+    Args:
+        value: The header value, such as `"application/msgpack, application/json;q=0.5"`.
+
+    Returns:
+        The accepted values, sorted by decreasing quality. Values with a quality of zero are excluded.
+    """
+    if not value:
+        return []
+    weighted: list[tuple[float, int, str]] = []
+    for idx, token in enumerate(value.split(",")):
+        item, *params = token.split(";")
+        item = item.strip().lower()
+        if not item:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, raw = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(raw)
+                except ValueError:
+                    quality = 0
+        if quality > 0:
+            weighted.append((-quality, idx, item))
+    return [item for _, _, item in sorted(weighted)]
+
+
+def negotiate(offered: Iterable[str], accept: str | None) -> str | None:
+    """Select the value preferred by the peer among offered values.
+
+    Args:
+        offered: The values which can be produced, in order of preference.
+        accept: The value of the `Accept` header sent by the peer.
+
+    Returns:
+        The selected value, or `None` if the peer does not accept any of the offered values.
+    """
+    offered = list(offered)
+    for item in parse_accept(accept):
+        if item in ("*", "*/*"):
+            return offered[0] if offered else None
+        if item in offered:
+            return item
+    return None
+
+
+def media_type(content_type: str | None) -> str:
+    """Get the media type of a `Content-Type` header value, without parameters."""
+    if not content_type:
+        return ""
+    return content_type.partition(";")[0].strip().lower()
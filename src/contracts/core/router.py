@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from typing import Any, Generic, Iterable, Iterator, TypeVar
+
+from .address import MATCH_ALL, MATCH_ONE, SEPARATOR, Address
+
+V = TypeVar("V")
+
+# Marks the end of a subject filter in a trie of tokens
+_END = ""
+
+
+class Route(Generic[V]):
+    """A route registered in a router.
+
+    Args:
+        address: The address of the route.
+        target: The object returned when a subject matches the address.
+    """
+
+    __slots__ = ("address", "target", "extract")
+
+    def __init__(self, address: Address[Any], target: V) -> None:
+        self.address = address
+        self.target = target
+        self.extract = address.get_params_from_tokens
+
+    def __repr__(self) -> str:
+        return f"Route({self.address.subject}, target={self.target!r})"
+
+
+class _Node(Generic[V]):
+    __slots__ = ("children", "match_one", "match_all", "route")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node[V]] = {}
+        self.match_one: _Node[V] | None = None
+        self.match_all: Route[V] | None = None
+        self.route: Route[V] | None = None
+
+
+class Router(Generic[V]):
+    """A token trie used to dispatch subjects to addresses.
+
+    Each address is split into tokens and inserted into the trie.
+    Literal tokens are looked up by value, `{param}` placeholders are
+    stored as a single `*` branch, and a `{param...}` placeholder
+    terminates the branch.
+
+    When several addresses match a subject, the most specific address
+    wins: literal tokens are preferred over `{param}` placeholders,
+    which are preferred over `{param...}` placeholders.
+
+    This precedence only applies to routers used on their own.
+    Applications reject overlapping operation or consumer addresses when
+    they are bound to a server, so routers created by servers never hold
+    overlapping addresses.
+
+    Examples:
+
+        ```python
+        router = Router[str]()
+        router.add(Address("foo.{bar}", Params), "first")
+        router.add(Address("foo.baz", type(None)), "second")
+
+        route, params = router.match("foo.qux")
+        assert route.target == "first"
+        assert params == Params(bar="qux")
+        ```
+    """
+
+    def __init__(self, routes: Iterable[tuple[Address[Any], V]] = ()) -> None:
+        self._root: _Node[V] = _Node()
+        self._routes: list[Route[V]] = []
+        for address, target in routes:
+            self.add(address, target)
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def __iter__(self) -> Iterator[Route[V]]:
+        return iter(self._routes)
+
+    def add(self, address: Address[Any], target: V) -> Route[V]:
+        """Add a new route to the router.
+
+        Args:
+            address: The address to route.
+            target: The object returned when a subject matches the address.
+
+        Returns:
+            The route added to the router.
+
+        Raises:
+            ValueError: When another route is already registered for an equivalent address.
+        """
+        route = Route(address, target)
+        node = self._root
+        for token in address.placeholders.subject.split(SEPARATOR):
+            if token == MATCH_ALL:
+                if node.match_all is not None:
+                    raise _conflict(route, node.match_all)
+                node.match_all = route
+                break
+            if token == MATCH_ONE:
+                if node.match_one is None:
+                    node.match_one = _Node()
+                node = node.match_one
+                continue
+            try:
+                node = node.children[token]
+            except KeyError:
+                child: _Node[V] = _Node()
+                node.children[token] = child
+                node = child
+        else:
+            if node.route is not None:
+                raise _conflict(route, node.route)
+            node.route = route
+        self._routes.append(route)
+        return route
+
+    def match(self, subject: str) -> tuple[Route[V], Any] | None:
+        """Find the route matching a subject and extract its parameters.
+
+        Args:
+            subject: The subject to match.
+
+        Returns:
+            A tuple holding the route and the extracted parameters, or `None` when no route matches.
+        """
+        tokens = subject.split(SEPARATOR)
+        route = _lookup(self._root, tokens, 0, len(tokens))
+        if route is None:
+            return None
+        return route, route.extract(tokens)
+
+    def overlapping(self, address: Address[Any]) -> list[Route[V]]:
+        """Find all routes matching at least one subject matched by an address.
+
+        Args:
+            address: The address to check.
+
+        Returns:
+            The list of routes overlapping with the address.
+        """
+        found: list[Route[V]] = []
+        tokens = address.placeholders.subject.split(SEPARATOR)
+        _collect_overlaps(self._root, tokens, 0, len(tokens), found)
+        return found
+
+    def subscriptions(self, depth: int = 1) -> list[str]:
+        """Get a small set of subjects covering all routes.
+
+        Addresses are truncated after `depth` tokens and completed with
+        a `>` wildcard. Subjects which are already covered by another
+        subject are removed.
+
+        Args:
+            depth: The number of leading tokens kept for each address.
+
+        Returns:
+            A list of subjects which can be used to subscribe to all routes.
+        """
+        if depth < 1:
+            raise ValueError("Depth must be greater than or equal to 1")
+        candidates: dict[str, None] = {}
+        for route in self._routes:
+            tokens = route.address.placeholders.subject.split(SEPARATOR)
+            if len(tokens) > depth and MATCH_ALL not in tokens[:depth]:
+                tokens = tokens[:depth] + [MATCH_ALL]
+            candidates[SEPARATOR.join(tokens)] = None
+        # Candidates are stored in a token trie, so that each candidate is
+        # only compared with the candidates sharing its prefixes
+        trie: dict[str, Any] = {}
+        for candidate in candidates:
+            node = trie
+            for token in candidate.split(SEPARATOR):
+                node = node.setdefault(token, {})
+            node[_END] = None
+        return [
+            candidate
+            for candidate in candidates
+            if not _covered(trie, candidate.split(SEPARATOR), 0, True)
+        ]
+
+
+def _lookup(
+    node: _Node[V], tokens: list[str], index: int, size: int
+) -> Route[V] | None:
+    if index == size:
+        return node.route
+    child = node.children.get(tokens[index])
+    if child is not None:
+        route = _lookup(child, tokens, index + 1, size)
+        if route is not None:
+            return route
+    if node.match_one is not None:
+        route = _lookup(node.match_one, tokens, index + 1, size)
+        if route is not None:
+            return route
+    return node.match_all
+
+
+def _collect_overlaps(
+    node: _Node[V], tokens: list[str], index: int, size: int, found: list[Route[V]]
+) -> None:
+    if index == size:
+        if node.route is not None:
+            found.append(node.route)
+        return
+    token = tokens[index]
+    # A match-all route overlaps as soon as at least one token remains
+    if node.match_all is not None:
+        found.append(node.match_all)
+    if token == MATCH_ALL:
+        for child in node.children.values():
+            _collect_subtree(child, found)
+        if node.match_one is not None:
+            _collect_subtree(node.match_one, found)
+        return
+    if token == MATCH_ONE:
+        for child in node.children.values():
+            _collect_overlaps(child, tokens, index + 1, size, found)
+    else:
+        child = node.children.get(token)
+        if child is not None:
+            _collect_overlaps(child, tokens, index + 1, size, found)
+    if node.match_one is not None:
+        _collect_overlaps(node.match_one, tokens, index + 1, size, found)
+
+
+def _collect_subtree(node: _Node[V], found: list[Route[V]]) -> None:
+    if node.route is not None:
+        found.append(node.route)
+    if node.match_all is not None:
+        found.append(node.match_all)
+    for child in node.children.values():
+        _collect_subtree(child, found)
+    if node.match_one is not None:
+        _collect_subtree(node.match_one, found)
+
+
+def _covered(node: dict[str, Any], tokens: list[str], index: int, same: bool) -> bool:
+    """Check if another filter of a trie matches all subjects matched by tokens.
+
+    `same` is true while the walked branch is made of the tokens themselves.
+    """
+    size = len(tokens)
+    if index == size:
+        return not same and _END in node
+    token = tokens[index]
+    match_all = node.get(MATCH_ALL)
+    # A `>` wildcard matches all remaining tokens, unless it is the filter itself
+    if match_all is not None and _END in match_all:
+        if not (same and token == MATCH_ALL):
+            return True
+    if token == MATCH_ALL:
+        return False
+    child = node.get(token)
+    if child is not None and _covered(child, tokens, index + 1, same):
+        return True
+    if token == MATCH_ONE:
+        return False
+    match_one = node.get(MATCH_ONE)
+    return match_one is not None and _covered(match_one, tokens, index + 1, False)
+
+
+def _conflict(route: Route[Any], existing: Route[Any]) -> ValueError:
+    return ValueError(
+        f"Address {route.address.subject} conflicts with address {existing.address.subject}"
+    )
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Generic
+from dataclasses import dataclass, field
+from typing import Generic, Mapping
 
-from .types import T, TypeAdapter
+from .compression import Compression
+from .negotiation import media_type
+from .types import T, TypeAdapter, Validation, with_validation
 
 
 @dataclass
@@ -14,8 +16,48 @@ class Schema(Generic[T]):
         type: The type of the schema.
         content_type: The content type of the schema.
         type_adapter: The type adapter for the schema.
+        compression: The compression settings of the schema. Payloads are never compressed when `None`.
+        alternatives: The type adapters of additional content types supported by the schema.
     """
 
     type: type[T]
     content_type: str
     type_adapter: TypeAdapter[T]
+    compression: Compression | None = None
+    alternatives: Mapping[str, TypeAdapter[T]] = field(default_factory=dict)
+
+    @property
+    def content_types(self) -> tuple[str, ...]:
+        """All supported content types, starting with the default one."""
+        return (self.content_type, *self.alternatives)
+
+    def get_type_adapter(
+        self,
+        content_type: str | None,
+        validation: Validation | str = Validation.FULL,
+    ) -> TypeAdapter[T]:
+        """Get the type adapter for a content type.
+
+        The default type adapter is returned when content type is empty,
+        or when schema does not have alternative content types.
+
+        Args:
+            content_type: The value of the `Content-Type` header.
+            validation: The validation applied when decoding payloads.
+
+        Raises:
+            ValueError: When the content type is not supported.
+        """
+        adapter = self.type_adapter
+        if self.alternatives:
+            content_type = media_type(content_type)
+            if content_type and content_type != self.content_type:
+                try:
+                    adapter = self.alternatives[content_type]
+                except KeyError:
+                    raise ValueError(
+                        f"Unsupported content type: {content_type}"
+                    ) from None
+        if validation == Validation.FULL:
+            return adapter
+        return with_validation(adapter, validation)
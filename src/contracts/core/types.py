@@ -4,7 +4,9 @@ use in the contracts package.
 
 from __future__ import annotations
 
-from typing import Generic, Protocol, TypeVar
+from enum import Enum
+from collections.abc import AsyncIterable
+from typing import Generic, Protocol, TypeVar, Union
 
 from typing_extensions import ParamSpec
 
@@ -16,6 +18,9 @@ S = ParamSpec("S")
 
 P = TypeVar("P", covariant=True)
 
+Buffer = Union[bytes, bytearray, memoryview]
+"""A contiguous sequence of bytes, which can be sent without copy."""
+
 
 class ParametersFactory(Generic[S, P], Protocol):
     """A factory for creating parameters.
@@ -31,11 +36,103 @@ class ParametersFactory(Generic[S, P], Protocol):
 
 
 class TypeAdapter(Protocol, Generic[T]):
-    """A type adapter is a class providing methods to encode and decode data."""
+    """A type adapter is a class providing methods to encode and decode data.
+
+    Type adapters accept any buffer when decoding, and may return any
+    buffer when encoding, so that binary payloads are never copied.
+    """
+
+    def encode(self, message: T) -> Buffer: ...
+
+    def decode(self, data: Buffer) -> T: ...
+
+
+class BufferTypeAdapter(TypeAdapter[T], Protocol):
+    """A type adapter which can also encode data into an existing buffer.
+
+    Implementing `encode_into` is optional. It allows callers to reuse
+    the same buffer to encode several messages.
+    """
+
+    def encode_into(self, message: T, buffer: bytearray, offset: int = -1) -> None:
+        """Write the encoded message into the buffer.
+
+        The message is written at `offset`, and the buffer is truncated to
+        the end of the message. A negative offset appends the message to
+        the end of the buffer.
+        """
+        ...
+
+
+class Validation(str, Enum):
+    """The validation applied when decoding payloads.
+
+    - `full`: payloads are fully validated.
+    - `shallow`: the presence of required fields is checked, but values are not validated.
+    - `none`: values are constructed without any check.
+
+    Levels other than `full` must only be used for trusted payloads,
+    produced by an encoder sharing the same contract.
+    """
 
-    def encode(self, message: T) -> bytes: ...
+    FULL = "full"
+    SHALLOW = "shallow"
+    NONE = "none"
 
-    def decode(self, data: bytes) -> T: ...
+
+class ValidatingTypeAdapter(TypeAdapter[T], Protocol):
+    """A type adapter which supports several validation levels."""
+
+    def with_validation(self, validation: Validation) -> TypeAdapter[T]:
+        """Get a type adapter decoding data with the given validation level."""
+        ...
+
+
+def with_validation(
+    adapter: TypeAdapter[T], validation: Validation | str
+) -> TypeAdapter[T]:
+    """Get a variant of a type adapter using the given validation level.
+
+    Type adapters which do not support validation levels are returned as is.
+    This is the case of adapters validating data natively (pydantic v2,
+    msgspec), which are faster than constructing values without validation.
+    """
+    if validation == Validation.FULL:
+        return adapter
+    factory = getattr(adapter, "with_validation", None)
+    if factory is None:
+        return adapter
+    return factory(Validation(validation))
+
+
+class StreamTypeAdapter(TypeAdapter[T], Protocol):
+    """A type adapter which can also encode async iterables.
+
+    Implementing `encode_async` is optional. It is used by adapters of
+    streaming payloads, which consume items as they are produced.
+    """
+
+    async def encode_async(self, message: T) -> Buffer: ...
+
+
+async def encode_async(
+    adapter: TypeAdapter[T], message: T, buffer: bytearray | None = None
+) -> Buffer:
+    """Encode a message, awaiting the adapter when it supports async encoding.
+
+    When a buffer is given and the adapter supports `encode_into`, the
+    message is written into the buffer starting at offset 0, and the
+    buffer is returned.
+    """
+    if buffer is not None and not isinstance(message, AsyncIterable):
+        encode_into = getattr(adapter, "encode_into", None)
+        if encode_into is not None:
+            encode_into(message, buffer, 0)
+            return buffer
+    encode = getattr(adapter, "encode_async", None)
+    if encode is None:
+        return adapter.encode(message)
+    return await encode(message)
 
 
 class TypeAdapterFactory(Protocol):
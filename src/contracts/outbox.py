@@ -0,0 +1,446 @@
+"""The outbox module stores events on disk before they are published.
+
+An outbox appends encoded events to segment files, and publishes them in
+the background using a client adapter. Producers only wait for events to
+be written to disk, so that a slow or unreachable broker does not slow
+them down, unless the outbox is full.
+
+Appended events are synced to disk in groups: events appended while a
+sync is running, or within `fsync_interval` seconds of the first event
+waiting to be synced, are all synced at once. Events are published in order, at
+least once: events published right before the process stops may be
+published again when the outbox is opened again.
+
+Each record of a segment is made of:
+
+- a header: the length and the CRC32 checksum of the record body.
+- a body: the time the event was appended, the subject, the headers
+  encoded as JSON, and the payload.
+
+Records which are truncated or corrupted, for example because the process
+stopped while writing them, are discarded when the outbox is opened.
+
+Blocking file operations, such as syncing or opening segment files, run in
+the default executor of the event loop, so that they do not block other
+coroutines.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from .client import ClientAdapter
+from .core.types import Buffer
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">II")
+_BODY = struct.Struct(">dHI")
+_SEGMENT_SUFFIX = ".seg"
+_CURSOR = "cursor"
+
+
+@dataclass
+class OutboxStats:
+    """Statistics of an outbox.
+
+    Args:
+        appended: The number of events appended.
+        sent: The number of events published.
+        failures: The number of failed attempts to publish events. Events are published again after a delay.
+        syncs: The number of syncs to disk.
+    """
+
+    appended: int = 0
+    sent: int = 0
+    failures: int = 0
+    syncs: int = 0
+
+
+@dataclass
+class _Record:
+    timestamp: float
+    subject: str
+    headers: dict[str, str]
+    payload: bytes
+    segment: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+def _encode_record(
+    timestamp: float, subject: str, headers: dict[str, str], payload: Buffer
+) -> bytes:
+    encoded_subject = subject.encode("utf-8")
+    encoded_headers = json.dumps(headers, separators=(",", ":")).encode("utf-8")
+    body = b"".join(
+        (
+            _BODY.pack(timestamp, len(encoded_subject), len(encoded_headers)),
+            encoded_subject,
+            encoded_headers,
+            payload,
+        )
+    )
+    return _HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def _read_records(path: Path, segment: int, offset: int) -> tuple[list[_Record], int]:
+    """Read valid records of a segment starting at offset.
+
+    Returns the records and the end of the last valid record.
+    """
+    data = path.read_bytes()
+    records: list[_Record] = []
+    end = len(data)
+    while offset + _HEADER.size <= end:
+        length, checksum = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        body = data[start : start + length]
+        if len(body) != length or zlib.crc32(body) != checksum:
+            break
+        timestamp, subject_length, headers_length = _BODY.unpack_from(body)
+        idx = _BODY.size
+        subject = body[idx : idx + subject_length].decode("utf-8")
+        idx += subject_length
+        headers = json.loads(body[idx : idx + headers_length])
+        idx += headers_length
+        offset = start + length
+        records.append(
+            _Record(timestamp, subject, headers, body[idx:], segment, offset)
+        )
+    return records, offset
+
+
+def _replace_file(file: IO[bytes], path: Path) -> IO[bytes]:
+    """Sync and close a segment file, and open the next one."""
+    file.flush()
+    os.fsync(file.fileno())
+    file.close()
+    return open(path, "ab")
+
+
+class Outbox:
+    """A durable outbox of events.
+
+    The outbox must be opened before events are appended, using
+    `async with`, or `open` and `close`.
+
+    Args:
+        path: The directory holding segment files. It is created when it does not exist.
+        adapter: The client adapter used to publish events.
+        segment_size: The size in bytes above which a new segment file is started. Segments are deleted once all their events are published.
+        fsync_interval: The time in seconds to wait before syncing appended events to disk, so that more events are synced at once.
+        max_pending_bytes: The size of payloads waiting to be published above which appending events waits.
+        drain_batch_size: The maximum number of events published before waiting for their acknowledgements.
+        retry_delay: The initial delay in seconds before publishing events again after a failure. The delay doubles after each consecutive failure.
+        max_retry_delay: The maximum delay in seconds before publishing events again.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        adapter: ClientAdapter,
+        segment_size: int = 16 * 1024 * 1024,
+        fsync_interval: float = 0.0,
+        max_pending_bytes: int = 64 * 1024 * 1024,
+        drain_batch_size: int = 256,
+        retry_delay: float = 0.1,
+        max_retry_delay: float = 5.0,
+    ) -> None:
+        self.path = Path(path)
+        self.adapter = adapter
+        self.segment_size = segment_size
+        self.fsync_interval = fsync_interval
+        self.max_pending_bytes = max_pending_bytes
+        self.drain_batch_size = drain_batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.stats = OutboxStats()
+        self._pending: deque[_Record] = deque()
+        self._pending_bytes = 0
+        self._cursor = (0, 0)
+        self._cursor_dirty = False
+        self._segment = 0
+        self._offset = 0
+        self._file: IO[bytes] | None = None
+        self._unsynced: list[asyncio.Future[None]] = []
+        self._sync_task: asyncio.Task[None] | None = None
+        self._drain_task: asyncio.Task[None] | None = None
+        self._has_pending = asyncio.Event()
+        self._has_space = asyncio.Event()
+        # Held while the current segment file is synced or replaced
+        self._file_lock = asyncio.Lock()
+
+    @property
+    def depth(self) -> int:
+        """The number of events waiting to be published."""
+        return len(self._pending)
+
+    @property
+    def depth_bytes(self) -> int:
+        """The size of payloads waiting to be published."""
+        return self._pending_bytes
+
+    @property
+    def lag(self) -> float:
+        """The time in seconds since the oldest event waiting to be published was appended."""
+        if not self._pending:
+            return 0.0
+        return max(time.time() - self._pending[0].timestamp, 0.0)
+
+    async def open(self) -> None:
+        """Load events which were not published yet, and start publishing."""
+        if self._file is not None:
+            raise RuntimeError("Outbox is already open")
+        loop = asyncio.get_running_loop()
+        self._file = await loop.run_in_executor(None, self._load)
+        self._has_pending.set()
+        self._drain_task = asyncio.create_task(self._drain())
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Stop publishing and sync pending events to disk.
+
+        Events appended before closing are published for at most `timeout`
+        seconds. Remaining events are published once the outbox is opened
+        again.
+        """
+        if self._file is None:
+            return
+        if self._pending:
+            try:
+                await asyncio.wait_for(self._wait_empty(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+        if self._sync_task is not None:
+            await self._sync_task
+        await self._sync()
+        self._file.close()
+        self._file = None
+
+    async def append(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> asyncio.Future[None]:
+        """Append an event to the outbox.
+
+        Appending waits while the outbox is full. The payload is copied, so
+        the buffer can be reused as soon as this method returns.
+
+        Returns:
+            A future resolved once the event is synced to disk.
+        """
+        if self._file is None:
+            raise RuntimeError("Outbox is not open")
+        while self._pending_bytes >= self.max_pending_bytes:
+            self._has_space.clear()
+            await self._has_space.wait()
+        if self._offset >= self.segment_size:
+            await self._roll()
+            if self._file is None:
+                raise RuntimeError("Outbox is not open")
+        timestamp = time.time()
+        headers = dict(headers) if headers else {}
+        data = _encode_record(timestamp, subject, headers, payload)
+        self._file.write(data)
+        self._offset += len(data)
+        record = _Record(
+            timestamp, subject, headers, bytes(payload), self._segment, self._offset
+        )
+        self._pending.append(record)
+        self._pending_bytes += record.size
+        self._has_pending.set()
+        self.stats.appended += 1
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._unsynced.append(future)
+        self._schedule_sync()
+        return future
+
+    async def __aenter__(self) -> Outbox:
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        await self.close()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path / f"{segment:020d}{_SEGMENT_SUFFIX}"
+
+    def _segments(self) -> list[int]:
+        return sorted(
+            int(path.stem)
+            for path in self.path.iterdir()
+            if path.suffix == _SEGMENT_SUFFIX and path.stem.isdigit()
+        )
+
+    def _load(self) -> IO[bytes]:
+        """Recover the outbox directory, and open the last segment file."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._recover()
+        return open(self._segment_path(self._segment), "ab")
+
+    def _recover(self) -> None:
+        """Load records which were not published from segment files."""
+        cursor_path = self.path / _CURSOR
+        if cursor_path.exists():
+            segment, offset = map(int, cursor_path.read_text().split())
+        else:
+            segment, offset = 0, 0
+        segments = [idx for idx in self._segments() if idx >= segment]
+        for idx in segments:
+            start = offset if idx == segment else 0
+            path = self._segment_path(idx)
+            records, end = _read_records(path, idx, start)
+            if end != path.stat().st_size:
+                logger.warning("Discarding corrupted records of outbox %s", path)
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+            self._pending.extend(records)
+            self._pending_bytes += sum(record.size for record in records)
+        self._cursor = (segment, offset)
+        if segments:
+            self._segment = segments[-1]
+            self._offset = self._segment_path(self._segment).stat().st_size
+        else:
+            self._segment = segment
+            self._offset = 0
+
+    async def _roll(self) -> None:
+        """Start a new segment file.
+
+        The current segment is synced first, so that events of a segment
+        are never synced after events of the next one. Events appended
+        while the segment is rolled wait for the new segment.
+        """
+        async with self._file_lock:
+            # Another append rolled the segment while waiting for the lock
+            if self._file is None or self._offset < self.segment_size:
+                return
+            loop = asyncio.get_running_loop()
+            path = self._segment_path(self._segment + 1)
+            self._file = await loop.run_in_executor(
+                None, _replace_file, self._file, path
+            )
+            self._segment += 1
+            self._offset = 0
+
+    def _schedule_sync(self) -> None:
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def _sync_loop(self) -> None:
+        try:
+            while self._unsynced or self._cursor_dirty:
+                await asyncio.sleep(self.fsync_interval)
+                await self._sync()
+        except Exception:
+            logger.exception("Failed to sync outbox %s", self.path)
+        finally:
+            self._sync_task = None
+
+    async def _sync(self) -> None:
+        """Sync appended events and the publishing cursor to disk."""
+        futures, self._unsynced = self._unsynced, []
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._file_lock:
+                if self._file is not None:
+                    self._file.flush()
+                    await loop.run_in_executor(None, os.fsync, self._file.fileno())
+            if self._cursor_dirty:
+                self._cursor_dirty = False
+                await loop.run_in_executor(None, self._write_cursor, self._cursor)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        self.stats.syncs += 1
+        for future in futures:
+            if not future.done():
+                future.set_result(None)
+
+    def _write_cursor(self, cursor: tuple[int, int]) -> None:
+        segment, offset = cursor
+        path = self.path / _CURSOR
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            f.write(f"{segment} {offset}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        # Segments are deleted only once the cursor has moved past them
+        for idx in self._segments():
+            if idx >= segment:
+                break
+            self._segment_path(idx).unlink(missing_ok=True)
+
+    async def _wait_empty(self) -> None:
+        while self._pending:
+            self._has_space.clear()
+            await self._has_space.wait()
+
+    async def _drain(self) -> None:
+        """Publish events in order, waiting after failures."""
+        pending = self._pending
+        delay = self.retry_delay
+        while True:
+            if not pending:
+                self._has_pending.clear()
+                await self._has_pending.wait()
+                continue
+            batch = [
+                pending[idx] for idx in range(min(len(pending), self.drain_batch_size))
+            ]
+            futures: list[asyncio.Future[Any]] = []
+            try:
+                for record in batch:
+                    futures.append(
+                        await self.adapter.publish_event(
+                            record.subject, record.payload, record.headers
+                        )
+                    )
+            except Exception:
+                logger.exception("Failed to publish events from outbox")
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            sent = 0
+            for result in results:
+                if isinstance(result, BaseException):
+                    break
+                sent += 1
+            for _ in range(sent):
+                record = pending.popleft()
+                self._pending_bytes -= record.size
+                self._cursor = (record.segment, record.end)
+            if sent:
+                self.stats.sent += sent
+                self._cursor_dirty = True
+                self._schedule_sync()
+                self._has_space.set()
+            if sent < len(batch):
+                self.stats.failures += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+            else:
+                delay = self.retry_delay
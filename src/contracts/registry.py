@@ -0,0 +1,319 @@
+"""The registry module defines the compiled, read-only view of an application.
+
+A registry is created using `Application.compile()` and is shared by the
+server backends, the validation functions and the AsyncAPI builder, so
+that operations and consumers are inspected only once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+
+from .abc.consumer import BaseConsumer
+from .abc.operation import BaseOperation
+from .core.event_spec import EventSpec
+from .core.negotiation import CONTENT_TYPE, media_type
+from .core.operation_spec import OperationSpec
+from .core.schema import Schema
+from .core.types import TypeAdapter, Validation, with_validation
+
+
+@dataclass(frozen=True)
+class OperationEntry:
+    """A compiled operation.
+
+    Args:
+        cls: The operation class found in the application components.
+        spec: The operation specification.
+        request_adapter: The type adapter used to decode requests.
+        reply_adapter: The type adapter used to encode replies.
+        request_content_type: The content type of requests.
+        reply_content_type: The content type of replies.
+        reply_headers: The headers which must be set on each reply.
+    """
+
+    cls: type[BaseOperation[Any, Any, Any, Any]]
+    spec: OperationSpec[Any, Any, Any, Any]
+    request_adapter: TypeAdapter[Any]
+    reply_adapter: TypeAdapter[Any]
+    request_content_type: str
+    reply_content_type: str
+    reply_headers: Mapping[str, str]
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def subject(self) -> str:
+        return self.spec.address.subject
+
+    def get_request_adapter(
+        self,
+        content_type: str | None,
+        validation: Validation | str = Validation.FULL,
+    ) -> TypeAdapter[Any]:
+        """Get the type adapter decoding requests of a content type.
+
+        The compiled request adapter is used unless another supported
+        content type is requested.
+
+        Args:
+            content_type: The value of the `Content-Type` header.
+            validation: The validation applied when decoding payloads.
+
+        Raises:
+            ValueError: When the content type is not supported.
+        """
+        return _get_adapter(
+            self.spec.payload,
+            self.request_adapter,
+            self.request_content_type,
+            content_type,
+            validation,
+        )
+
+    def get_reply_adapter(self, content_type: str | None) -> TypeAdapter[Any]:
+        """Get the type adapter encoding replies of a content type.
+
+        Raises:
+            ValueError: When the content type is not supported.
+        """
+        return _get_adapter(
+            self.spec.reply_payload,
+            self.reply_adapter,
+            self.reply_content_type,
+            content_type,
+        )
+
+
+@dataclass(frozen=True)
+class ConsumerEntry:
+    """A compiled consumer.
+
+    Args:
+        cls: The consumer class found in the application components.
+        spec: The specification of the consumed event.
+        payload_adapter: The type adapter used to decode events.
+        content_type: The content type of events.
+    """
+
+    cls: type[BaseConsumer[Any, Any, Any]]
+    spec: EventSpec[Any, Any, Any]
+    payload_adapter: TypeAdapter[Any]
+    content_type: str
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def subject(self) -> str:
+        return self.spec.address.subject
+
+    def get_payload_adapter(
+        self,
+        content_type: str | None,
+        validation: Validation | str = Validation.FULL,
+    ) -> TypeAdapter[Any]:
+        """Get the type adapter decoding events of a content type.
+
+        The compiled payload adapter is used unless another supported
+        content type is received.
+
+        Args:
+            content_type: The value of the `Content-Type` header.
+            validation: The validation applied when decoding payloads.
+
+        Raises:
+            ValueError: When the content type is not supported.
+        """
+        return _get_adapter(
+            self.spec.payload,
+            self.payload_adapter,
+            self.content_type,
+            content_type,
+            validation,
+        )
+
+
+@dataclass(frozen=True)
+class Registry:
+    """A compiled application.
+
+    All lookups are performed in constant time.
+
+    Args:
+        operations: The compiled operations, in declaration order.
+        consumers: The compiled consumers, in declaration order.
+        fingerprint: A hash of the application definition. It changes whenever an address, a schema or a content type changes.
+    """
+
+    operations: tuple[OperationEntry, ...]
+    consumers: tuple[ConsumerEntry, ...]
+    fingerprint: str
+    by_name: Mapping[str, OperationEntry]
+    by_class: Mapping[type[Any], OperationEntry | ConsumerEntry]
+    by_event: Mapping[str, tuple[ConsumerEntry, ...]]
+    by_subject: Mapping[str, tuple[OperationEntry | ConsumerEntry, ...]]
+
+    @classmethod
+    def create(
+        cls,
+        components: Iterable[type[Any]],
+        metadata: Mapping[str, Any] | None = None,
+    ) -> Registry:
+        """Compile application components.
+
+        Args:
+            components: The application components.
+            metadata: Additional values included in the fingerprint.
+        """
+        operations: list[OperationEntry] = []
+        consumers: list[ConsumerEntry] = []
+        by_name: dict[str, OperationEntry] = {}
+        by_class: dict[type[Any], OperationEntry | ConsumerEntry] = {}
+        by_event: dict[str, list[ConsumerEntry]] = {}
+        by_subject: dict[str, list[OperationEntry | ConsumerEntry]] = {}
+        for component in components:
+            if issubclass(component, BaseOperation):
+                spec = component._spec  # pyright: ignore[reportPrivateUsage]
+                reply_content_type = spec.reply_payload.content_type
+                operation = OperationEntry(
+                    cls=component,
+                    spec=spec,
+                    request_adapter=spec.payload.type_adapter,
+                    reply_adapter=spec.reply_payload.type_adapter,
+                    request_content_type=spec.payload.content_type,
+                    reply_content_type=reply_content_type,
+                    reply_headers=MappingProxyType(
+                        {CONTENT_TYPE: reply_content_type} if reply_content_type else {}
+                    ),
+                )
+                operations.append(operation)
+                by_name[spec.name] = operation
+                by_class[component] = operation
+                by_subject.setdefault(spec.address.subject, []).append(operation)
+            elif issubclass(component, BaseConsumer):
+                event_spec = component._spec  # pyright: ignore[reportPrivateUsage]
+                consumer = ConsumerEntry(
+                    cls=component,
+                    spec=event_spec,
+                    payload_adapter=event_spec.payload.type_adapter,
+                    content_type=event_spec.payload.content_type,
+                )
+                consumers.append(consumer)
+                by_class[component] = consumer
+                by_event.setdefault(event_spec.name, []).append(consumer)
+                by_subject.setdefault(event_spec.address.subject, []).append(consumer)
+            else:
+                raise TypeError(f"Unsupported component: {component}")
+        return cls(
+            operations=tuple(operations),
+            consumers=tuple(consumers),
+            fingerprint=_fingerprint(operations, consumers, metadata or {}),
+            by_name=MappingProxyType(by_name),
+            by_class=MappingProxyType(by_class),
+            by_event=MappingProxyType(
+                {name: tuple(entries) for name, entries in by_event.items()}
+            ),
+            by_subject=MappingProxyType(
+                {subject: tuple(entries) for subject, entries in by_subject.items()}
+            ),
+        )
+
+    def lookup(self, component: object) -> OperationEntry | ConsumerEntry | None:
+        """Find the entry of a component implementation.
+
+        Args:
+            component: An instance of an application component, or a subclass of an application component.
+
+        Returns:
+            The entry of the component, or `None` if component is not part of the application.
+        """
+        typ = component if isinstance(component, type) else type(component)
+        by_class = self.by_class
+        for candidate in typ.__mro__:
+            entry = by_class.get(candidate)
+            if entry is not None:
+                return entry
+        return None
+
+    def operation(self, name: str) -> OperationEntry:
+        """Get an operation by name.
+
+        Raises:
+            KeyError: When operation does not exist.
+        """
+        return self.by_name[name]
+
+    def consumers_of(self, event: str) -> tuple[ConsumerEntry, ...]:
+        """Get the consumers of an event by event name."""
+        return self.by_event.get(event, ())
+
+
+def _get_adapter(
+    schema: Schema[Any],
+    adapter: TypeAdapter[Any],
+    default: str,
+    content_type: str | None,
+    validation: Validation | str = Validation.FULL,
+) -> TypeAdapter[Any]:
+    # Schemas without alternatives ignore the content type
+    if schema.alternatives and media_type(content_type) not in ("", default):
+        return schema.get_type_adapter(content_type, validation)
+    return with_validation(adapter, validation)
+
+
+def _describe_schema(schema: Schema[Any]) -> list[Any]:
+    description: list[Any] = [
+        (
+            f"{schema.type.__module__}.{schema.type.__qualname__}"
+            if isinstance(schema.type, type)
+            else repr(schema.type)
+        ),
+        schema.content_type,
+        type(schema.type_adapter).__qualname__,
+    ]
+    if schema.alternatives:
+        description.append(sorted(schema.alternatives))
+    if schema.compression:
+        description.append(
+            [list(schema.compression.encodings), schema.compression.threshold]
+        )
+    return description
+
+
+def _fingerprint(
+    operations: list[OperationEntry],
+    consumers: list[ConsumerEntry],
+    metadata: Mapping[str, Any],
+) -> str:
+    description = {
+        "metadata": dict(metadata),
+        "operations": [
+            [
+                entry.spec.name,
+                entry.spec.address.subject,
+                entry.spec.status_code,
+                _describe_schema(entry.spec.payload),
+                _describe_schema(entry.spec.reply_payload),
+            ]
+            for entry in operations
+        ],
+        "consumers": [
+            [
+                entry.cls.__qualname__,
+                entry.spec.name,
+                entry.spec.address.subject,
+                _describe_schema(entry.spec.payload),
+            ]
+            for entry in consumers
+        ],
+    }
+    data = json.dumps(description, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
@@ -35,6 +35,12 @@ class Server:
             raise RuntimeError("No app is bound to the server yet")
         return self._app
 
+    @property
+    def instance(self) -> Instance:
+        if self._instance is None:
+            raise RuntimeError("Server is not started yet")
+        return self._instance
+
     def bind(
         self,
         app: Application,
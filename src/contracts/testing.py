@@ -17,7 +17,7 @@ from .abc.message import Message
 from .abc.operation import BaseOperation, RequestToSend
 from .abc.request import Request
 from .client import Client, ClientAdapter, RawOperationError, RawReply, Reply
-from .core.types import ParamsT, R, S, T
+from .core.types import Buffer, ParamsT, R, S, T
 
 
 class NoResponseError(Exception):
@@ -40,6 +40,7 @@ class StubRequest(Request[BaseOperation[Any, ParamsT, T, R]]):
     ) -> None:
         self._params = request.params
         self._data = request.payload
+        self._type_adapter = request._spec.payload.type_adapter
         self._headers = request.headers or {}
         self._response_headers: dict[str, str] = ...  # type: ignore[reportAttributeAccessIssue]
         self._response_data: R = ...  # type: ignore[reportAttributeAccessIssue]
@@ -52,6 +53,9 @@ class StubRequest(Request[BaseOperation[Any, ParamsT, T, R]]):
     def payload(self) -> T:
         return self._data
 
+    def raw_payload(self) -> Buffer:
+        return self._type_adapter.encode(self._data)
+
     def headers(self) -> dict[str, str]:
         return self._headers
 
@@ -161,15 +165,15 @@ class StubAdapter(ClientAdapter):
         reply: RawReply | None = None,
         error: RawOperationError | None = None,
     ) -> None:
-        self.requests_sent: list[tuple[str, bytes, dict[str, str] | None, float]] = []
-        self.messages_sent: list[tuple[str, bytes, dict[str, str] | None]] = []
+        self.requests_sent: list[tuple[str, Buffer, dict[str, str] | None, float]] = []
+        self.messages_sent: list[tuple[str, Buffer, dict[str, str] | None]] = []
         self.reply = reply
         self.error = error
 
     async def send_request(
         self,
         subject: str,
-        payload: bytes,
+        payload: Buffer,
         headers: dict[str, str] | None = None,
         timeout: float = 1,
     ) -> RawReply:
@@ -183,7 +187,7 @@ class StubAdapter(ClientAdapter):
     async def send_event(
         self,
         subject: str,
-        payload: bytes,
+        payload: Buffer,
         headers: dict[str, str] | None = None,
     ) -> None:
         self.messages_sent.append((subject, payload, headers))
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, Callable
+
+import pytest
+from nats.aio.msg import Msg
+from nats.errors import TimeoutError as NatsTimeoutError
+from nats.js.api import Header, PubAck
+from nats.js.errors import TooManyStalledMsgsError
+
+from contracts import Application
+from contracts.abc.operation import BaseOperation
+from contracts.backends.server.micro.server import _create_operation_handler
+from contracts.client import Client, ClientAdapter, RawOperationError, RawReply
+from contracts.core.buffers import BufferPool
+from contracts.core.types import Buffer
+
+
+class LoopbackRequest:
+    """A micro request handled in process."""
+
+    def __init__(self, subject: str, data: Buffer, headers: dict[str, str]) -> None:
+        self._subject = subject
+        self._data = data
+        self._headers = headers
+        self.reply: RawReply | RawOperationError | None = None
+
+    def subject(self) -> str:
+        return self._subject
+
+    def data(self) -> Buffer:
+        return self._data
+
+    def headers(self) -> dict[str, str]:
+        return self._headers
+
+    async def respond_success(
+        self, code: int, data: Buffer, headers: dict[str, str] | None = None
+    ) -> None:
+        self.reply = RawReply(bytes(data), headers or {})
+
+    async def respond_error(
+        self,
+        code: int,
+        description: str,
+        data: Buffer | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.reply = RawOperationError(code, description, headers, data or b"")
+
+
+class LoopbackAdapter(ClientAdapter):
+    """A client adapter sending requests to operation handlers in process.
+
+    Requests sent and replies received are recorded.
+    """
+
+    def __init__(self, handler: Callable[[Any], Any]) -> None:
+        self.handler = handler
+        self.requests: list[LoopbackRequest] = []
+
+    async def send_request(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+        timeout: float = 1,
+    ) -> RawReply:
+        request = LoopbackRequest(subject, bytes(payload), dict(headers or {}))
+        self.requests.append(request)
+        await self.handler(request)
+        reply = request.reply
+        if isinstance(reply, RawOperationError):
+            raise reply
+        assert reply is not None, "Operation did not reply"
+        return reply
+
+    async def send_event(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+
+@pytest.fixture
+def loopback() -> Callable[..., tuple[Client, LoopbackAdapter]]:
+    """Create a client sending requests to an operation implementation.
+
+    Replies are encoded into buffers of `server_buffers` when given, and
+    other options are passed to the client.
+    """
+
+    def create(
+        operation: BaseOperation[Any, Any, Any, Any],
+        server_buffers: BufferPool | None = None,
+        **options: Any,
+    ) -> tuple[Client, LoopbackAdapter]:
+        app = Application(
+            id="test", name="test", version="0.0.1", components=[operation.__class__]
+        )
+        entry = app.compile().lookup(operation)
+        handler = _create_operation_handler(operation, entry, buffers=server_buffers)  # type: ignore[arg-type]
+        adapter = LoopbackAdapter(handler)
+        return Client(adapter, **options), adapter
+
+    return create
+
+
+class FakeDurable:
+    """A durable pull consumer of a fake JetStream stream."""
+
+    def __init__(self, name: str, subject: str) -> None:
+        self.name = name
+        self.subject = subject
+        self.pending: deque[int] = deque()
+        self.available = asyncio.Event()
+        self.deliveries: dict[int, int] = {}
+        self.delivered = 0
+        self.settled: dict[int, list[str]] = {}
+        self.fetches: list[int] = []
+
+    def enqueue(self, seq: int) -> None:
+        self.pending.append(seq)
+        self.available.set()
+
+    def acked(self) -> list[int]:
+        """Get the sequences of acknowledged messages."""
+        return [seq for seq, acks in self.settled.items() if acks[-1:] == ["ack"]]
+
+
+class FakePullSubscription:
+    def __init__(self, nats: FakeNats, durable: FakeDurable) -> None:
+        self._nats = nats
+        self._durable = durable
+        self.unsubscribed = False
+
+    async def fetch(self, batch: int = 1, timeout: float | None = 5) -> list[Msg]:
+        durable = self._durable
+        durable.fetches.append(batch)
+        if not durable.pending:
+            durable.available.clear()
+            try:
+                await asyncio.wait_for(durable.available.wait(), timeout)
+            except asyncio.TimeoutError:
+                raise NatsTimeoutError from None
+        msgs = []
+        while durable.pending and len(msgs) < batch:
+            msgs.append(self._nats._deliver(durable, durable.pending.popleft()))
+        return msgs
+
+    async def unsubscribe(self) -> None:
+        self.unsubscribed = True
+
+
+class FakeJetStream:
+    def __init__(self, nats: FakeNats, publish_async_max_pending: int = 4000) -> None:
+        self._nats = nats
+        self._slots = asyncio.Semaphore(publish_async_max_pending)
+
+    async def publish_async(
+        self,
+        subject: str,
+        payload: bytes = b"",
+        wait_stall: float | None = None,
+        stream: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> asyncio.Future[PubAck]:
+        """Store a message, acknowledging it unless acks are lost.
+
+        Each pending acknowledgement holds a slot until it is done.
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), wait_stall)
+        except asyncio.TimeoutError:
+            raise TooManyStalledMsgsError from None
+        nats = self._nats
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[PubAck] = loop.create_future()
+        future.add_done_callback(lambda _: self._slots.release())
+        nats.attempts.append(future)
+        ack = nats.store(subject, bytes(payload), headers)
+        if nats.lost_acks:
+            nats.lost_acks -= 1
+        else:
+            loop.call_later(
+                nats.ack_delay, lambda: future.done() or future.set_result(ack)
+            )
+        return future
+
+    async def pull_subscribe(
+        self, subject: str, durable: str, **kwargs: Any
+    ) -> FakePullSubscription:
+        return FakePullSubscription(self._nats, self._nats.durable(durable, subject))
+
+
+class FakeNats:
+    """A fake NATS client backed by a single in-memory JetStream stream.
+
+    Durable consumers receive all messages of the stream matching their
+    subject, and keep their state once their subscriptions are stopped.
+    Acknowledgements are applied when they are published: naks redeliver
+    messages, after their delay when given. Messages published to JetStream
+    are deduplicated by id, and their acknowledgements can be delayed or
+    lost.
+    """
+
+    def __init__(self) -> None:
+        self.messages: list[tuple[str, bytes, dict[str, str] | None]] = []
+        self.durables: dict[str, FakeDurable] = {}
+        self.published: list[tuple[str, bytes]] = []
+        self.flushes = 0
+        self.flush_error: Exception | None = None
+        self.attempts: list[asyncio.Future[PubAck]] = []
+        self.lost_acks = 0
+        self.ack_delay = 0.0
+        self._replies: dict[str, tuple[FakeDurable, int]] = {}
+        self._ids: dict[str, int] = {}
+
+    def jetstream(self, **kwargs: Any) -> FakeJetStream:
+        return FakeJetStream(self, **kwargs)
+
+    def add(
+        self, subject: str, data: bytes, headers: dict[str, str] | None = None
+    ) -> int:
+        """Add a message to the stream, returning its sequence."""
+        self.messages.append((subject, data, headers))
+        seq = len(self.messages)
+        for durable in self.durables.values():
+            if _matches(durable.subject, subject):
+                durable.enqueue(seq)
+        return seq
+
+    def store(
+        self, subject: str, data: bytes, headers: dict[str, str] | None = None
+    ) -> PubAck:
+        """Add a message published to JetStream, discarding duplicate ids."""
+        msg_id = (headers or {}).get(Header.MSG_ID.value)
+        if msg_id in self._ids:
+            return PubAck(stream="stream", seq=self._ids[msg_id], duplicate=True)
+        seq = self.add(subject, data, headers)
+        if msg_id is not None:
+            self._ids[msg_id] = seq
+        return PubAck(stream="stream", seq=seq)
+
+    def durable(self, name: str, subject: str) -> FakeDurable:
+        durable = self.durables.get(name)
+        if durable is None:
+            durable = self.durables[name] = FakeDurable(name, subject)
+            for seq, (msg_subject, _, _) in enumerate(self.messages, 1):
+                if _matches(subject, msg_subject):
+                    durable.enqueue(seq)
+        return durable
+
+    async def publish(
+        self, subject: str, payload: bytes = b"", headers: Any = None
+    ) -> None:
+        self.published.append((subject, bytes(payload)))
+        target = self._replies.get(subject)
+        if target is None:
+            return
+        durable, seq = target
+        if payload.startswith(Msg.Ack.Nak):
+            durable.settled[seq].append("nak")
+            options = payload[len(Msg.Ack.Nak) :].strip()
+            delay = json.loads(options)["delay"] / 10**9 if options else 0
+            asyncio.get_running_loop().call_later(delay, durable.enqueue, seq)
+        elif payload.startswith(Msg.Ack.Term):
+            durable.settled[seq].append("term")
+        else:
+            durable.settled[seq].append("ack")
+
+    async def flush(self, timeout: float = 2) -> None:
+        if self.flush_error is not None:
+            raise self.flush_error
+        self.flushes += 1
+
+    async def wait_until(
+        self, predicate: Callable[[], bool], timeout: float = 2
+    ) -> None:
+        """Wait until a condition is true."""
+
+        async def poll() -> None:
+            while not predicate():
+                await asyncio.sleep(0.001)
+
+        await asyncio.wait_for(poll(), timeout)
+
+    def _deliver(self, durable: FakeDurable, seq: int) -> Msg:
+        subject, data, headers = self.messages[seq - 1]
+        delivery = durable.deliveries[seq] = durable.deliveries.get(seq, 0) + 1
+        durable.settled.setdefault(seq, [])
+        durable.delivered += 1
+        reply = (
+            f"$JS.ACK.stream.{durable.name}.{delivery}.{seq}.{durable.delivered}"
+            f".0.{len(durable.pending)}"
+        )
+        self._replies[reply] = (durable, seq)
+        return Msg(self, subject, reply, data, headers)  # type: ignore[arg-type]
+
+
+def _matches(pattern: str, subject: str) -> bool:
+    tokens = subject.split(".")
+    for idx, token in enumerate(pattern.split(".")):
+        if token == ">":
+            return len(tokens) > idx
+        if idx >= len(tokens) or token not in ("*", tokens[idx]):
+            return False
+    return len(tokens) == len(pattern.split("."))
+
+
+@pytest.fixture
+def nats() -> FakeNats:
+    """Create a fake NATS client with JetStream."""
+    return FakeNats()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+from nats.aio.msg import Msg
+
+from contracts import Application, consumer, event
+from contracts.backends.server.micro.acks import AckBuffer, nak_payload
+from contracts.backends.server.micro.jetstream import ConsumerOptions, PullConsumer
+
+
+def message(nats: Any, idx: int) -> Msg:
+    return Msg(nats, "devices.a.readings", f"$JS.ACK.stream.test.1.{idx}.{idx}.0.0")
+
+
+def test_nak_payload() -> None:
+    assert nak_payload() == b"-NAK"
+    assert nak_payload(0) == b"-NAK"
+    assert nak_payload(1.5) == b'-NAK {"delay": 1500000000}'
+    assert nak_payload(1.5) is nak_payload(1.5)
+
+
+def test_invalid_max_pending(nats: Any) -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        AckBuffer(nats, max_pending=0)
+
+
+@pytest.mark.asyncio
+async def test_flush_when_full(nats: Any) -> None:
+    acks = AckBuffer(nats, max_pending=3, flush_interval=10)
+    for idx in range(1, 4):
+        acks.ack(message(nats, idx))
+    assert acks.stats.queued == 3
+    # The flush is sent without waiting for the interval
+    await asyncio.sleep(0)
+    assert [reply for reply, _ in nats.published] == [
+        message(nats, idx).reply for idx in range(1, 4)
+    ]
+    assert nats.flushes == 1
+    acks.ack(message(nats, 4))
+    await asyncio.sleep(0)
+    assert len(nats.published) == 3
+    await acks.close()
+    stats = acks.stats
+    assert len(nats.published) == 4
+    assert (stats.sent, stats.flushes, stats.pending, stats.max_pending) == (4, 2, 0, 3)
+    assert stats.batch_size == 2
+    assert stats.failed == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_after_interval(nats: Any) -> None:
+    acks = AckBuffer(nats, max_pending=100, flush_interval=0.01)
+    acks.ack(message(nats, 1))
+    acks.ack(message(nats, 2))
+    await asyncio.sleep(0)
+    assert nats.published == []
+    await nats.wait_until(lambda: acks.stats.sent == 2)
+    assert nats.flushes == 1
+    assert acks.stats.max_latency >= 0.01
+    assert acks.stats.mean_latency >= 0.01
+    await acks.close()
+    assert nats.flushes == 1
+
+
+@pytest.mark.asyncio
+async def test_nak_and_term_payloads(nats: Any) -> None:
+    acks = AckBuffer(nats)
+    acks.ack(message(nats, 1))
+    acks.nak(message(nats, 2))
+    acks.nak(message(nats, 3), delay=2)
+    acks.term(message(nats, 4))
+    await acks.close()
+    assert [payload for _, payload in nats.published] == [
+        b"+ACK",
+        b"-NAK",
+        b'-NAK {"delay": 2000000000}',
+        b"+TERM",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_only_jetstream_messages_are_queued(nats: Any) -> None:
+    acks = AckBuffer(nats)
+    with pytest.raises(ValueError, match="not a JetStream message"):
+        acks.ack(Msg(nats, "devices.a.readings"))
+    assert acks.stats.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush(nats: Any) -> None:
+    nats.flush_error = ConnectionError("Connection closed")
+    acks = AckBuffer(nats, max_pending=2)
+    acks.ack(message(nats, 1))
+    acks.ack(message(nats, 2))
+    await acks.close()
+    stats = acks.stats
+    assert (stats.failed, stats.sent, stats.flushes, stats.pending) == (2, 0, 0, 0)
+    assert stats.mean_latency == 0
+    assert stats.batch_size == 0
+
+
+@dataclass
+class Reading:
+    value: int
+
+
+@event(address="readings", parameters=type(None), payload_schema=Reading)
+class ReadingReceived:
+    pass
+
+
+@consumer(source=ReadingReceived)
+class ReadingConsumer:
+    pass
+
+
+class SettlingConsumer(ReadingConsumer):
+    async def handle(self, event: Any) -> None:
+        # Events which are not settled are acknowledged
+        if event.payload().value < 0:
+            await event.term()
+
+
+@pytest.mark.asyncio
+async def test_consumer_flushes_acknowledgements_in_batches(nats: Any) -> None:
+    entry = (
+        Application(
+            id="test", name="test", version="0.0.1", components=[ReadingConsumer]
+        )
+        .compile()
+        .consumers[0]
+    )
+    options = ConsumerOptions(
+        fetch_timeout=0.05, ack_batch_size=10, ack_flush_interval=0.01
+    )
+    runner = PullConsumer(nats, SettlingConsumer(), entry, "test_durable", options)
+    for value in range(0, 30, 3):
+        nats.add("readings", json.dumps({"value": value}).encode())
+    term = nats.add("readings", json.dumps({"value": -1}).encode())
+    await runner.start()
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: len(durable.acked()) == 10)
+    await nats.wait_until(lambda: durable.settled.get(term) == ["term"])
+    await runner.stop()
+    stats = runner.ack_stats
+    assert stats is not None
+    assert stats.sent == 11
+    assert stats.pending == 0
+    assert nats.flushes < stats.sent
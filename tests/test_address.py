@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, List, Optional
+from uuid import UUID
+
+import pydantic
+import pytest
+
+from contracts.core.address import Address
+
+
+@dataclass
+class Params:
+    site: str
+    device: str
+
+
+@dataclass
+class ReversedParams:
+    # Fields are declared in another order than placeholders
+    device: str
+    site: str
+
+
+PARAMS_TYPES: list[type] = [Params, ReversedParams]
+
+if sys.version_info >= (3, 10):
+
+    @dataclass
+    class KeywordParams:
+        site: str
+        device: str = field(kw_only=True)
+
+    PARAMS_TYPES.append(KeywordParams)
+
+
+@dataclass
+class RemainingParams:
+    site: str
+    rest: List[str]
+
+
+class ModelParams(pydantic.BaseModel):
+    site: str
+    device: str
+
+
+PARAMS_TYPES.append(ModelParams)
+
+
+def test_static_address() -> None:
+    address = Address("sensors.all", type(None))
+    assert address.get_params("sensors.all") is None
+    assert address.get_subject() == "sensors.all"
+    assert address.get_subject(None) == "sensors.all"
+
+
+@pytest.mark.parametrize("typ", PARAMS_TYPES)
+def test_extract_and_build(typ: type) -> None:
+    address = Address("sensors.{site}.{device}.data", typ)
+    params = address.get_params("sensors.kitchen.thermometer.data")
+    assert isinstance(params, typ)
+    assert params.site == "kitchen"
+    assert params.device == "thermometer"
+    assert (
+        address.get_params_from_tokens(["sensors", "kitchen", "thermometer", "data"])
+        == params
+    )
+    assert address.get_subject(params) == "sensors.kitchen.thermometer.data"
+
+
+def test_subject_without_parameters_uses_wildcards() -> None:
+    address = Address("sensors.{site}.{device}.data", Params)
+    assert address.get_subject() == "sensors.*.*.data"
+
+
+def test_remaining_tokens() -> None:
+    address = Address("sensors.{site}.{rest...}", RemainingParams)
+    params = address.get_params("sensors.kitchen.a.b.c")
+    assert params == RemainingParams("kitchen", ["a", "b", "c"])
+    assert address.get_subject(params) == "sensors.kitchen.a.b.c"
+    assert address.get_subject() == "sensors.*.>"
+
+
+def test_braces_in_literal_tokens_are_not_formatted() -> None:
+    @dataclass
+    class Single:
+        device: str
+
+    address = Address("sensors.{device}", Single)
+    assert address.get_subject(Single("{x}")) == "sensors.{x}"
+
+
+@pytest.mark.parametrize(
+    "subject, error",
+    [
+        ("sensors.{site}", "Missing parameter"),
+        ("sensors.{site}.{device}.{other}", "Unknown parameter"),
+        ("sensors.x{site}.{device}", "whole token"),
+        ("sensors.{site...}.{device}", "last token"),
+    ],
+)
+def test_invalid_addresses(subject: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        Address(subject, Params)
+
+
+class Room(Enum):
+    KITCHEN = "kitchen"
+    GARAGE = "garage"
+
+
+@dataclass
+class TypedParams:
+    floor: int
+    room: Room
+    device: UUID
+    enabled: bool
+    path: List[int]
+
+
+class TypedModel(pydantic.BaseModel):
+    floor: int
+    room: Room
+    device: UUID
+    enabled: bool
+    path: List[int]
+
+
+DEVICE = UUID("12345678-1234-5678-1234-567812345678")
+
+
+@pytest.mark.parametrize("typ", [TypedParams, TypedModel])
+def test_parameters_are_converted(typ: type) -> None:
+    address = Address("{floor}.{room}.{device}.{enabled}.{path...}", typ)
+    subject = f"2.kitchen.{DEVICE}.true.1.2.3"
+    params = address.get_params(subject)
+    assert params.floor == 2
+    assert params.room is Room.KITCHEN
+    assert params.device == DEVICE
+    assert params.enabled is True
+    assert params.path == [1, 2, 3]
+    assert address.get_subject(params) == subject
+
+
+@pytest.mark.parametrize(
+    "subject",
+    [
+        f"x.kitchen.{DEVICE}.true.1",
+        f"2.attic.{DEVICE}.true.1",
+        "2.kitchen.not-a-uuid.true.1",
+        f"2.kitchen.{DEVICE}.maybe.1",
+        f"2.kitchen.{DEVICE}.true.x",
+    ],
+)
+def test_invalid_tokens_are_rejected(subject: str) -> None:
+    address = Address("{floor}.{room}.{device}.{enabled}.{path...}", TypedParams)
+    with pytest.raises(ValueError):
+        address.get_params(subject)
+
+
+@dataclass
+class OptionalParams:
+    site: Optional[str]
+    floor: Optional[int] = None
+
+
+@dataclass
+class OptionalSingle:
+    site: Optional[str]
+
+
+@dataclass
+class OptionalRemaining:
+    rest: Optional[List[str]]
+
+
+def test_optional_parameters_are_converted() -> None:
+    address = Address("{site}.{floor}", OptionalParams)
+    assert address.get_params("kitchen.2") == OptionalParams("kitchen", 2)
+
+
+@pytest.mark.parametrize(
+    "address, params",
+    [
+        (Address("{site}.{floor}", OptionalParams), OptionalParams("kitchen")),
+        (Address("{site}.{floor}", OptionalParams), OptionalParams(None, 1)),
+        (Address("sensors.{site}", OptionalSingle), OptionalSingle(None)),
+        (Address("sensors.{rest...}", OptionalRemaining), OptionalRemaining(None)),
+        (
+            Address("sensors.{rest...}", OptionalRemaining),
+            OptionalRemaining(["a", None]),  # type: ignore[list-item]
+        ),
+    ],
+)
+def test_none_parameters_are_rejected(address: Address[Any], params: Any) -> None:
+    with pytest.raises(ValueError, match="cannot be None"):
+        address.get_subject(params)
+
+
+def test_empty_remaining_parameters_are_rejected() -> None:
+    address = Address("sensors.{rest...}", OptionalRemaining)
+    with pytest.raises(ValueError, match="'rest' cannot be empty"):
+        address.get_subject(OptionalRemaining([]))
+    assert address.get_subject(OptionalRemaining(["a"])) == "sensors.a"
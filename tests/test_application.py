@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List
+
+import pytest
+
+from contracts import Application, consumer, event, operation
+from contracts.application import (
+    AddressIndex,
+    validate_consumers,
+    validate_operations,
+)
+from contracts.core.address import Address
+
+
+@dataclass
+class DeviceParams:
+    device: str
+
+
+@dataclass
+class RemainingParams:
+    rest: List[str]
+
+
+def test_index_without_overlap() -> None:
+    index = AddressIndex()
+    index.add(Address("sensors.{device}", DeviceParams), "first")
+    index.add(Address("alarms.{device}", DeviceParams), "second")
+    index.add(Address("sensors.{device}.data", DeviceParams), "third")
+    assert index.overlaps == []
+    index.raise_on_overlap()
+
+
+def test_index_detects_literal_and_placeholder_overlap() -> None:
+    index = AddressIndex()
+    index.add(Address("sensors.{device}", DeviceParams), "first")
+    index.add(Address("sensors.kitchen", type(None)), "second")
+    assert index.overlaps == [
+        ("second", "sensors.kitchen", "first", "sensors.{device}")
+    ]
+
+
+def test_index_detects_equivalent_addresses() -> None:
+    index = AddressIndex()
+    index.add(Address("sensors.{device}", DeviceParams), "first")
+    index.add(Address("sensors.{device}", DeviceParams), "second")
+    index.add(Address("sensors.{device}", DeviceParams), "third")
+    assert [(name, other) for name, _, other, _ in index.overlaps] == [
+        ("second", "first"),
+        ("third", "first"),
+        ("third", "second"),
+    ]
+
+
+def test_index_detects_match_all_overlap() -> None:
+    index = AddressIndex()
+    index.add(Address("sensors.kitchen.data", type(None)), "first")
+    index.add(Address("sensors.{rest...}", RemainingParams), "second")
+    assert [(name, other) for name, _, other, _ in index.overlaps] == [
+        ("second", "first")
+    ]
+
+
+def test_raise_on_overlap_reports_all_overlaps() -> None:
+    index = AddressIndex()
+    index.add(Address("sensors.{device}", DeviceParams), "first")
+    index.add(Address("sensors.kitchen", type(None)), "second")
+    index.add(Address("sensors.garage", type(None)), "third")
+    with pytest.raises(ValueError) as exc_info:
+        index.raise_on_overlap()
+    lines = str(exc_info.value).splitlines()
+    assert lines == [
+        "Address 'sensors.kitchen' of second overlaps with address 'sensors.{device}' of first",
+        "Address 'sensors.garage' of third overlaps with address 'sensors.{device}' of first",
+    ]
+
+
+@operation(address="devices.{device}.status", parameters=DeviceParams)
+class GetStatus:
+    """Get the status of a device."""
+
+
+@operation(address="devices.kitchen.status")
+class GetKitchenStatus:
+    """Get the status of the kitchen."""
+
+
+@operation(address="devices.{device}.reset", parameters=DeviceParams)
+class Reset:
+    """Reset a device."""
+
+
+class GetStatusImpl(GetStatus):
+    async def handle(self, request: Any) -> None:
+        await request.respond()
+
+
+class GetKitchenStatusImpl(GetKitchenStatus):
+    async def handle(self, request: Any) -> None:
+        await request.respond()
+
+
+class ResetImpl(Reset):
+    async def handle(self, request: Any) -> None:
+        await request.respond()
+
+
+@event(address="devices.{device}.events", parameters=DeviceParams, payload_schema=str)
+class DeviceEvent:
+    pass
+
+
+@consumer(source=DeviceEvent)
+class DeviceConsumer:
+    pass
+
+
+class DeviceConsumerImpl(DeviceConsumer):
+    async def handle(self, event: Any) -> None:
+        await event.ack()
+
+
+def test_validate_operations() -> None:
+    app = Application(
+        id="test",
+        name="test",
+        version="0.0.1",
+        components=[GetStatus, Reset, DeviceConsumer],
+    )
+    operations = validate_operations(
+        app, [GetStatusImpl(), ResetImpl(), DeviceConsumerImpl()]
+    )
+    assert [type(op) for op in operations] == [GetStatusImpl, ResetImpl]
+    consumers = validate_consumers(
+        app, [GetStatusImpl(), ResetImpl(), DeviceConsumerImpl()]
+    )
+    assert [type(con) for con in consumers] == [DeviceConsumerImpl]
+
+
+def test_validate_operations_rejects_overlaps() -> None:
+    app = Application(
+        id="test",
+        name="test",
+        version="0.0.1",
+        components=[GetStatus, GetKitchenStatus],
+    )
+    with pytest.raises(ValueError, match="overlaps"):
+        validate_operations(app, [GetStatusImpl(), GetKitchenStatusImpl()])
+
+
+def test_validate_operations_rejects_unknown_operations() -> None:
+    app = Application(id="test", name="test", version="0.0.1", components=[GetStatus])
+    with pytest.raises(ValueError, match="not supported"):
+        validate_operations(app, [ResetImpl()])
+    with pytest.raises(ValueError, match="not supported"):
+        validate_consumers(app, [DeviceConsumerImpl()])
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Iterable, List, Optional
+from uuid import UUID
+
+import pydantic
+import pytest
+
+from contracts import schema
+
+
+class Format:
+    """A binary format, skipped when its package is not installed."""
+
+    def __init__(self, content_type: str, package: str, loads: str) -> None:
+        module = pytest.importorskip(package)
+        self.content_type = content_type
+        self.loads = getattr(module, loads)
+
+    def adapter(self, typ: Any) -> Any:
+        return schema(typ, content_type=self.content_type).type_adapter
+
+
+@pytest.fixture(
+    params=[
+        ("application/msgpack", "msgpack", "unpackb"),
+        ("application/cbor", "cbor2", "loads"),
+    ],
+    ids=["msgpack", "cbor"],
+)
+def fmt(request: pytest.FixtureRequest) -> Format:
+    return Format(*request.param)
+
+
+class Unit(Enum):
+    CELSIUS = "C"
+    FAHRENHEIT = "F"
+
+
+@dataclass
+class Measure:
+    value: float
+    unit: Unit
+
+
+@dataclass
+class Report:
+    id: UUID
+    created: datetime.datetime
+    measures: List[Measure]
+    latest: Optional[Measure]
+    raw: bytes
+    tags: List[str] = field(default_factory=list)
+
+
+REPORT = Report(
+    id=UUID("12345678-1234-5678-1234-567812345678"),
+    created=datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+    measures=[Measure(20.5, Unit.CELSIUS), Measure(70, Unit.FAHRENHEIT)],
+    latest=None,
+    raw=b"\x00\x01",
+    tags=["kitchen"],
+)
+
+
+class Device(pydantic.BaseModel):
+    name: str
+    measures: List[Measure]
+
+
+def test_round_trip(fmt: Format) -> None:
+    adapter = fmt.adapter(Report)
+    data = adapter.encode(REPORT)
+    assert adapter.decode(data) == REPORT
+    buffer = bytearray()
+    adapter.encode_into(REPORT, buffer)
+    assert buffer == data
+
+
+def test_values_are_converted_like_json(fmt: Format) -> None:
+    value = fmt.loads(fmt.adapter(Report).encode(REPORT))
+    assert value["id"] == "12345678-1234-5678-1234-567812345678"
+    assert value["created"] == "2024-01-02T03:04:05+00:00"
+    assert value["measures"][0] == {"value": 20.5, "unit": "C"}
+    assert value["latest"] is None
+    # Bytes are encoded natively
+    assert value["raw"] == b"\x00\x01"
+
+
+def test_pydantic_models(fmt: Format) -> None:
+    adapter = fmt.adapter(Device)
+    device = Device(name="a", measures=[Measure(1, Unit.CELSIUS)])
+    assert adapter.decode(adapter.encode(device)) == device
+    with pytest.raises(pydantic.ValidationError):
+        adapter.decode(fmt.adapter(dict).encode({"name": "a"}))
+
+
+def test_invalid_data_is_rejected(fmt: Format) -> None:
+    adapter = fmt.adapter(Measure)
+    with pytest.raises(ValueError):
+        adapter.decode(fmt.adapter(dict).encode({"value": 1}))
+    with pytest.raises(ValueError):
+        adapter.decode(fmt.adapter(dict).encode({"value": 1, "unit": "K"}))
+
+
+def test_without_value(fmt: Format) -> None:
+    adapter = fmt.adapter(type(None))
+    assert adapter.encode(None) == b""
+    assert adapter.decode(b"") is None
+    with pytest.raises(ValueError, match="No value expected"):
+        adapter.encode(1)
+    with pytest.raises(ValueError, match="No value expected"):
+        adapter.decode(b"\x01")
+
+
+@pytest.mark.parametrize(
+    "content_type, adapter_name",
+    [
+        ("application/msgpack", "MsgPackAdapter"),
+        ("application/vnd.msgpack", "MsgPackAdapter"),
+        ("application/cbor", "CBORAdapter"),
+    ],
+)
+def test_schemas_select_binary_adapters(content_type: str, adapter_name: str) -> None:
+    pytest.importorskip("msgpack" if "msgpack" in content_type else "cbor2")
+    measure = schema(Measure, content_type=content_type)
+    assert type(measure.type_adapter).__name__ == adapter_name
+    assert measure.content_type == content_type
+
+
+def test_streams_cannot_be_encoded_as_binary() -> None:
+    with pytest.raises(TypeError, match="Streaming payloads"):
+        schema(Iterable[Measure], content_type="application/msgpack")
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+import pytest
+
+from contracts import operation
+from contracts.backends.type_adapter.pydantic_v2 import PydanticV2JSONAdapterFactory
+from contracts.backends.type_adapter.standard import (
+    RawTypeAdapterFactory,
+    StandardJSONAdapterFactory,
+)
+from contracts.backends.type_adapter.stream import JSONStreamAdapter
+from contracts.core.buffers import BufferPool, write_into
+from contracts.core.types import encode_async
+
+
+@dataclass
+class Reading:
+    device: str
+    temperature: float
+
+
+def test_pool_reuses_released_buffers() -> None:
+    pool = BufferPool(size=2)
+    first = pool.acquire()
+    first += b"data"
+    pool.release(first)
+    assert pool.available == 1
+    # Released buffers are not cleared
+    assert pool.acquire() is first
+    assert first == b"data"
+    assert pool.acquire() is not first
+    stats = pool.stats
+    assert (stats.acquired, stats.reused, stats.created) == (3, 1, 2)
+    assert stats.released == 1
+    assert stats.hit_rate == 1 / 3
+    assert pool.available == 0
+
+
+def test_pool_discards_buffers() -> None:
+    pool = BufferPool(size=1, max_buffer_size=8)
+    pool.release(bytearray(b"small"))
+    # The pool is full
+    pool.release(bytearray(b"other"))
+    assert pool.available == 1
+    pool.acquire()
+    # The buffer is too large
+    pool.release(bytearray(9))
+    assert pool.available == 0
+    assert (pool.stats.released, pool.stats.discarded) == (1, 2)
+    assert BufferPool().stats.hit_rate == 0.0
+    with pytest.raises(ValueError, match="positive"):
+        BufferPool(size=-1)
+
+
+def test_write_into() -> None:
+    buffer = bytearray(b"previous payload")
+    write_into(buffer, b"new", 0)
+    assert buffer == b"new"
+    write_into(buffer, b"-end", 2)
+    assert buffer == b"ne-end"
+    write_into(buffer, memoryview(b"!"))
+    assert buffer == b"ne-end!"
+
+
+def _msgspec_factory() -> Any:
+    msgspec = pytest.importorskip("contracts.backends.type_adapter.msgspec")
+    return msgspec.MsgspecJSONAdapterFactory()
+
+
+def _msgpack_factory() -> Any:
+    msgpack = pytest.importorskip("contracts.backends.type_adapter.msgpack")
+    return msgpack.MsgPackAdapterFactory()
+
+
+def _cbor_factory() -> Any:
+    cbor = pytest.importorskip("contracts.backends.type_adapter.cbor")
+    return cbor.CBORAdapterFactory()
+
+
+@pytest.mark.parametrize(
+    "factory, message",
+    [
+        (StandardJSONAdapterFactory, Reading("a", 20.5)),
+        (PydanticV2JSONAdapterFactory, Reading("a", 20.5)),
+        (_msgspec_factory, Reading("a", 20.5)),
+        (_msgpack_factory, Reading("a", 20.5)),
+        (_cbor_factory, Reading("a", 20.5)),
+        (StandardJSONAdapterFactory, None),
+        (_msgspec_factory, None),
+        (RawTypeAdapterFactory, b"raw"),
+    ],
+)
+def test_encode_into_contract(factory: Callable[[], Any], message: Any) -> None:
+    adapter = factory()(type(message))
+    encoded = bytes(adapter.encode(message))
+    # Data after the offset is replaced, and the buffer truncated
+    buffer = bytearray(b"head" + b"x" * 100)
+    adapter.encode_into(message, buffer, 4)
+    assert buffer == b"head" + encoded
+    adapter.encode_into(message, buffer, 0)
+    assert buffer == encoded
+    # A negative offset appends to the buffer
+    adapter.encode_into(message, buffer)
+    assert buffer == encoded * 2
+
+
+def test_stream_encode_into_contract() -> None:
+    adapter: JSONStreamAdapter[Iterable[int]] = JSONStreamAdapter(Iterable[int])
+    buffer = bytearray(b"head" + b"x" * 100)
+    adapter.encode_into([1, 2], buffer, 4)
+    assert buffer == b"head[1,2]"
+    adapter.encode_into([], buffer, 0)
+    assert buffer == b"[]"
+
+
+@pytest.mark.asyncio
+async def test_encode_async_uses_buffer() -> None:
+    adapter = StandardJSONAdapterFactory()(Reading)
+    buffer = bytearray(b"x" * 100)
+    result = await encode_async(adapter, Reading("a", 1), buffer)
+    assert result is buffer
+    assert adapter.decode(buffer) == Reading("a", 1)
+
+    class EncodeOnly:
+        def encode(self, message: Any) -> bytes:
+            return b"encoded"
+
+    assert await encode_async(EncodeOnly(), "message", buffer) == b"encoded"  # type: ignore[arg-type]
+
+
+@operation(address="readings.echo", payload=Reading, reply_payload=Reading)
+class EchoReading:
+    """Echo a reading."""
+
+
+class EchoReadingImpl(EchoReading):
+    async def handle(self, request: Any) -> None:
+        reading = request.payload()
+        if reading.device == "invalid":
+            reading.temperature = object()
+        await request.respond(reading)
+
+
+@pytest.mark.asyncio
+async def test_replies_and_requests_use_pooled_buffers(loopback: Any) -> None:
+    server_pool = BufferPool()
+    client_pool = BufferPool()
+    client, _ = loopback(
+        EchoReadingImpl(), server_buffers=server_pool, buffers=client_pool
+    )
+    for idx in range(3):
+        reply = await client.send(EchoReading.request(Reading("a", idx)))
+        assert reply.data() == Reading("a", idx)
+    # A single buffer is used by each side, and returned after each message
+    for pool in (server_pool, client_pool):
+        assert (pool.stats.acquired, pool.stats.created) == (3, 1)
+        assert pool.available == 1
+    # Buffers are returned when a reply cannot be encoded
+    with pytest.raises(Exception):
+        await client.send(EchoReading.request(Reading("invalid", 0)))
+    assert (server_pool.stats.acquired, server_pool.available) == (4, 1)
+    assert client_pool.available == 1
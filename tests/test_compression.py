@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gzip
+from dataclasses import dataclass
+from typing import Any, List
+
+import pytest
+
+from contracts import compression, operation, schema
+from contracts.core.compression import ACCEPT_ENCODING, CONTENT_ENCODING
+
+
+@dataclass
+class Document:
+    lines: List[str]
+
+
+GZIP = compression("gzip", threshold=100)
+DOCUMENT = schema(Document, compression=GZIP)
+
+
+@operation(address="documents.echo", payload=DOCUMENT, reply_payload=DOCUMENT)
+class Echo:
+    """Echo a document."""
+
+
+class EchoImpl(Echo):
+    async def handle(self, request: Any) -> None:
+        await request.respond(request.payload())
+
+
+LARGE = Document(["line"] * 100)
+SMALL = Document(["line"])
+
+
+def test_negotiate_encoding() -> None:
+    settings = compression("gzip", "zstd")
+    assert settings.encodings == ("gzip", "zstd")
+    assert settings.accept_encoding() == "gzip, zstd"
+    assert settings.negotiate("zstd, gzip") == "gzip"
+    assert settings.negotiate("zstd") == "zstd"
+    assert settings.negotiate("gzip;q=0, zstd") == "zstd"
+    assert settings.negotiate("*") == "gzip"
+    assert settings.negotiate("br") is None
+    assert settings.negotiate("") is None
+    assert settings.negotiate(None) is None
+
+
+def test_compress_threshold() -> None:
+    data = b"x" * 100
+    assert GZIP.compress(data[:99], "gzip") == (data[:99], None)
+    assert GZIP.compress(data, None) == (data, None)
+    compressed, encoding = GZIP.compress(data, "gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == data
+
+
+def test_invalid_compression() -> None:
+    with pytest.raises(ValueError, match="threshold"):
+        compression("gzip", threshold=-1)
+    with pytest.raises(ValueError, match="Unsupported content encoding"):
+        compression("unknown")
+
+
+@pytest.mark.asyncio
+async def test_large_payloads_are_compressed(loopback: Any) -> None:
+    client, adapter = loopback(EchoImpl())
+    reply = await client.send(Echo.request(LARGE))
+    assert reply.data() == LARGE
+    [request] = adapter.requests
+    assert request.headers()[CONTENT_ENCODING] == "gzip"
+    assert request.headers()[ACCEPT_ENCODING] == "gzip"
+    assert gzip.decompress(request.data()).startswith(b'{"lines"')
+    assert request.reply is not None
+    assert reply.headers()[CONTENT_ENCODING] == "gzip"
+    assert len(request.reply.data) < 100
+
+
+@pytest.mark.asyncio
+async def test_small_payloads_are_not_compressed(loopback: Any) -> None:
+    client, adapter = loopback(EchoImpl())
+    reply = await client.send(Echo.request(SMALL))
+    assert reply.data() == SMALL
+    [request] = adapter.requests
+    assert CONTENT_ENCODING not in request.headers()
+    assert CONTENT_ENCODING not in reply.headers()
+
+
+@pytest.mark.asyncio
+async def test_replies_are_not_compressed_when_not_accepted(loopback: Any) -> None:
+    client, adapter = loopback(EchoImpl())
+    handler = adapter.handler
+
+    async def without_accept_encoding(request: Any) -> None:
+        del request.headers()[ACCEPT_ENCODING]
+        await handler(request)
+
+    adapter.handler = without_accept_encoding
+    reply = await client.send(Echo.request(LARGE))
+    assert reply.data() == LARGE
+    assert CONTENT_ENCODING not in reply.headers()
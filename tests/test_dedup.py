@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from contracts import Application, consumer, event
+from contracts.backends.server.micro import dedup
+from contracts.backends.server.micro.dedup import BloomFilter, Deduplicator
+from contracts.backends.server.micro.jetstream import ConsumerOptions, PullConsumer
+from contracts.core.event_spec import MESSAGE_ID
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(dedup.time, "monotonic", clock)
+    return clock
+
+
+def test_bloom_filter_sizing() -> None:
+    bloom = BloomFilter(100_000, 0.01)
+    # Optimal size and number of hashes for the capacity and error rate
+    assert bloom.size == math.ceil(-100_000 * math.log(0.01) / math.log(2) ** 2)
+    assert bloom.hashes == 7
+    assert bloom.memory == (bloom.size + 7) // 8
+    assert bloom.false_positive_rate == 0
+    # Small filters are sized up
+    assert BloomFilter(10, 0.01).size == 1 << 16
+    with pytest.raises(ValueError, match="Capacity"):
+        BloomFilter(0, 0.01)
+    with pytest.raises(ValueError, match="Error rate"):
+        BloomFilter(1000, 1)
+
+
+@pytest.mark.parametrize(
+    "capacity, error_rate", [(50_000, 0.01), (10, 1e-6), (1000, 1e-3)]
+)
+def test_bloom_filter_false_positive_bound(capacity: int, error_rate: float) -> None:
+    bloom = BloomFilter(capacity, error_rate)
+    for idx in range(capacity):
+        bloom.add(bloom.positions(f"added-{idx}"))
+    assert all(
+        bloom.contains(bloom.positions(f"added-{idx}")) for idx in range(capacity)
+    )
+    assert bloom.false_positive_rate <= error_rate * 1.01
+    lookups = 20_000
+    false_positives = sum(
+        bloom.contains(bloom.positions(f"other-{idx}")) for idx in range(lookups)
+    )
+    assert false_positives <= 2 * error_rate * lookups
+    bloom.clear()
+    assert bloom.count == 0
+    assert not bloom.contains(bloom.positions("added-0"))
+
+
+def test_handled_ids_are_remembered(clock: Clock) -> None:
+    dedup = Deduplicator(window=60)
+    assert dedup.claim("a")
+    assert dedup.handling("a")
+    dedup.release("a", handled=True)
+    assert not dedup.handling("a")
+    assert not dedup.claim("a")
+    stats = dedup.stats
+    assert (stats.checked, stats.duplicates, stats.remembered) == (2, 1, 1)
+    assert stats.duplicate_rate == 0.5
+    assert stats.memory > 0
+    assert 0 <= stats.false_positive_rate < 1e-6
+
+
+def test_failed_ids_are_forgotten(clock: Clock) -> None:
+    dedup = Deduplicator(window=60)
+    assert dedup.claim("a")
+    dedup.release("a", handled=False)
+    assert dedup.claim("a")
+    assert dedup.stats.remembered == 0
+
+
+def test_concurrent_duplicates(clock: Clock) -> None:
+    dedup = Deduplicator(window=60)
+    assert dedup.claim("a")
+    assert not dedup.claim("a")
+    assert dedup.handling("a")
+    # Releasing an id which is not claimed does nothing
+    dedup.release("b", handled=True)
+    assert dedup.claim("b")
+
+
+def test_rotation_after_window(clock: Clock) -> None:
+    dedup = Deduplicator(window=60)
+    dedup.claim("a")
+    dedup.release("a", handled=True)
+    clock.now += 60
+    dedup.claim("b")
+    dedup.release("b", handled=True)
+    assert dedup.stats.rotations == 1
+    # Ids are remembered for at least one window
+    assert not dedup.claim("a")
+    clock.now += 60
+    assert dedup.claim("a")
+    assert not dedup.claim("b")
+    assert dedup.stats.rotations == 2
+
+
+def test_both_filters_expire_after_two_windows(clock: Clock) -> None:
+    dedup = Deduplicator(window=60)
+    dedup.claim("a")
+    dedup.release("a", handled=True)
+    clock.now += 120
+    assert dedup.claim("a")
+
+
+def test_rotation_by_capacity(clock: Clock) -> None:
+    dedup = Deduplicator(window=60, capacity=10)
+    for idx in range(25):
+        assert dedup.claim(f"id-{idx}")
+        dedup.release(f"id-{idx}", handled=True)
+    assert dedup.stats.rotations == 2
+    # Only the ids of the current and previous filters are remembered
+    assert dedup.claim("id-0")
+    assert not dedup.claim("id-24")
+    assert not dedup.claim("id-10")
+
+
+@dataclass
+class Reading:
+    value: int
+
+
+@event(address="readings", parameters=type(None), payload_schema=Reading)
+class ReadingReceived:
+    pass
+
+
+@consumer(source=ReadingReceived)
+class ReadingConsumer:
+    pass
+
+
+ENTRY = (
+    Application(id="test", name="test", version="0.0.1", components=[ReadingConsumer])
+    .compile()
+    .consumers[0]
+)
+OPTIONS = ConsumerOptions(
+    fetch_timeout=0.05, ack_batch_size=0, dedup_window=60, dedup_retry_delay=0.02
+)
+
+
+def add(nats: Any, value: int, msg_id: str) -> int:
+    return nats.add(
+        "readings", json.dumps({"value": value}).encode(), {MESSAGE_ID: msg_id}
+    )
+
+
+@pytest.mark.asyncio
+async def test_consumer_acknowledges_duplicates(nats: Any) -> None:
+    handled: list[int] = []
+
+    class Recording(ReadingConsumer):
+        async def handle(self, event: Any) -> None:
+            handled.append(event.payload().value)
+
+    runner = PullConsumer(nats, Recording(), ENTRY, "test_durable", OPTIONS)
+    await runner.start()
+    first = add(nats, 1, "a")
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: durable.acked() == [first])
+    duplicate = add(nats, 1, "a")
+    await nats.wait_until(lambda: len(durable.acked()) == 2)
+    await runner.stop()
+    assert handled == [1]
+    assert durable.settled[duplicate] == ["ack"]
+    stats = runner.dedup_stats
+    assert stats is not None
+    assert (stats.checked, stats.duplicates) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_consumer_handles_failed_events_again(nats: Any) -> None:
+    attempts: list[int] = []
+
+    class Failing(ReadingConsumer):
+        async def handle(self, event: Any) -> None:
+            attempts.append(event.payload().value)
+            if len(attempts) == 1:
+                raise RuntimeError("Failed to handle event")
+
+    runner = PullConsumer(nats, Failing(), ENTRY, "test_durable", OPTIONS)
+    await runner.start()
+    seq = add(nats, 1, "a")
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: durable.acked() == [seq])
+    await runner.stop()
+    assert attempts == [1, 1]
+    assert durable.settled[seq] == ["nak", "ack"]
+
+
+@pytest.mark.asyncio
+async def test_duplicates_of_events_being_handled_are_redelivered(nats: Any) -> None:
+    release = asyncio.Event()
+    attempts: list[int] = []
+
+    class SlowFailing(ReadingConsumer):
+        async def handle(self, event: Any) -> None:
+            attempts.append(event.payload().value)
+            if len(attempts) == 1:
+                await release.wait()
+                raise RuntimeError("Failed to handle event")
+
+    runner = PullConsumer(nats, SlowFailing(), ENTRY, "test_durable", OPTIONS)
+    await runner.start()
+    first = add(nats, 1, "a")
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: attempts == [1])
+    # Delivered while the first event is being handled
+    duplicate = add(nats, 1, "a")
+    await nats.wait_until(lambda: durable.settled.get(duplicate) == ["nak"])
+    release.set()
+    # The first event failed, so its duplicate is handled once redelivered
+    await nats.wait_until(lambda: duplicate in durable.acked())
+    await nats.wait_until(lambda: first in durable.acked())
+    await runner.stop()
+    assert durable.settled[duplicate][-1] == "ack"
+    assert durable.settled[first] == ["nak", "ack"]
+    # The event was handled successfully only once
+    assert runner.dedup_stats is not None
+    assert runner.dedup_stats.remembered == 1
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import msgpack
+import pytest
+
+from contracts import operation, schema
+from contracts.core.negotiation import (
+    ACCEPT,
+    CONTENT_TYPE,
+    media_type,
+    negotiate,
+    parse_accept,
+)
+
+
+@dataclass
+class Reading:
+    device: str
+    temperature: float
+
+
+READING = schema(Reading, alternatives=["application/msgpack"])
+
+
+@operation(address="readings.echo", payload=READING, reply_payload=READING)
+class EchoReading:
+    """Echo a reading."""
+
+
+class EchoReadingImpl(EchoReading):
+    async def handle(self, request: Any) -> None:
+        await request.respond(request.payload())
+
+
+def test_parse_accept() -> None:
+    assert parse_accept(None) == []
+    assert parse_accept("") == []
+    assert parse_accept("application/json, application/msgpack") == [
+        "application/json",
+        "application/msgpack",
+    ]
+    assert parse_accept(
+        "application/json;q=0.5, Application/MsgPack, text/plain;q=0.8"
+    ) == ["application/msgpack", "text/plain", "application/json"]
+    assert parse_accept("gzip;q=0, zstd, , lz4;q=invalid") == ["zstd"]
+
+
+def test_negotiate() -> None:
+    offered = ["application/json", "application/msgpack"]
+    assert negotiate(offered, "application/msgpack") == "application/msgpack"
+    assert (
+        negotiate(offered, "application/json;q=0.1, application/msgpack")
+        == "application/msgpack"
+    )
+    assert negotiate(offered, "*/*") == "application/json"
+    assert negotiate(offered, "application/cbor") is None
+    assert negotiate(offered, None) is None
+    assert negotiate([], "*/*") is None
+
+
+def test_media_type() -> None:
+    assert media_type("Application/JSON; charset=utf-8") == "application/json"
+    assert media_type(None) == ""
+
+
+def test_schema_content_types() -> None:
+    assert READING.content_type == "application/json"
+    assert tuple(READING.content_types) == ("application/json", "application/msgpack")
+
+
+@pytest.mark.asyncio
+async def test_default_content_type(loopback: Any) -> None:
+    client, adapter = loopback(EchoReadingImpl())
+    reply = await client.send(EchoReading.request(Reading("a", 1.5)))
+    assert reply.data() == Reading("a", 1.5)
+    [request] = adapter.requests
+    assert request.headers()[CONTENT_TYPE] == "application/json"
+    assert ACCEPT not in request.headers()
+    assert reply.headers()[CONTENT_TYPE] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_preferred_content_type(loopback: Any) -> None:
+    client, adapter = loopback(
+        EchoReadingImpl(), content_types=["application/cbor", "application/msgpack"]
+    )
+    reply = await client.send(EchoReading.request(Reading("a", 1.5)))
+    assert reply.data() == Reading("a", 1.5)
+    [request] = adapter.requests
+    # Only content types supported by the schema are requested
+    assert request.headers()[CONTENT_TYPE] == "application/msgpack"
+    assert request.headers()[ACCEPT] == "application/msgpack"
+    assert msgpack.unpackb(request.data()) == {"device": "a", "temperature": 1.5}
+    assert reply.headers()[CONTENT_TYPE] == "application/msgpack"
+    assert request.reply is not None
+    assert msgpack.unpackb(request.reply.data) == {"device": "a", "temperature": 1.5}
+
+
+@pytest.mark.asyncio
+async def test_unsupported_accept_uses_default_content_type(loopback: Any) -> None:
+    client, adapter = loopback(EchoReadingImpl())
+    reply = await client.send(
+        EchoReading.request(Reading("a", 1.5), headers={ACCEPT: "application/cbor"})
+    )
+    assert reply.headers()[CONTENT_TYPE] == "application/json"
+    assert reply.data() == Reading("a", 1.5)
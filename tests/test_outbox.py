@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from contracts import outbox as outbox_module
+from contracts.client import ClientAdapter, RawReply
+from contracts.core.types import Buffer
+from contracts.outbox import Outbox
+
+
+class Broker(ClientAdapter):
+    """A client adapter recording published events.
+
+    Publishing raises while the broker is down, while failures remain, or
+    once `capacity` events are published. When held, acknowledgements are
+    only resolved once released.
+    """
+
+    def __init__(
+        self, failures: int = 0, down: bool = False, capacity: int | None = None
+    ) -> None:
+        self.failures = failures
+        self.down = down
+        self.capacity = capacity
+        self.hold = False
+        self.attempts = 0
+        self.published: list[tuple[str, bytes, dict[str, str] | None]] = []
+        self.acks: list[asyncio.Future[Any]] = []
+
+    async def send_request(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+        timeout: float = 1,
+    ) -> RawReply:
+        raise NotImplementedError
+
+    async def send_event(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    async def publish_event(
+        self,
+        subject: str,
+        payload: Buffer,
+        headers: dict[str, str] | None = None,
+    ) -> asyncio.Future[Any]:
+        self.attempts += 1
+        if self.down or len(self.published) == self.capacity:
+            raise ConnectionError("Broker is unavailable")
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Broker is unavailable")
+        self.published.append((subject, bytes(payload), headers))
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        if self.hold:
+            self.acks.append(future)
+        else:
+            future.set_result(None)
+        return future
+
+    def release(self) -> None:
+        for future in self.acks:
+            future.set_result(None)
+        self.acks.clear()
+
+    def payloads(self) -> list[bytes]:
+        return [payload for _, payload, _ in self.published]
+
+
+async def wait_until(predicate: Any, timeout: float = 2) -> None:
+    async def poll() -> None:
+        while not predicate():
+            await asyncio.sleep(0.001)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def segments(path: Path) -> list[Path]:
+    return sorted(path.glob("*.seg"))
+
+
+async def fill(path: Path, count: int, **options: Any) -> None:
+    """Append events to an outbox which cannot publish them."""
+    async with Outbox(path, Broker(down=True), retry_delay=10, **options) as box:
+        for idx in range(count):
+            await box.append("readings", b"event-%d" % idx)
+        await box.close(timeout=0)
+
+
+@pytest.mark.asyncio
+async def test_events_are_published_in_order(tmp_path: Path) -> None:
+    broker = Broker()
+    box = Outbox(tmp_path / "outbox", broker)
+    with pytest.raises(RuntimeError, match="not open"):
+        await box.append("readings", b"data")
+    await box.open()
+    with pytest.raises(RuntimeError, match="already open"):
+        await box.open()
+    payload = bytearray(b"first")
+    synced = await box.append("readings", payload, {"Nats-Msg-Id": "a"})
+    # The payload is copied
+    payload[:] = b"other"
+    await box.append("readings.other", b"second")
+    await synced
+    await box.close()
+    assert broker.published == [
+        ("readings", b"first", {"Nats-Msg-Id": "a"}),
+        ("readings.other", b"second", {}),
+    ]
+    stats = box.stats
+    assert (stats.appended, stats.sent, stats.failures) == (2, 2, 0)
+    assert stats.syncs >= 1
+    assert (box.depth, box.depth_bytes, box.lag) == (0, 0, 0.0)
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        pytest.param(lambda data: data + b"\x00\x00\x00", id="torn-header"),
+        pytest.param(lambda data: data[:-3], id="torn-body"),
+        pytest.param(lambda data: data[:-1] + b"X", id="corrupt-checksum"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_damaged_tail_is_truncated_on_open(tmp_path: Path, damage: Any) -> None:
+    await fill(tmp_path, 3)
+    (segment,) = segments(tmp_path)
+    data = segment.read_bytes()
+    damaged = damage(data)
+    segment.write_bytes(damaged)
+    broker = Broker()
+    async with Outbox(tmp_path, broker) as box:
+        valid = 3 if len(damaged) > len(data) else 2
+        assert box.depth == valid
+        await wait_until(lambda: len(broker.published) == valid)
+        # Events appended after recovery follow the last valid record
+        await box.append("readings", b"event-new")
+    assert broker.payloads() == [b"event-%d" % idx for idx in range(valid)] + [
+        b"event-new"
+    ]
+    async with Outbox(tmp_path, Broker()) as box:
+        assert box.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_cursor_is_persisted_across_segments(tmp_path: Path) -> None:
+    await fill(tmp_path, 10, segment_size=32)
+    assert len(segments(tmp_path)) == 10
+    # Only the first events are published before the broker goes down
+    broker = Broker(capacity=4)
+    box = Outbox(tmp_path, broker, segment_size=32, retry_delay=10)
+    await box.open()
+    await wait_until(lambda: box.stats.failures == 1)
+    await box.close(timeout=0)
+    assert box.depth == 6
+    # Each event has its own segment, and segments before the cursor are
+    # deleted
+    remaining = segments(tmp_path)
+    assert len(remaining) == 7
+    cursor = (tmp_path / "cursor").read_text().split()
+    assert cursor == [str(int(remaining[0].stem)), str(remaining[0].stat().st_size)]
+    broker = Broker()
+    async with Outbox(tmp_path, broker, segment_size=32) as box:
+        assert box.depth == 6
+        await wait_until(lambda: box.depth == 0)
+    assert broker.payloads() == [b"event-%d" % idx for idx in range(4, 10)]
+    (last,) = segments(tmp_path)
+    assert last.stem.endswith("9")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_while_rolling_segments(tmp_path: Path) -> None:
+    async with Outbox(tmp_path, Broker(down=True), segment_size=32) as box:
+        await asyncio.gather(
+            *(box.append("readings", b"event-%d" % idx) for idx in range(20))
+        )
+        # Events waiting for a new segment do not roll it again
+        assert len(segments(tmp_path)) == 20
+        await box.close(timeout=0)
+    broker = Broker()
+    async with Outbox(tmp_path, broker, segment_size=32) as box:
+        await wait_until(lambda: box.depth == 0)
+    assert broker.payloads() == [b"event-%d" % idx for idx in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_appending_waits_while_outbox_is_full(tmp_path: Path) -> None:
+    broker = Broker()
+    broker.hold = True
+    async with Outbox(tmp_path, broker, max_pending_bytes=10) as box:
+        await box.append("readings", b"12345")
+        await box.append("readings", b"12345")
+        assert box.depth_bytes == 10
+        blocked = asyncio.ensure_future(box.append("readings", b"12345"))
+        await wait_until(lambda: len(broker.acks) == 2)
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        broker.release()
+        await asyncio.wait_for(blocked, 1)
+        assert box.stats.appended == 3
+        await wait_until(lambda: len(broker.acks) == 1)
+        broker.release()
+        await wait_until(lambda: box.depth == 0)
+    assert len(broker.published) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_publishing_is_retried_with_backoff(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    delays: list[float] = []
+
+    class RecordingAsyncio:
+        """The asyncio module, recording delays instead of sleeping."""
+
+        def __getattr__(self, name: str) -> Any:
+            return getattr(asyncio, name)
+
+        async def sleep(self, delay: float) -> None:
+            # Syncs are not delayed
+            if delay:
+                delays.append(delay)
+            await asyncio.sleep(0)
+
+    monkeypatch.setattr(outbox_module, "asyncio", RecordingAsyncio())
+    broker = Broker(failures=4)
+    box = Outbox(tmp_path, broker, retry_delay=0.1, max_retry_delay=0.3)
+    async with box:
+        await box.append("readings", b"first")
+        await wait_until(lambda: box.depth == 0)
+        # The delay is reset once events are published
+        broker.failures = 1
+        await box.append("readings", b"second")
+        await wait_until(lambda: box.depth == 0)
+    assert broker.payloads() == [b"first", b"second"]
+    assert delays == [0.1, 0.2, 0.3, 0.3, 0.1]
+    assert box.stats.failures == 5
+    assert box.stats.sent == 2
+
+
+@pytest.mark.asyncio
+async def test_only_acknowledged_events_are_removed(tmp_path: Path) -> None:
+    class Rejecting(Broker):
+        async def publish_event(self, *args: Any) -> asyncio.Future[Any]:
+            future = await super().publish_event(*args)
+            if len(self.published) == 2:
+                # The second event is rejected once
+                future = asyncio.get_running_loop().create_future()
+                future.set_exception(ConnectionError("Rejected"))
+            return future
+
+    broker = Rejecting()
+    async with Outbox(tmp_path, broker, retry_delay=0.01) as box:
+        await box.append("readings", b"first")
+        await box.append("readings", b"second")
+        await wait_until(lambda: box.depth == 0)
+    assert broker.payloads() == [b"first", b"second", b"second"]
+    assert box.stats.failures == 1
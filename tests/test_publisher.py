@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from contracts import event
+from contracts.backends.client.micro import Client, JetStreamPublisher
+from contracts.core.event_spec import MESSAGE_ID
+
+
+@dataclass
+class Reading:
+    value: int
+
+
+@event(address="readings", parameters=type(None), payload_schema=Reading)
+class ReadingReceived:
+    pass
+
+
+def test_invalid_options(nats: Any) -> None:
+    with pytest.raises(ValueError, match="Window"):
+        JetStreamPublisher(nats, window=0)
+    with pytest.raises(ValueError, match="Max retries"):
+        JetStreamPublisher(nats, max_retries=-1)
+
+
+@pytest.mark.asyncio
+async def test_acknowledgement(nats: Any) -> None:
+    publisher = JetStreamPublisher(nats)
+    buffer = bytearray(b"first")
+    first = await publisher.publish("readings", buffer)
+    # The payload is copied
+    buffer[:] = b"other"
+    second = await publisher.publish("readings", b"second", {MESSAGE_ID: "id-2"})
+    assert (await first).seq == 1
+    assert (await second).seq == 2
+    assert [data for _, data, _ in nats.messages] == [b"first", b"second"]
+    # Ids are generated when missing, and kept otherwise
+    assert nats.messages[0][2][MESSAGE_ID]
+    assert nats.messages[1][2][MESSAGE_ID] == "id-2"
+    await publisher.flush()
+    stats = publisher.stats
+    assert (stats.published, stats.acknowledged, stats.pending) == (2, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_retry_on_timeout(nats: Any) -> None:
+    nats.lost_acks = 1
+    nats.ack_delay = 0.01
+    publisher = JetStreamPublisher(nats, ack_timeout=0.05)
+    future = await publisher.publish("readings", b"data")
+    ack = await future
+    # The retry is acknowledged late, as a duplicate of the stored event
+    assert ack.seq == 1
+    assert ack.duplicate
+    assert len(nats.messages) == 1
+    first, retry = nats.attempts
+    assert first.cancelled()
+    assert retry.result() is ack
+    assert publisher.stats.retried == 1
+    assert publisher.stats.acknowledged == 1
+
+
+@pytest.mark.parametrize("window", [1, 2])
+@pytest.mark.asyncio
+async def test_lost_acks_with_full_window(nats: Any, window: int) -> None:
+    nats.lost_acks = 100
+    publisher = JetStreamPublisher(nats, window=window, ack_timeout=0.05)
+    futures = [await publisher.publish("readings", b"data") for _ in range(window)]
+    await asyncio.wait_for(publisher.flush(), 1)
+    for future in futures:
+        with pytest.raises(asyncio.TimeoutError):
+            future.result()
+    stats = publisher.stats
+    assert (stats.failed, stats.retried, stats.pending) == (window, 2 * window, 0)
+    # Every attempt released its slot
+    assert all(attempt.done() for attempt in nats.attempts)
+    assert len(nats.messages) == window
+
+
+@pytest.mark.asyncio
+async def test_publishing_waits_for_a_free_slot(nats: Any) -> None:
+    nats.ack_delay = 0.02
+    publisher = JetStreamPublisher(nats, window=1)
+    first = await publisher.publish("readings", b"first")
+    second = asyncio.ensure_future(publisher.publish("readings", b"second"))
+    await asyncio.sleep(0.01)
+    assert not second.done()
+    await first
+    assert (await (await second)).seq == 2
+
+
+@pytest.mark.asyncio
+async def test_client_publishes_to_jetstream(nats: Any) -> None:
+    client = Client(nats, publisher=JetStreamPublisher(nats))
+    events = [ReadingReceived.publish(Reading(value)) for value in range(3)]
+    futures = await client.publish_many(events)
+    assert [(await future).seq for future in futures] == [1, 2, 3]
+    # The id of each event is used to deduplicate it
+    assert [headers[MESSAGE_ID] for _, _, headers in nats.messages] == [
+        msg.id for msg in events
+    ]
+    await client.send(events[0])
+    assert len(nats.messages) == 3
+
+
+@pytest.mark.asyncio
+async def test_client_publishes_using_core_nats(nats: Any) -> None:
+    client = Client(nats)
+    futures = await client.publish_many([ReadingReceived.publish(Reading(1))])
+    assert await futures[0] is None
+    assert nats.published == [("readings", b'{"value":1}')]
+    assert nats.messages == []
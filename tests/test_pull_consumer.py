@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import pytest
+
+from contracts import Application, consumer, event
+from contracts.backends.server.micro.jetstream import (
+    ConsumerOptions,
+    PullConsumer,
+    durable_name,
+    is_batch_consumer,
+    params_key,
+)
+
+
+@dataclass
+class DeviceParams:
+    device: str
+
+
+@dataclass
+class Reading:
+    value: int
+
+
+@event(
+    address="devices.{device}.readings", parameters=DeviceParams, payload_schema=Reading
+)
+class ReadingReceived:
+    pass
+
+
+@consumer(source=ReadingReceived)
+class ReadingConsumer:
+    pass
+
+
+class RecordingConsumer(ReadingConsumer):
+    def __init__(self, failures: int = 0) -> None:
+        self.handled: list[tuple[str, int]] = []
+        self.failures = failures
+
+    async def handle(self, event: Any) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("Failed to handle event")
+        self.handled.append((event.params().device, event.payload().value))
+
+
+class BatchConsumer(ReadingConsumer):
+    def __init__(self) -> None:
+        self.batches: list[list[int]] = []
+
+    async def handle(self, event: Any) -> None:
+        raise NotImplementedError
+
+    async def handle_batch(self, events: Sequence[Any]) -> None:
+        self.batches.append([event.payload().value for event in events])
+
+
+class OrderedConsumer(ReadingConsumer):
+    def __init__(self, failures: dict[int, int]) -> None:
+        self.handled: list[tuple[str, int]] = []
+        self.failures = failures
+
+    async def handle(self, event: Any) -> None:
+        value = event.payload().value
+        if self.failures.get(value):
+            self.failures[value] -= 1
+            await event.nack(0.02)
+            return
+        self.handled.append((event.params().device, value))
+
+
+ENTRY = (
+    Application(id="test", name="test", version="0.0.1", components=[ReadingConsumer])
+    .compile()
+    .consumers[0]
+)
+OPTIONS = ConsumerOptions(fetch_timeout=0.05, ack_batch_size=0)
+
+
+def reading(value: int) -> bytes:
+    return json.dumps({"value": value}).encode()
+
+
+def test_durable_name() -> None:
+    assert durable_name("test", ENTRY) == "test_ReadingConsumer"
+    assert durable_name("my.app *>", ENTRY) == "my_app____ReadingConsumer"
+
+
+@pytest.mark.parametrize(
+    "options, error",
+    [
+        ({"batch_size": 0}, "Batch size"),
+        ({"max_concurrency": 0}, "Max concurrency"),
+        ({"fetch_timeout": 0}, "Fetch timeout"),
+        ({"handler_batch_size": 0}, "Handler batch size"),
+        ({"handler_batch_delay": -1}, "Handler batch delay"),
+        ({"ack_batch_size": -1}, "Ack batch size"),
+        ({"dedup_window": -1}, "Dedup window"),
+        ({"dedup_error_rate": 1}, "Dedup error rate"),
+    ],
+)
+def test_invalid_options(options: dict[str, Any], error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        ConsumerOptions(**options)
+
+
+@pytest.mark.asyncio
+async def test_messages_are_handled_and_acknowledged(nats: Any) -> None:
+    handler = RecordingConsumer()
+    runner = PullConsumer(nats, handler, ENTRY, "test_durable", OPTIONS)
+    await runner.start()
+    with pytest.raises(RuntimeError, match="already started"):
+        await runner.start()
+    nats.add("devices.a.readings", reading(1))
+    nats.add("devices.b.readings", reading(2))
+    nats.add("devices.b.other", reading(3))
+    durable = nats.durables["test_durable"]
+    assert durable.subject == "devices.*.readings"
+    await nats.wait_until(lambda: len(durable.acked()) == 2)
+    await runner.stop()
+    assert sorted(handler.handled) == [("a", 1), ("b", 2)]
+    assert runner.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_messages_are_redelivered(nats: Any) -> None:
+    handler = RecordingConsumer(failures=1)
+    runner = PullConsumer(nats, handler, ENTRY, "test_durable", OPTIONS)
+    await runner.start()
+    seq = nats.add("devices.a.readings", reading(1))
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: durable.acked() == [seq])
+    await runner.stop()
+    assert durable.settled[seq] == ["nak", "ack"]
+    assert durable.deliveries[seq] == 2
+    assert handler.handled == [("a", 1)]
+
+
+@pytest.mark.asyncio
+async def test_durable_consumer_resumes_after_restart(nats: Any) -> None:
+    first = RecordingConsumer()
+    runner = PullConsumer(nats, first, ENTRY, "test_durable", OPTIONS)
+    await runner.start()
+    nats.add("devices.a.readings", reading(1))
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: len(durable.acked()) == 1)
+    await runner.stop()
+    # Messages published while the consumer is stopped are kept
+    nats.add("devices.a.readings", reading(2))
+    second = RecordingConsumer()
+    runner = PullConsumer(nats, second, ENTRY, "test_durable", OPTIONS)
+    await runner.start()
+    await nats.wait_until(lambda: len(durable.acked()) == 2)
+    await runner.stop()
+    assert first.handled == [("a", 1)]
+    assert second.handled == [("a", 2)]
+
+
+@pytest.mark.asyncio
+async def test_fetches_are_limited_by_free_slots(nats: Any) -> None:
+    release = asyncio.Event()
+
+    class SlowConsumer(RecordingConsumer):
+        async def handle(self, event: Any) -> None:
+            await release.wait()
+            await super().handle(event)
+
+    handler = SlowConsumer()
+    options = ConsumerOptions(
+        batch_size=10, max_concurrency=3, fetch_timeout=0.05, ack_batch_size=0
+    )
+    for value in range(5):
+        nats.add("devices.a.readings", reading(value))
+    runner = PullConsumer(nats, handler, ENTRY, "test_durable", options)
+    await runner.start()
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: runner.in_flight == 3)
+    await asyncio.sleep(0.01)
+    assert runner.in_flight == 3
+    assert len(durable.pending) == 2
+    release.set()
+    await nats.wait_until(lambda: len(durable.acked()) == 5)
+    await runner.stop()
+    assert max(durable.fetches) <= 3
+    assert sorted(value for _, value in handler.handled) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_batch_consumer(nats: Any) -> None:
+    handler = BatchConsumer()
+    options = ConsumerOptions(
+        fetch_timeout=0.05,
+        handler_batch_size=3,
+        handler_batch_delay=0.01,
+        ack_batch_size=0,
+    )
+    for value in range(4):
+        nats.add("devices.a.readings", reading(value))
+    invalid = nats.add("devices.a.readings", b"not json")
+    runner = PullConsumer(nats, handler, ENTRY, "test_durable", options)
+    assert runner.batched
+    await runner.start()
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: len(durable.acked()) == 4)
+    await runner.stop()
+    assert handler.batches == [[0, 1, 2], [3]]
+    # Payloads which cannot be decoded are terminated
+    assert durable.settled[invalid] == ["term"]
+
+
+@pytest.mark.asyncio
+async def test_default_handle_batch_handles_events_in_order() -> None:
+    handler = RecordingConsumer()
+    assert not is_batch_consumer(handler)
+    assert is_batch_consumer(BatchConsumer())
+
+    class Event:
+        def __init__(self, value: int) -> None:
+            self.value = value
+
+        def params(self) -> DeviceParams:
+            return DeviceParams("a")
+
+        def payload(self) -> Reading:
+            return Reading(self.value)
+
+    await handler.handle_batch([Event(1), Event(2)])  # type: ignore[list-item]
+    assert handler.handled == [("a", 1), ("a", 2)]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_handled_after_delay(nats: Any) -> None:
+    handler = BatchConsumer()
+    options = ConsumerOptions(
+        fetch_timeout=0.05,
+        handler_batch_size=100,
+        handler_batch_delay=0.02,
+        ack_batch_size=0,
+    )
+    runner = PullConsumer(nats, handler, ENTRY, "test_durable", options)
+    await runner.start()
+    nats.add("devices.a.readings", reading(0))
+    nats.add("devices.a.readings", reading(1))
+    durable = nats.durables["test_durable"]
+    # The batch is not full, and is handled once the delay elapsed
+    await nats.wait_until(lambda: len(durable.acked()) == 2)
+    assert runner.in_flight == 0
+    nats.add("devices.a.readings", reading(2))
+    await nats.wait_until(lambda: len(durable.acked()) == 3)
+    await runner.stop()
+    assert handler.batches == [[0, 1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_redelivered(nats: Any) -> None:
+    class FailingBatchConsumer(BatchConsumer):
+        async def handle_batch(self, events: Sequence[Any]) -> None:
+            await super().handle_batch(events)
+            if len(self.batches) == 1:
+                # Settled events are not nacked
+                await events[0].term()
+                raise RuntimeError("Failed to handle events")
+
+    handler = FailingBatchConsumer()
+    options = ConsumerOptions(
+        fetch_timeout=0.05,
+        handler_batch_size=3,
+        handler_batch_delay=0.01,
+        ack_batch_size=0,
+    )
+    termed, *failed = (nats.add("devices.a.readings", reading(v)) for v in range(3))
+    runner = PullConsumer(nats, handler, ENTRY, "test_durable", options)
+    await runner.start()
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: durable.acked() == failed)
+    await runner.stop()
+    assert handler.batches == [[0, 1, 2], [1, 2]]
+    assert durable.settled[termed] == ["term"]
+    assert all(durable.settled[seq] == ["nak", "ack"] for seq in failed)
+
+
+@pytest.mark.asyncio
+async def test_batch_consumer_rejects_partition_key(nats: Any) -> None:
+    options = ConsumerOptions(partition_key=lambda message: None)
+    runner = PullConsumer(nats, BatchConsumer(), ENTRY, "test_durable", options)
+    with pytest.raises(ValueError, match="Partition keys"):
+        await runner.start()
+
+
+ORDERED_OPTIONS = ConsumerOptions(
+    fetch_timeout=0.05, ack_batch_size=0, partition_key=params_key("device")
+)
+
+
+@pytest.mark.asyncio
+async def test_partition_is_blocked_until_redelivery(nats: Any) -> None:
+    handler = OrderedConsumer(failures={1: 1})
+    runner = PullConsumer(nats, handler, ENTRY, "test_durable", ORDERED_OPTIONS)
+    await runner.start()
+    failed = nats.add("devices.a.readings", reading(1))
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: durable.settled.get(failed) == ["nak"])
+    # Fetched after the failure, before the failed message is redelivered
+    later = nats.add("devices.a.readings", reading(2))
+    other = nats.add("devices.b.readings", reading(3))
+    await nats.wait_until(lambda: len(durable.acked()) == 3)
+    await runner.stop()
+    assert [value for device, value in handler.handled if device == "a"] == [1, 2]
+    assert durable.settled[failed] == ["nak", "ack"]
+    # Redeliveries of the later message are not acknowledged until the
+    # failed message is settled
+    assert durable.settled[later][0] == "nak"
+    assert durable.settled[later][-1] == "ack"
+    # Other keys are not blocked
+    assert durable.settled[other] == ["ack"]
+    assert runner._blocked == {}
+
+
+@pytest.mark.asyncio
+async def test_partition_stays_blocked_while_redelivery_fails(nats: Any) -> None:
+    handler = OrderedConsumer(failures={1: 2, 3: 1})
+    runner = PullConsumer(nats, handler, ENTRY, "test_durable", ORDERED_OPTIONS)
+    await runner.start()
+    failed = nats.add("devices.a.readings", reading(1))
+    durable = nats.durables["test_durable"]
+    await nats.wait_until(lambda: durable.settled.get(failed) == ["nak"])
+    for value in range(2, 6):
+        nats.add("devices.a.readings", reading(value))
+    await nats.wait_until(lambda: len(durable.acked()) == 5)
+    await runner.stop()
+    assert handler.handled == [("a", value) for value in range(1, 6)]
+    assert runner._blocked == {}
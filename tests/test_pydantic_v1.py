@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import datetime
+import json
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from contracts.backends.type_adapter.pydantic_v1 import PydanticV1JSONAdapter
+
+v1 = pytest.importorskip("pydantic.v1")
+
+
+class Unit(Enum):
+    CELSIUS = "C"
+    FAHRENHEIT = "F"
+
+
+class Measure(v1.BaseModel):
+    value: float
+    unit: Unit
+
+
+class Device(v1.BaseModel):
+    name: str
+    created: datetime.datetime
+    measures: List[Measure]
+    location: Optional[str] = None
+
+
+class Configured(v1.BaseModel):
+    value: int
+
+    class Config:
+        json_dumps = staticmethod(lambda value, **kwargs: json.dumps(value, indent=1))
+
+
+DEVICE = Device(
+    name="a",
+    created=datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+    measures=[Measure(value=20.5, unit=Unit.CELSIUS)],
+)
+
+
+def test_models_round_trip() -> None:
+    adapter = PydanticV1JSONAdapter(Device)
+    data = adapter.encode(DEVICE)
+    # Models are encoded as compact JSON
+    assert data == (
+        b'{"name":"a","created":"2024-01-02T03:04:05+00:00",'
+        b'"measures":[{"value":20.5,"unit":"C"}],"location":null}'
+    )
+    assert adapter.decode(data) == DEVICE
+    assert adapter.decode(bytearray(data)) == DEVICE
+    assert adapter.decode(memoryview(data)) == DEVICE
+    buffer = bytearray(b"head")
+    adapter.encode_into(DEVICE, buffer, 4)
+    assert buffer == b"head" + data
+
+
+def test_models_are_validated() -> None:
+    adapter = PydanticV1JSONAdapter(Measure)
+    assert adapter.decode(b'{"value":"1.5","unit":"F"}') == Measure(
+        value=1.5, unit=Unit.FAHRENHEIT
+    )
+    with pytest.raises(v1.ValidationError):
+        adapter.decode(b'{"value":"high","unit":"C"}')
+    with pytest.raises(v1.ValidationError):
+        adapter.decode(b'{"value":1}')
+
+
+def test_model_config_is_honored() -> None:
+    adapter = PydanticV1JSONAdapter(Configured)
+    assert adapter.encode(Configured(value=1)) == b'{\n "value": 1\n}'
+    assert adapter.decode(b'{"value":"2"}') == Configured(value=2)
+
+
+@pytest.mark.parametrize(
+    "typ, value, data",
+    [
+        (int, 1, b"1"),
+        (
+            List[Measure],
+            [Measure(value=1, unit=Unit.CELSIUS)],
+            b'[{"value":1.0,"unit":"C"}]',
+        ),
+        (Dict[str, int], {"a": 1}, b'{"a":1}'),
+        (Optional[int], None, b"null"),
+        (Unit, Unit.CELSIUS, b'"C"'),
+    ],
+)
+def test_other_types_use_a_root_model(typ: Any, value: Any, data: bytes) -> None:
+    adapter = PydanticV1JSONAdapter(typ)
+    assert adapter.encode(value) == data
+    assert adapter.decode(data) == value
+
+
+def test_other_types_are_validated() -> None:
+    adapter = PydanticV1JSONAdapter(List[int])
+    assert adapter.decode(b'["1", 2]') == [1, 2]
+    with pytest.raises(v1.ValidationError):
+        adapter.decode(b'["a"]')
+
+
+def test_without_value() -> None:
+    adapter = PydanticV1JSONAdapter(type(None))
+    assert adapter.encode(None) == b""
+    assert adapter.decode(b"") is None
+    with pytest.raises(ValueError, match="No value expected"):
+        adapter.encode(1)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="No value expected"):
+        adapter.decode(b"1")
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from contracts import Application, consumer, event, operation, schema
+from contracts.core.types import Validation
+from contracts.registry import ConsumerEntry, OperationEntry
+
+
+@dataclass
+class DeviceParams:
+    device: str
+
+
+@dataclass
+class Status:
+    online: bool
+
+
+@operation(
+    address="devices.{device}.status",
+    parameters=DeviceParams,
+    reply_payload=Status,
+)
+class GetStatus:
+    """Get the status of a device."""
+
+
+@event(
+    address="devices.{device}.events", parameters=DeviceParams, payload_schema=Status
+)
+class StatusChanged:
+    pass
+
+
+@consumer(source=StatusChanged)
+class StatusConsumer:
+    pass
+
+
+class GetStatusImpl(GetStatus):
+    async def handle(self, request: Any) -> None:
+        await request.respond(Status(True))
+
+
+def make_app(*components: Any) -> Application:
+    return Application(
+        id="test", name="test", version="0.0.1", components=list(components)
+    )
+
+
+def test_compile_creates_entries() -> None:
+    registry = make_app(GetStatus, StatusConsumer).compile()
+    [entry] = registry.operations
+    assert isinstance(entry, OperationEntry)
+    assert entry.cls is GetStatus
+    assert entry.name == "GetStatus"
+    assert entry.subject == "devices.{device}.status"
+    assert entry.reply_content_type == "application/json"
+    assert dict(entry.reply_headers) == {"Content-Type": "application/json"}
+    [consumer_entry] = registry.consumers
+    assert isinstance(consumer_entry, ConsumerEntry)
+    assert consumer_entry.cls is StatusConsumer
+    assert consumer_entry.name == "StatusChanged"
+
+
+def test_lookups() -> None:
+    registry = make_app(GetStatus, StatusConsumer).compile()
+    [entry] = registry.operations
+    assert registry.operation("GetStatus") is entry
+    with pytest.raises(KeyError):
+        registry.operation("Unknown")
+    # Implementations are resolved through their base classes
+    assert registry.lookup(GetStatusImpl()) is entry
+    assert registry.lookup(GetStatusImpl) is entry
+    assert registry.lookup(object()) is None
+    assert registry.consumers_of("StatusChanged") == registry.consumers
+    assert registry.consumers_of("Unknown") == ()
+    assert registry.by_subject["devices.{device}.status"] == (entry,)
+
+
+def test_registry_is_read_only() -> None:
+    registry = make_app(GetStatus).compile()
+    with pytest.raises(TypeError):
+        registry.by_name["Other"] = registry.operations[0]  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        registry.fingerprint = ""  # type: ignore[misc]
+
+
+def test_compile_is_cached_until_components_change() -> None:
+    app = make_app(GetStatus)
+    registry = app.compile()
+    assert app.compile() is registry
+    app.components.append(StatusConsumer)
+    assert app.compile() is not registry
+
+
+def test_fingerprint() -> None:
+    first = make_app(GetStatus, StatusConsumer).compile().fingerprint
+    assert make_app(GetStatus, StatusConsumer).compile().fingerprint == first
+    assert make_app(GetStatus).compile().fingerprint != first
+    other_version = Application(
+        id="test", name="test", version="0.0.2", components=[GetStatus, StatusConsumer]
+    )
+    assert other_version.compile().fingerprint != first
+
+
+def test_unsupported_component() -> None:
+    with pytest.raises(TypeError, match="Unsupported component"):
+        make_app(Status).compile()
+
+
+@operation(
+    address="devices.{device}.echo",
+    parameters=DeviceParams,
+    payload=schema(Status, alternatives=["application/msgpack"]),
+    reply_payload=schema(Status, alternatives=["application/msgpack"]),
+)
+class EchoStatus:
+    """Echo the status of a device."""
+
+
+def test_operation_adapters() -> None:
+    [entry] = make_app(EchoStatus).compile().operations
+    payload = entry.spec.payload
+    # The compiled adapters are used for the default content type
+    assert entry.get_request_adapter(None) is entry.request_adapter
+    assert entry.get_request_adapter("application/json") is entry.request_adapter
+    assert (
+        entry.get_request_adapter("Application/JSON; charset=utf-8")
+        is entry.request_adapter
+    )
+    assert entry.get_reply_adapter("application/json") is entry.reply_adapter
+    assert (
+        entry.get_request_adapter("application/msgpack")
+        is payload.alternatives["application/msgpack"]
+    )
+    assert entry.get_reply_adapter("application/msgpack").decode(
+        entry.get_reply_adapter("application/msgpack").encode(Status(True))
+    ) == Status(True)
+    with pytest.raises(ValueError, match="Unsupported content type"):
+        entry.get_request_adapter("application/cbor")
+    none = entry.get_request_adapter(None, Validation.NONE)
+    assert none.decode(b'{"online": true}') == Status(True)
+
+
+def test_adapters_without_alternatives() -> None:
+    registry = make_app(GetStatus, StatusConsumer).compile()
+    [entry] = registry.operations
+    # The content type is ignored
+    assert entry.get_request_adapter("application/cbor") is entry.request_adapter
+    assert entry.get_reply_adapter("application/cbor") is entry.reply_adapter
+    [consumer_entry] = registry.consumers
+    adapter = consumer_entry.get_payload_adapter("application/json")
+    assert adapter is consumer_entry.payload_adapter
+    assert adapter.decode(b'{"online": false}') == Status(False)
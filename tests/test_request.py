@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from contracts.abc.request import Request
+
+
+class LegacyRequest(Request[Any]):
+    """A request implemented before `raw_payload` was added."""
+
+    def params(self) -> Any:
+        return None
+
+    def payload(self) -> Any:
+        return b"data"
+
+    def headers(self) -> dict[str, str]:
+        return {}
+
+    async def respond(self, data: Any = None, *, headers: Any = None) -> None:
+        pass
+
+    async def respond_error(
+        self, code: int, description: str, *, data: Any = None, headers: Any = None
+    ) -> None:
+        pass
+
+
+def test_requests_without_raw_payload_can_be_created() -> None:
+    request = LegacyRequest()
+    assert request.payload() == b"data"
+    with pytest.raises(NotImplementedError, match="LegacyRequest"):
+        request.raw_payload()
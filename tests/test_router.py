@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import pytest
+
+from contracts.core.address import Address
+from contracts.core.router import Router
+
+
+@dataclass
+class DeviceParams:
+    device: str
+
+
+@dataclass
+class SiteParams:
+    site: str
+    device: str
+
+
+@dataclass
+class SiteOnlyParams:
+    site: str
+
+
+@dataclass
+class RemainingParams:
+    rest: List[str]
+
+
+@dataclass
+class SiteRemainingParams:
+    site: str
+    rest: List[str]
+
+
+def make_router() -> Router[str]:
+    return Router(
+        [
+            (Address("sensors.{device}", DeviceParams), "param"),
+            (Address("sensors.kitchen", type(None)), "literal"),
+            (Address("sensors.{rest...}", RemainingParams), "remaining"),
+        ]
+    )
+
+
+def test_literal_tokens_are_preferred_over_placeholders() -> None:
+    route, params = make_router().match("sensors.kitchen")  # type: ignore[misc]
+    assert route.target == "literal"
+    assert params is None
+
+
+def test_placeholders_are_preferred_over_match_all() -> None:
+    route, params = make_router().match("sensors.garage")  # type: ignore[misc]
+    assert route.target == "param"
+    assert params == DeviceParams("garage")
+
+
+def test_match_all_matches_remaining_tokens() -> None:
+    route, params = make_router().match("sensors.garage.door")  # type: ignore[misc]
+    assert route.target == "remaining"
+    assert params == RemainingParams(["garage", "door"])
+
+
+def test_match_backtracks_to_less_specific_routes() -> None:
+    router = Router(
+        [
+            (Address("a.b.c", type(None)), "literal"),
+            (Address("a.{device}.d", DeviceParams), "param"),
+        ]
+    )
+    route, params = router.match("a.b.d")  # type: ignore[misc]
+    assert route.target == "param"
+    assert params == DeviceParams("b")
+
+
+def test_no_match() -> None:
+    router = make_router()
+    assert router.match("other.kitchen") is None
+    assert router.match("sensors") is None
+
+
+def test_equivalent_addresses_conflict() -> None:
+    router = Router([(Address("sensors.{device}", DeviceParams), "first")])
+    with pytest.raises(ValueError, match="conflicts"):
+        router.add(Address("sensors.{site}", SiteOnlyParams), "second")
+
+
+def test_overlapping_routes() -> None:
+    router = make_router()
+    overlaps = {
+        route.target
+        for route in router.overlapping(Address("sensors.kitchen", type(None)))
+    }
+    assert overlaps == {"param", "literal", "remaining"}
+    overlaps = {
+        route.target
+        for route in router.overlapping(Address("sensors.{site}.{device}", SiteParams))
+    }
+    assert overlaps == {"remaining"}
+    assert router.overlapping(Address("other.{device}", DeviceParams)) == []
+
+
+def test_subscriptions_cover_all_routes() -> None:
+    router = Router(
+        [
+            (Address("sensors.{device}", DeviceParams), "a"),
+            (Address("sensors.kitchen.temperature", type(None)), "b"),
+            (Address("alarms.{site}.{device}", SiteParams), "c"),
+        ]
+    )
+    assert router.subscriptions() == ["sensors.>", "alarms.>"]
+    assert sorted(router.subscriptions(depth=2)) == [
+        "alarms.*.>",
+        "sensors.*",
+        "sensors.kitchen.>",
+    ]
+    with pytest.raises(ValueError):
+        router.subscriptions(depth=0)
+
+
+def test_subscriptions_of_deep_addresses() -> None:
+    literal = ".".join(f"level{idx}" for idx in range(40))
+    router = Router(
+        [
+            (Address(literal, type(None)), "literal"),
+            (Address(literal + ".{device}", DeviceParams), "param"),
+            (Address("other.{site}.{rest...}", SiteRemainingParams), "remaining"),
+        ]
+    )
+    # Deep literal addresses are compared token by token
+    assert router.subscriptions(depth=50) == [literal, literal + ".*", "other.*.>"]
+    assert router.subscriptions(depth=2) == ["level0.level1.>", "other.*.>"]
+    router.add(Address("{site}.{rest...}", SiteRemainingParams), "any")
+    assert router.subscriptions(depth=50) == ["*.>"]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Iterator
+
+import pytest
+
+from contracts.backends.type_adapter import stream
+from contracts.backends.type_adapter.stream import JSONStreamAdapter
+
+
+@dataclass
+class Record:
+    id: int
+    name: str
+
+
+RECORDS = [Record(i, f"récord-{i}-€") for i in range(500)]
+
+
+@pytest.fixture(params=[1, 7, 64, 64 * 1024])
+def chunk_size(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> int:
+    monkeypatch.setattr(stream, "_CHUNK_SIZE", request.param)
+    return request.param
+
+
+def test_round_trip(chunk_size: int) -> None:
+    adapter = JSONStreamAdapter(Iterable[Record])
+    data = adapter.encode(iter(RECORDS))
+    assert json.loads(data)[1] == {"id": 1, "name": "récord-1-€"}
+    assert list(adapter.decode(data)) == RECORDS
+    assert list(adapter.decode(memoryview(data))) == RECORDS
+
+
+def test_whitespace_and_large_items(chunk_size: int) -> None:
+    adapter = JSONStreamAdapter(Iterator[int])
+    data = b" [ 1 ,\n 22222222222222222222 ,\t-3 ] \n"
+    assert list(adapter.decode(data)) == [1, 22222222222222222222, -3]
+    adapter = JSONStreamAdapter(Iterator[str])
+    assert list(adapter.decode(json.dumps(["x" * 1000, "é" * 1000]).encode())) == [
+        "x" * 1000,
+        "é" * 1000,
+    ]
+
+
+def test_empty_array(chunk_size: int) -> None:
+    adapter = JSONStreamAdapter(Iterable[int])
+    assert adapter.encode([]) == b"[]"
+    assert list(adapter.decode(b" [ ] ")) == []
+
+
+def test_items_are_decoded_lazily(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(stream, "_CHUNK_SIZE", 16)
+    adapter = JSONStreamAdapter(Iterable[int])
+    data = bytearray(b"[" + b",".join(b"%d" % i for i in range(1000)) + b"]")
+    items = iter(adapter.decode(data))
+    assert next(items) == 0
+    # Only a chunk of the payload was decoded
+    reader = items.gi_frame.f_locals["reader"]  # type: ignore[attr-defined]
+    assert len(reader.text) <= 16
+    assert list(items) == list(range(1, 1000))
+
+
+@pytest.mark.parametrize(
+    "data, error",
+    [
+        (b"", "Expected a JSON array"),
+        (b'{"id": 1}', "Expected a JSON array"),
+        (b"[1 2]", "Expected ',' or ']' at position 3"),
+        (b"[1,", "Expecting value"),
+        (b"[1, tru", "Expecting value"),
+        (b"[1] 2", "Extra data"),
+        (b"[\xff]", "utf-8"),
+    ],
+)
+def test_invalid_data(chunk_size: int, data: bytes, error: str) -> None:
+    adapter = JSONStreamAdapter(Iterable[int])
+    with pytest.raises(ValueError, match=error):
+        list(adapter.decode(data))
+
+
+def test_invalid_items(chunk_size: int) -> None:
+    adapter = JSONStreamAdapter(Iterable[Record])
+    items = adapter.decode(b'[{"id": 1, "name": "a"}, {"id": 2}]')
+    assert next(iter(items)) == Record(1, "a")
+    with pytest.raises(ValueError, match="Failed to decode data"):
+        list(items)
+
+
+@pytest.mark.asyncio
+async def test_async_stream() -> None:
+    adapter = JSONStreamAdapter(AsyncIterator[Record])
+
+    async def records() -> AsyncIterator[Record]:
+        for record in RECORDS[:3]:
+            yield record
+
+    data = await adapter.encode_async(records())
+    assert [record async for record in adapter.decode(data)] == RECORDS[:3]
+    with pytest.raises(TypeError, match="encode_async"):
+        adapter.encode(records())
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import datetime
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, make_dataclass
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+import pydantic
+import pytest
+
+from contracts import schema
+from contracts.backends.type_adapter import (
+    clear_type_adapters,
+    register_type_adapter,
+)
+from contracts.backends.type_adapter.defaults import (
+    default_json_adapter,
+    sniff_type_adapter,
+)
+from contracts.backends.type_adapter.standard import (
+    RawTypeAdapter,
+    StandardJSONAdapter,
+)
+
+
+@dataclass
+class Reading:
+    device: str
+    temperature: float
+
+
+@pydantic.dataclasses.dataclass
+class PositiveReading:
+    device: str
+    temperature: float
+
+    @pydantic.field_validator("temperature")
+    @classmethod
+    def check_positive(cls, value: float) -> float:
+        if value < 0:
+            raise ValueError("Temperature must be positive")
+        return value
+
+
+def test_dataclasses_use_default_adapter() -> None:
+    adapter = sniff_type_adapter(Reading)
+    assert isinstance(adapter, type(default_json_adapter()(Reading)))
+    # Values are coerced like with any other pydantic schema
+    assert adapter.decode(b'{"device": "a", "temperature": "20.5"}') == Reading(
+        "a", 20.5
+    )
+
+
+def test_pydantic_dataclass_validators_are_applied() -> None:
+    adapter = sniff_type_adapter(PositiveReading)
+    assert adapter.decode(b'{"device": "a", "temperature": 1}') == PositiveReading(
+        "a", 1
+    )
+    with pytest.raises(Exception, match="Temperature must be positive"):
+        adapter.decode(b'{"device": "a", "temperature": -1}')
+
+
+def test_msgspec_adapter_is_opt_in() -> None:
+    pytest.importorskip("msgspec")
+    from contracts.backends.type_adapter.msgspec import (
+        MsgspecJSONAdapter,
+        MsgspecJSONAdapterFactory,
+    )
+
+    reading_schema = schema(Reading, adapter_factory=MsgspecJSONAdapterFactory())
+    adapter = reading_schema.type_adapter
+    assert isinstance(adapter, MsgspecJSONAdapter)
+    data = adapter.encode(Reading("a", 20.5))
+    assert adapter.decode(data) == Reading("a", 20.5)
+    # Values are decoded strictly
+    with pytest.raises(Exception):
+        adapter.decode(b'{"device": "a", "temperature": "20.5"}')
+
+
+def test_msgspec_adapter_rejects_pydantic_dataclasses() -> None:
+    pytest.importorskip("msgspec")
+    from contracts.backends.type_adapter.msgspec import MsgspecJSONAdapterFactory
+
+    with pytest.raises(TypeError, match="validators"):
+        schema(PositiveReading, adapter_factory=MsgspecJSONAdapterFactory())
+
+
+class Unit(Enum):
+    CELSIUS = "C"
+    FAHRENHEIT = "F"
+
+
+@dataclass
+class Measure:
+    value: float
+    unit: Unit
+
+
+@dataclass
+class Node:
+    name: str
+    children: List[Node] = field(default_factory=list)
+    parent: Optional[Node] = None
+
+
+@dataclass
+class Report:
+    id: UUID
+    created: datetime.datetime
+    day: datetime.date
+    total: Decimal
+    measures: List[Measure]
+    by_device: Dict[str, Measure]
+    latest: Optional[Measure]
+    bounds: Tuple[int, str]
+    tags: Set[str]
+    raw: bytes
+    tree: Node
+
+
+REPORT = Report(
+    id=UUID("12345678-1234-5678-1234-567812345678"),
+    created=datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+    day=datetime.date(2024, 1, 2),
+    total=Decimal("12.50"),
+    measures=[Measure(20.5, Unit.CELSIUS), Measure(70, Unit.FAHRENHEIT)],
+    by_device={"a": Measure(1, Unit.CELSIUS)},
+    latest=None,
+    bounds=(1, "x"),
+    tags={"kitchen"},
+    raw=b"\x00\x01",
+    tree=Node("root", [Node("leaf", [Node("deep")])]),
+)
+
+
+def test_standard_adapter_round_trip() -> None:
+    adapter = StandardJSONAdapter(Report)
+    data = adapter.encode(REPORT)
+    assert adapter.decode(data) == REPORT
+    assert adapter.decode(memoryview(data)) == REPORT
+    buffer = bytearray()
+    adapter.encode_into(REPORT, buffer)
+    assert bytes(buffer) == data
+
+
+def test_standard_adapter_encodes_json_values() -> None:
+    adapter = StandardJSONAdapter(Report)
+    value = json.loads(adapter.encode(REPORT))
+    assert value["id"] == "12345678-1234-5678-1234-567812345678"
+    assert value["created"] == "2024-01-02T03:04:05+00:00"
+    assert value["total"] == "12.50"
+    assert value["measures"][0] == {"value": 20.5, "unit": "C"}
+    assert value["latest"] is None
+    assert value["raw"] == [0, 1]
+    assert value["tree"]["children"][0]["children"][0]["name"] == "deep"
+
+
+def test_standard_adapter_rejects_invalid_data() -> None:
+    adapter = StandardJSONAdapter(Measure)
+    with pytest.raises(ValueError):
+        adapter.decode(b'{"value": 1}')
+    with pytest.raises(ValueError):
+        adapter.decode(b'{"value": 1, "unit": "K"}')
+
+
+def test_standard_adapter_without_value() -> None:
+    adapter = StandardJSONAdapter(type(None))
+    assert adapter.encode(None) == b""
+    assert adapter.decode(b"") is None
+    with pytest.raises(ValueError):
+        adapter.decode(b"1")
+
+
+@pytest.fixture
+def clean_adapters() -> Iterator[None]:
+    yield
+    clear_type_adapters()
+
+
+def test_adapters_are_shared_by_schemas_of_the_same_type() -> None:
+    assert sniff_type_adapter(Measure) is sniff_type_adapter(Measure)
+    assert schema(Measure).type_adapter is sniff_type_adapter(Measure)
+    # Binary formats have their own adapter, shared by their content types
+    pytest.importorskip("msgpack")
+    msgpack = sniff_type_adapter(Measure, "application/msgpack")
+    assert type(msgpack).__name__ == "MsgPackAdapter"
+    assert sniff_type_adapter(Measure, "application/x-msgpack") is msgpack
+    assert sniff_type_adapter(Measure, "application/json") is sniff_type_adapter(
+        Measure
+    )
+
+
+def test_adapters_are_created_once_by_concurrent_threads(
+    clean_adapters: None,
+) -> None:
+    typ = make_dataclass("Fresh", [("value", int)])
+    with ThreadPoolExecutor(8) as executor:
+        adapters = list(executor.map(lambda _: sniff_type_adapter(typ), range(32)))
+    assert all(adapter is adapters[0] for adapter in adapters)
+
+
+def test_registered_adapters_are_used(clean_adapters: None) -> None:
+    adapter = StandardJSONAdapter(Measure)
+    register_type_adapter(Measure, adapter)
+    assert sniff_type_adapter(Measure) is adapter
+    assert schema(Measure).type_adapter is adapter
+    # Other content types are registered separately
+    assert sniff_type_adapter(Measure, "application/cbor") is not adapter
+    clear_type_adapters()
+    assert sniff_type_adapter(Measure) is not adapter
+
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+@pytest.mark.parametrize(
+    "typ, content_type",
+    [
+        (Measure, None),
+        (Measure, "application/msgpack"),
+        (Measure, "application/cbor"),
+        (PositiveReading, None),
+    ],
+)
+def test_adapters_decode_any_buffer(
+    typ: Any, content_type: Optional[str], buffer_type: Any
+) -> None:
+    if content_type is not None:
+        pytest.importorskip("cbor2" if "cbor" in content_type else "msgpack")
+    adapter = sniff_type_adapter(typ, content_type)
+    value = typ(1.5, Unit.CELSIUS) if typ is Measure else typ("a", 1.5)
+    data = buffer_type(adapter.encode(value))
+    assert adapter.decode(data) == value
+
+
+def test_raw_adapters_do_not_copy_buffers() -> None:
+    data = bytearray(b"data")
+    view = RawTypeAdapter(memoryview).decode(data)
+    data[0:1] = b"D"
+    assert bytes(view) == b"Data"
+    view.release()
+    assert RawTypeAdapter(bytearray).encode(data) is data
+    payload = b"payload"
+    assert RawTypeAdapter(bytes).decode(payload) is payload
+    assert RawTypeAdapter(bytes).decode(memoryview(payload)) == payload
+    assert RawTypeAdapter(int).decode(memoryview(b"12")) == 12
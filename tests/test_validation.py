@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, List, Optional, Union
+
+import pytest
+
+from contracts import operation, schema
+from contracts.backends.type_adapter.pydantic_v1 import PydanticV1JSONAdapter
+from contracts.backends.type_adapter.pydantic_v2 import PydanticV2JSONAdapterFactory
+from contracts.core.types import Validation, with_validation
+
+v1 = pytest.importorskip("pydantic.v1")
+
+
+class Unit(Enum):
+    CELSIUS = "C"
+    FAHRENHEIT = "F"
+
+
+class Measure(v1.BaseModel):
+    value: float
+    unit: Unit
+
+
+class Device(v1.BaseModel):
+    name: str
+    created: datetime.datetime
+    measures: List[Measure]
+    label: Union[int, str] = 0
+    location: Optional[str] = None
+
+    class Config:
+        fields = {"name": {"alias": "deviceName"}}
+
+
+DATA = (
+    b'{"deviceName":"a","created":"2024-01-02T03:04:05+00:00",'
+    b'"measures":[{"value":20.5,"unit":"C"}]}'
+)
+
+
+@pytest.mark.parametrize("validation", [Validation.SHALLOW, Validation.NONE])
+def test_models_are_constructed(validation: Validation) -> None:
+    adapter = PydanticV1JSONAdapter(Device).with_validation(validation)
+    device = adapter.decode(DATA)
+    assert device == PydanticV1JSONAdapter(Device).decode(DATA)
+    # Nested models, enums and datetimes are converted
+    assert device.measures == [Measure(value=20.5, unit=Unit.CELSIUS)]
+    assert device.created.tzinfo == datetime.timezone.utc
+    # Defaults are applied
+    assert (device.label, device.location) == (0, None)
+
+
+@pytest.mark.parametrize("validation", [Validation.SHALLOW, Validation.NONE])
+def test_values_are_not_validated(validation: Validation) -> None:
+    adapter = PydanticV1JSONAdapter(Measure).with_validation(validation)
+    assert adapter.decode(b'{"value":"high","unit":"C"}').value == "high"
+    with pytest.raises(v1.ValidationError):
+        PydanticV1JSONAdapter(Measure).decode(b'{"value":"high","unit":"C"}')
+
+
+def test_shallow_validation_checks_required_fields() -> None:
+    data = b'{"deviceName":"a","measures":[{"unit":"C"}]}'
+    adapter = PydanticV1JSONAdapter(Device)
+    with pytest.raises(ValueError, match="Missing required fields: created"):
+        adapter.with_validation(Validation.SHALLOW).decode(data)
+    device = adapter.with_validation(Validation.NONE).decode(data)
+    assert not hasattr(device, "created")
+    assert device.measures[0].unit == Unit.CELSIUS
+
+
+def test_invalid_structures_are_rejected() -> None:
+    adapter = PydanticV1JSONAdapter(Device).with_validation(Validation.NONE)
+    with pytest.raises(ValueError, match="Failed to decode data"):
+        adapter.decode(b'{"deviceName":"a","measures":1}')
+
+
+def test_unions_are_validated() -> None:
+    adapter = PydanticV1JSONAdapter(Device).with_validation(Validation.NONE)
+    assert adapter.decode(b'{"label":"1"}').label == 1
+    with pytest.raises(v1.ValidationError):
+        adapter.decode(b'{"label":[]}')
+
+
+def test_variants_are_cached() -> None:
+    adapter = PydanticV1JSONAdapter(Device)
+    shallow = adapter.with_validation(Validation.SHALLOW)
+    assert adapter.with_validation(Validation.FULL) is adapter
+    assert adapter.with_validation("shallow") is shallow  # type: ignore[arg-type]
+    # Variants share the same cache
+    assert shallow.with_validation(Validation.FULL) is adapter  # type: ignore[attr-defined]
+    none = shallow.with_validation(Validation.NONE)  # type: ignore[attr-defined]
+    assert adapter.with_validation(Validation.NONE) is none
+    with pytest.raises(ValueError):
+        adapter.with_validation("partial")  # type: ignore[arg-type]
+
+
+def test_adapters_validating_natively_ignore_levels() -> None:
+    @dataclass
+    class Reading:
+        value: float
+
+    adapter = PydanticV2JSONAdapterFactory()(Reading)
+    assert with_validation(adapter, Validation.NONE) is adapter
+    assert with_validation(adapter, "shallow") is adapter
+    v1_adapter = PydanticV1JSONAdapter(Measure)
+    assert with_validation(v1_adapter, Validation.FULL) is v1_adapter
+    assert with_validation(v1_adapter, "none") is v1_adapter.with_validation(
+        Validation.NONE
+    )
+
+
+def test_schemas_use_validation_variants() -> None:
+    measure = schema(
+        Measure,
+        content_type="application/json",
+        type_adapter=PydanticV1JSONAdapter(Measure),
+    )
+    adapter = measure.get_type_adapter(None, Validation.NONE)
+    assert adapter is measure.type_adapter.with_validation(Validation.NONE)  # type: ignore[attr-defined]
+    assert measure.get_type_adapter(None) is measure.type_adapter
+
+
+@pytest.mark.parametrize(
+    "content_type, package",
+    [("application/msgpack", "msgpack"), ("application/cbor", "cbor2")],
+)
+def test_binary_adapters_construct_models(content_type: str, package: str) -> None:
+    pytest.importorskip(package)
+    measure = schema(Measure, content_type=content_type)
+    data = schema(dict, content_type=content_type).type_adapter.encode(
+        {"value": "high", "unit": "C"}
+    )
+    with pytest.raises(ValueError):
+        measure.type_adapter.decode(data)
+    adapter = measure.get_type_adapter(None, Validation.NONE)
+    assert adapter.decode(data) == Measure.construct(value="high", unit=Unit.CELSIUS)
+    missing = schema(dict, content_type=content_type).type_adapter.encode({})
+    with pytest.raises(ValueError, match="Missing required fields: value, unit"):
+        measure.get_type_adapter(None, Validation.SHALLOW).decode(missing)
+
+
+@operation(address="measures.get", payload=type(None), reply_payload=Measure)
+class GetMeasure:
+    """Get a measure."""
+
+
+class GetMeasureImpl(GetMeasure):
+    async def handle(self, request: Any) -> None:
+        await request.respond(Measure.construct(value="high", unit=Unit.CELSIUS))
+
+
+@pytest.mark.asyncio
+async def test_clients_decode_replies_with_validation_level(loopback: Any) -> None:
+    client, _ = loopback(GetMeasureImpl(), validation=Validation.NONE)
+    reply = await client.send(GetMeasure.request(None))
+    assert reply.data() == Measure.construct(value="high", unit=Unit.CELSIUS)
+    client, _ = loopback(GetMeasureImpl())
+    reply = await client.send(GetMeasure.request(None))
+    with pytest.raises(v1.ValidationError):
+        reply.data()